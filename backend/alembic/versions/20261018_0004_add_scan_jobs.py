@@ -0,0 +1,46 @@
+"""add scan_jobs table
+
+Revision ID: 20261018_0004
+Revises: 20260225_0003
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0004"
+down_revision: Union[str, None] = "20260225_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scan_jobs",
+        sa.Column("id", sa.String(length=40), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("account_ids", sa.Text(), nullable=False),
+        sa.Column("lookback_days", sa.Integer(), nullable=False),
+        sa.Column("max_results_per_account", sa.Integer(), nullable=False),
+        sa.Column("concurrency", sa.Integer(), nullable=True),
+        sa.Column("bypass_search_cache", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("accounts_total", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("accounts_processed", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("events_created", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("progress", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_scan_jobs_status_created_at", "scan_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scan_jobs_status_created_at", table_name="scan_jobs")
+    op.drop_table("scan_jobs")
@@ -0,0 +1,61 @@
+"""add daily_kpi_rollups table and backfill from raw tables
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0005"
+down_revision: Union[str, None] = "20261018_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_kpi_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+        sa.Column("interactions_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("outbound_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("inbound_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("drafts_created", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bant_a_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bant_b_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("bant_c_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "account_id"),
+    )
+    # 既有資料一次回填；之後由寫入路徑逐筆遞增維護
+    op.execute(
+        """
+        INSERT INTO daily_kpi_rollups (
+            day, account_id, interactions_count, outbound_count, inbound_count,
+            drafts_created, bant_a_count, bant_b_count, bant_c_count, updated_at
+        )
+        SELECT day, account_id, SUM(i), SUM(o), SUM(n), SUM(d), SUM(a), SUM(b), SUM(c), CURRENT_TIMESTAMP
+        FROM (
+            SELECT date(l.occurred_at) AS day, ct.account_id AS account_id, 1 AS i,
+                   l.direction = 'OUTBOUND' AS o, l.direction = 'INBOUND' AS n, 0 AS d, 0 AS a, 0 AS b, 0 AS c
+            FROM interaction_logs l JOIN contacts ct ON ct.id = l.contact_id
+            UNION ALL
+            SELECT date(od.created_at), ct.account_id, 0, 0, 0, 1, 0, 0, 0
+            FROM outreach_drafts od JOIN contacts ct ON ct.id = od.contact_id
+            UNION ALL
+            SELECT date(created_at), account_id, 0, 0, 0, 0, grade = 'A', grade = 'B', grade = 'C'
+            FROM bant_scorecards
+        )
+        GROUP BY day, account_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_kpi_rollups")
@@ -0,0 +1,59 @@
+"""add composite indexes for per-account ordered reads
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0007"
+down_revision: Union[str, None] = "20261018_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 複合索引以 account_id / contact_id 開頭，已涵蓋原本的單欄 account_id 索引，舊的一併移除以減少寫入成本
+_REPLACED_INDEXES = (
+    ("ix_signal_events_account_id", "signal_events"),
+    ("ix_pain_profiles_account_id", "pain_profiles"),
+    ("ix_bant_scorecards_account_id", "bant_scorecards"),
+    ("ix_pipeline_items_account_id", "pipeline_items"),
+)
+
+
+def upgrade() -> None:
+    op.create_index("ix_signal_events_account_fetched", "signal_events", ["account_id", "fetched_at"])
+    op.create_index(
+        "ix_signal_events_account_strength", "signal_events", ["account_id", "signal_strength", "fetched_at"]
+    )
+    op.create_index("ix_signal_events_fetched_at", "signal_events", ["fetched_at"])
+    op.create_index(
+        "ix_pain_profiles_account_confidence", "pain_profiles", ["account_id", "confidence", "created_at"]
+    )
+    op.create_index("ix_pain_profiles_created_at", "pain_profiles", ["created_at"])
+    op.create_index("ix_bant_scorecards_account_created", "bant_scorecards", ["account_id", "created_at"])
+    op.create_index("ix_pipeline_items_account_updated", "pipeline_items", ["account_id", "updated_at"])
+    op.create_index("ix_interaction_logs_contact_occurred", "interaction_logs", ["contact_id", "occurred_at"])
+    op.create_index("ix_outreach_drafts_contact_created", "outreach_drafts", ["contact_id", "created_at"])
+    op.create_index("ix_outreach_drafts_created_at", "outreach_drafts", ["created_at"])
+    for name, table in _REPLACED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table in _REPLACED_INDEXES:
+        op.create_index(name, table, ["account_id"])
+    op.drop_index("ix_outreach_drafts_created_at", table_name="outreach_drafts")
+    op.drop_index("ix_outreach_drafts_contact_created", table_name="outreach_drafts")
+    op.drop_index("ix_interaction_logs_contact_occurred", table_name="interaction_logs")
+    op.drop_index("ix_pipeline_items_account_updated", table_name="pipeline_items")
+    op.drop_index("ix_bant_scorecards_account_created", table_name="bant_scorecards")
+    op.drop_index("ix_pain_profiles_created_at", table_name="pain_profiles")
+    op.drop_index("ix_pain_profiles_account_confidence", table_name="pain_profiles")
+    op.drop_index("ix_signal_events_fetched_at", table_name="signal_events")
+    op.drop_index("ix_signal_events_account_strength", table_name="signal_events")
+    op.drop_index("ix_signal_events_account_fetched", table_name="signal_events")
@@ -0,0 +1,31 @@
+"""add signal content fingerprint and incremental scan flag
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0008"
+down_revision: Union[str, None] = "20261018_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既有列指紋為 NULL，第一次增量掃描會完整處理一次並補上
+    op.add_column("signal_events", sa.Column("content_fingerprint", sa.String(length=64), nullable=True))
+    op.add_column("scan_jobs", sa.Column("incremental", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs") as batch_op:
+        batch_op.drop_column("incremental")
+    with op.batch_alter_table("signal_events") as batch_op:
+        batch_op.drop_column("content_fingerprint")
@@ -0,0 +1,28 @@
+"""add scan job events_updated counter
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0009"
+down_revision: Union[str, None] = "20261018_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 舊 job 的 events_created 含更新筆數，無法回推，一律以 0 起算
+    op.add_column("scan_jobs", sa.Column("events_updated", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scan_jobs") as batch_op:
+        batch_op.drop_column("events_updated")
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import io
+from tempfile import SpooledTemporaryFile
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Account, Contact
 from app.schemas.accounts import (
     AccountCreateRequest,
@@ -10,10 +14,14 @@ from app.schemas.accounts import (
     AccountImportResponse,
     AccountListResponse,
     AccountResponse,
+    AccountSyncResponse,
     AccountUpdateRequest,
 )
+from app.services.account_importer import AccountImportService, iter_account_csv_rows
 from app.services.utils import now_utc
 
+CSV_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
 router = APIRouter(tags=["accounts"])
 
 
@@ -38,11 +46,8 @@ def list_accounts(
     segment: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    # Sync from CSV to ensure "Real API" mode uses the CSV data
-    sync_csv_to_db(db)
-    
     stmt = select(Account).order_by(Account.updated_at.desc())
     if segment:
         stmt = stmt.where(Account.segment == segment.upper())
@@ -74,42 +79,42 @@ def create_account(payload: AccountCreateRequest, db: Session = Depends(get_db))
 
 @router.post("/accounts/import", response_model=AccountImportResponse)
 def import_accounts(payload: AccountImportRequest, db: Session = Depends(get_db)):
-    inserted = 0
-    updated = 0
-
-    for row in payload.items:
-        existing = db.execute(select(Account).where(Account.company_name == row.company_name)).scalar_one_or_none()
-        if existing:
-            existing.segment = row.segment.upper()
-            existing.region = row.region
-            existing.website = row.website
-            existing.source = row.source or "api_import"
-            existing.priority_tier = row.priority_tier or "T3"
-            existing.updated_at = now_utc()
-            updated += 1
-            continue
-
-        db.add(
-            Account(
-                company_name=row.company_name,
-                segment=row.segment.upper(),
-                region=row.region,
-                website=row.website,
-                source=row.source or "api_import",
-                priority_tier=row.priority_tier or "T3",
-                created_at=now_utc(),
-                updated_at=now_utc(),
-            )
-        )
-        inserted += 1
+    rows = (
+        {
+            **row.model_dump(),
+            "source": row.source or "api_import",
+            "priority_tier": row.priority_tier or "T3",
+        }
+        for row in payload.items
+    )
+    return AccountImportResponse(**AccountImportService().import_rows(db, rows))
 
-    db.commit()
-    return AccountImportResponse(status="ok", inserted=inserted, updated=updated, total_rows=len(payload.items))
+
+@router.post("/accounts/import/csv", response_model=AccountImportResponse)
+async def import_accounts_csv(request: Request, db: Session = Depends(get_db)):
+    # 直接讀 request body（text/csv），先落到 spooled 暫存檔再逐列解析，大檔不會整份留在記憶體
+    with SpooledTemporaryFile(max_size=CSV_SPOOL_MAX_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        with io.TextIOWrapper(spool, encoding="utf-8-sig", newline="") as text:
+            try:
+                result = await run_in_threadpool(
+                    AccountImportService().import_rows, db, iter_account_csv_rows(text, default_source="api_import")
+                )
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return AccountImportResponse(**result)
+
+
+@router.post("/accounts/sync", response_model=AccountSyncResponse)
+def sync_accounts_from_csv(force: bool = Query(default=False), db: Session = Depends(get_db)):
+    # clients.csv 由背景 watcher 定期同步；此端點供手動立即觸發，force=true 時忽略檔案簽章
+    return AccountSyncResponse(**sync_csv_to_db(db, force=force))
 
 
 @router.get("/accounts/{account_id}", response_model=AccountResponse)
-def get_account(account_id: int, db: Session = Depends(get_db)):
-    sync_csv_to_db(db)
+def get_account(account_id: int, db: Session = Depends(get_read_db)):
     account = db.get(Account, account_id)
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found.")
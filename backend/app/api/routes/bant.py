@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import BANTScorecard, PipelineItem
 from app.schemas.bant import BANTScoreItem, BANTScoreListResponse, BANTScoreRequest, BANTScoreResponse
 from app.services.bant_scorer import BANTScorerService
@@ -43,7 +43,7 @@ def score_bant(payload: BANTScoreRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/bant/accounts/{account_id}", response_model=BANTScoreListResponse)
-def list_bant_scores(account_id: int, limit: int = Query(default=5, ge=1, le=50), db: Session = Depends(get_db)):
+def list_bant_scores(account_id: int, limit: int = Query(default=5, ge=1, le=50), db: Session = Depends(get_read_db)):
     rows = (
         db.execute(
             select(BANTScorecard)
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Account, Contact
 from app.schemas.contacts import ContactCreateRequest, ContactListResponse, ContactResponse, ContactUpdateRequest
+from app.services.kpi_rollups import retract_contact_kpis
 from app.services.utils import now_utc
 
 router = APIRouter(tags=["contacts"])
@@ -28,7 +29,7 @@ def list_contacts(
     account_id: int | None = Query(default=None),
     limit: int = Query(default=100, ge=1, le=300),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     stmt = select(Contact).order_by(Contact.id.desc())
     if account_id:
@@ -59,7 +60,7 @@ def create_contact(payload: ContactCreateRequest, db: Session = Depends(get_db))
 
 
 @router.get("/contacts/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: int, db: Session = Depends(get_db)):
+def get_contact(contact_id: int, db: Session = Depends(get_read_db)):
     contact = db.get(Contact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail=f"Contact {contact_id} not found.")
@@ -87,6 +88,8 @@ def delete_contact(contact_id: int, db: Session = Depends(get_db)):
     contact = db.get(Contact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail=f"Contact {contact_id} not found.")
+    # 互動與草稿依附在聯絡人上，刪除後同步扣回每日 KPI
+    retract_contact_kpis(db, contact)
     db.delete(contact)
     db.commit()
     return {"status": "deleted", "contact_id": contact_id}
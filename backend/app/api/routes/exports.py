@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import get_read_db
+from app.services.exporter import EXPORT_MEDIA_TYPES, ExportFilters, iter_export
+from app.services.utils import now_utc
+
+router = APIRouter(tags=["exports"])
+
+
+@router.get("/exports/{dataset}")
+def export_dataset(
+    dataset: Literal["signals", "pain-profiles", "outreach-drafts", "interactions"],
+    format: Literal["ndjson", "csv", "parquet"] = Query(default="ndjson"),
+    account_id: int | None = Query(default=None),
+    contact_id: int | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    signal_type: str | None = Query(default=None),
+    min_strength: int | None = Query(default=None, ge=0, le=100),
+    persona: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    direction: str | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+):
+    filters = ExportFilters(
+        account_id=account_id,
+        contact_id=contact_id,
+        since=since,
+        until=until,
+        signal_type=signal_type,
+        min_strength=min_strength,
+        persona=persona,
+        status=status,
+        direction=direction,
+    )
+    try:
+        # 先驗證格式與篩選條件（產生器尚未開始讀取）；真正的查詢在串流時才執行
+        iter_export(db, dataset, format, filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 依賴注入的 session 在回應開始串流前就會關閉，串流期間改用同一個 engine 自開 session
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, future=True)
+
+    def body() -> Iterator[bytes]:
+        with session_factory() as export_db:
+            yield from iter_export(export_db, dataset, format, filters)
+
+    filename = f"{dataset}-{now_utc():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,6 +2,10 @@ from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
+from app.services.providers.cache import cache_stats
+from app.services.providers.limits import CircuitBreaker, provider_health
+from app.services.providers.llm import get_latency_tracker
+
 router = APIRouter(tags=["health"])
 
 
@@ -9,3 +13,22 @@ router = APIRouter(tags=["health"])
 def health_check():
     return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
 
+
+
+@router.get("/health/cache")
+def cache_health():
+    return {"status": "ok", "caches": cache_stats()}
+
+
+@router.get("/health/providers")
+def providers_health():
+    # 尚未呼叫過的 provider 不會出現在列表中
+    providers = provider_health()
+    open_breakers = sorted(name for name, entry in providers.items() if entry["state"] == CircuitBreaker.OPEN)
+    return {
+        "status": "degraded" if open_breakers else "ok",
+        "open_breakers": open_breakers,
+        "providers": providers,
+        # LLM 路由用的滾動延遲統計（p50 / p95）
+        "llm_latency": get_latency_tracker().snapshot(),
+    }
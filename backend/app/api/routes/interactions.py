@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Contact, InteractionLog
 from app.schemas.interactions import (
     InteractionLogListItem,
@@ -16,7 +16,7 @@ router = APIRouter(tags=["interactions"])
 
 
 @router.get("/interactions/accounts/{account_id}", response_model=InteractionLogListResponse)
-def list_interactions_by_account(account_id: int, db: Session = Depends(get_db)):
+def list_interactions_by_account(account_id: int, db: Session = Depends(get_read_db)):
     stmt = (
         select(InteractionLog, Contact.full_name)
         .join(Contact, InteractionLog.contact_id == Contact.id)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.knowledge_docs import (
     KnowledgeDocCreateRequest,
     KnowledgeDocItem,
@@ -35,7 +35,7 @@ def list_knowledge_docs(
     account_id: int | None = Query(default=None),
     scope: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     svc = KnowledgeService()
     docs = svc.list_docs(db, account_id=account_id, scope=scope, limit=limit)
@@ -46,7 +46,7 @@ def list_knowledge_docs(
 @router.get("/knowledge-docs/accounts/{account_id}", response_model=KnowledgeDocListResponse)
 def list_knowledge_docs_for_account(
     account_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     svc = KnowledgeService()
     docs = svc.list_docs_for_account(db, account_id=account_id)
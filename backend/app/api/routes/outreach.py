@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Contact, OutreachDraft
 from app.schemas.outreach import (
+    OutreachBatchGenerateRequest,
+    OutreachBatchGenerateResponse,
+    OutreachBatchItemResponse,
     OutreachDraftItem,
     OutreachDraftListResponse,
     OutreachGenerateRequest,
@@ -12,6 +16,7 @@ from app.schemas.outreach import (
     OutreachStatusPatchRequest,
 )
 from app.services.outreach_generator import OutreachGeneratorService
+from app.services.utils import sse_stream
 
 router = APIRouter(tags=["outreach"])
 
@@ -40,11 +45,63 @@ def generate_outreach(payload: OutreachGenerateRequest, db: Session = Depends(ge
     )
 
 
+@router.post("/outreach/generate/batch", response_model=OutreachBatchGenerateResponse)
+def generate_outreach_batch(payload: OutreachBatchGenerateRequest, db: Session = Depends(get_db)):
+    """一次為多位聯絡人產生草稿；個別聯絡人失敗只反映在該筆的 status，不影響整批。"""
+    service = OutreachGeneratorService()
+    items = service.generate_batch(
+        db=db,
+        contact_ids=payload.contact_ids,
+        channel=payload.channel,
+        intent=payload.intent,
+        tone=payload.tone,
+        provider_preference=payload.llm_provider_preference,
+    )
+    return OutreachBatchGenerateResponse(
+        requested=len(items),
+        created=sum(1 for item in items if item.status == "CREATED"),
+        failed=sum(1 for item in items if item.status != "CREATED"),
+        items=[OutreachBatchItemResponse(**vars(item)) for item in items],
+    )
+
+
+@router.post("/outreach/generate/stream")
+def generate_outreach_stream(
+    payload: OutreachGenerateRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """以 SSE 逐段回傳 LLM 輸出（event: token），完成後寫入草稿並送出 event: draft。"""
+    service = OutreachGeneratorService()
+    try:
+        prompt = service.prepare(
+            db=db,
+            contact_id=payload.contact_id,
+            channel=payload.channel,
+            intent=payload.intent,
+            tone=payload.tone,
+            provider_preference=payload.llm_provider_preference,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 依賴注入的 session 在回應開始串流前就會關閉，草稿改在串流結束時以新 session 寫入
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, future=True)
+
+    return StreamingResponse(
+        sse_stream(request, service.generate_stream(session_factory, prompt)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/outreach/contacts/{contact_id}", response_model=OutreachDraftListResponse)
 def list_outreach_by_contact(
     contact_id: int,
     limit: int = Query(default=20, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     contact = db.get(Contact, contact_id)
     if not contact:
@@ -85,7 +142,7 @@ def list_outreach_by_contact(
 @router.get("/outreach/global", response_model=OutreachDraftListResponse)
 def list_global_outreach(
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     rows = (
         db.execute(
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Account, PainProfile
 from app.schemas.pain_profiles import (
     PainGenerateRequest,
@@ -11,7 +14,9 @@ from app.schemas.pain_profiles import (
     PainProfileListResponse,
     PainProfileUpdateRequest,
 )
+from app.services.feed_pagination import as_utc_naive, keyset_page, page_with_cursor
 from app.services.pain_extractor import PainExtractorService
+from app.services.utils import sse_stream
 
 router = APIRouter(tags=["pain_profiles"])
 
@@ -40,11 +45,43 @@ def generate_pain_profiles(payload: PainGenerateRequest, db: Session = Depends(g
     )
 
 
+@router.post("/pain-profiles/generate/stream")
+def generate_pain_profiles_stream(
+    payload: PainGenerateRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """以 SSE 逐段回傳 LLM 輸出（event: token），完成後寫入痛點並送出 event: done。"""
+    service = PainExtractorService()
+    try:
+        prompt = service.prepare(
+            db=db,
+            account_id=payload.account_id,
+            persona_targets=payload.persona_targets,
+            max_items=payload.max_items,
+            signal_ids=payload.signal_ids or None,
+            user_annotations=payload.user_annotations or None,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 依賴注入的 session 在回應開始串流前就會關閉，痛點改在串流結束時以新 session 寫入
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False, future=True)
+
+    return StreamingResponse(
+        sse_stream(request, service.generate_stream(session_factory, prompt)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/pain-profiles/accounts/{account_id}", response_model=PainProfileListResponse)
 def list_pain_profiles_by_account(
     account_id: int,
     limit: int = Query(default=20, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     account = db.get(Account, account_id)
     if not account:
@@ -66,18 +103,32 @@ def list_pain_profiles_by_account(
 @router.get("/pain-profiles/global", response_model=PainProfileListResponse)
 def list_global_pain_profiles(
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    persona: str | None = Query(default=None),
+    min_confidence: float | None = Query(default=None, ge=0.0, le=1.0),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    db: Session = Depends(get_read_db),
 ):
-    rows = (
-        db.execute(
-            select(PainProfile)
-            .order_by(PainProfile.created_at.desc())
-            .limit(limit)
-        )
-        .scalars()
-        .all()
+    stmt = select(PainProfile, Account.company_name).outerjoin(Account, Account.id == PainProfile.account_id)
+    if persona:
+        stmt = stmt.where(PainProfile.persona == persona.upper())
+    if min_confidence is not None:
+        stmt = stmt.where(PainProfile.confidence >= min_confidence)
+    if created_from is not None:
+        stmt = stmt.where(PainProfile.created_at >= as_utc_naive(created_from))
+    if created_to is not None:
+        stmt = stmt.where(PainProfile.created_at <= as_utc_naive(created_to))
+    try:
+        stmt = keyset_page(stmt, PainProfile.created_at, PainProfile.id, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    rows, next_cursor = page_with_cursor(
+        db.execute(stmt).all(), limit, lambda row: (row.PainProfile.created_at, row.PainProfile.id)
     )
-    return _serialize_pains(0, rows)
+    items = [_serialize_pain_item(row.PainProfile, row.company_name) for row in rows]
+    return PainProfileListResponse(account_id=0, items=items, next_cursor=next_cursor)
 
 
 @router.patch("/pain-profiles/{pain_id}", response_model=PainProfileItem)
@@ -125,7 +176,7 @@ def _serialize_pains(account_id: int, rows: list[PainProfile]) -> PainProfileLis
     return PainProfileListResponse(account_id=account_id, items=items)
 
 
-def _serialize_pain_item(row: PainProfile) -> PainProfileItem:
+def _serialize_pain_item(row: PainProfile, company_name: str | None = None) -> PainProfileItem:
     return PainProfileItem(
         id=row.id,
         account_id=row.account_id,
@@ -140,4 +191,5 @@ def _serialize_pain_item(row: PainProfile) -> PainProfileItem:
         llm_token_usage=row.llm_token_usage,
         llm_fallback_used=bool(row.llm_fallback_used),
         created_at=row.created_at,
+        company_name=company_name,
     )
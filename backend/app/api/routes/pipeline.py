@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.schemas.pipeline import PipelineBoardResponse
 from app.schemas.reports import WeeklyReportResponse
 from app.services.pipeline_console import PipelineConsoleService
@@ -10,13 +13,35 @@ router = APIRouter(tags=["pipeline"])
 
 
 @router.get("/pipeline/board", response_model=PipelineBoardResponse)
-def get_pipeline_board(db: Session = Depends(get_db)):
+def get_pipeline_board(
+    stage: str | None = Query(default=None),
+    owner: str | None = Query(default=None),
+    sort: Literal["due_date", "probability", "bant_score", "company_name", "updated_at"] = Query(default="due_date"),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_read_db),
+):
     service = PipelineConsoleService()
-    return PipelineBoardResponse(items=service.board(db=db))
+    items = service.board(db=db, stage=stage, owner=owner, sort=sort, limit=limit, offset=offset)
+    # 未分頁且從頭取時筆數即總數，省下 COUNT 查詢
+    if limit is None and offset == 0:
+        total = len(items)
+    else:
+        total = service.board_count(db=db, stage=stage, owner=owner)
+    return PipelineBoardResponse(items=items, total=total)
 
 
 @router.get("/reports/weekly", response_model=WeeklyReportResponse)
-def get_weekly_report(db: Session = Depends(get_db)):
+def get_weekly_report(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    group_by: Literal["owner", "segment"] | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+):
     service = PipelineConsoleService()
-    return WeeklyReportResponse(**service.weekly_report(db=db))
+    try:
+        report = service.weekly_report(db=db, start_date=start_date, end_date=end_date, group_by=group_by)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return WeeklyReportResponse(**report)
 
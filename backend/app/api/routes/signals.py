@@ -1,36 +1,95 @@
-from datetime import datetime, timezone
+import json
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models import Account, SignalEvent
-from app.schemas.signals import SignalEventItem, SignalEventListResponse, SignalScanRequest, SignalScanResponse
-from app.services.market_radar import MarketRadarService, rank_signal_for_top20
+from app.schemas.signals import (
+    ScanJobAccountProgress,
+    ScanJobStatusResponse,
+    SignalEventItem,
+    SignalEventListResponse,
+    SignalScanRequest,
+    SignalScanResponse,
+)
+from app.services.feed_pagination import as_utc_naive, keyset_page, page_with_cursor
+from app.services.market_radar import signal_rank_order_by
+from app.services.scan_jobs import ScanJobService, get_scan_job_queue
 
 router = APIRouter(tags=["signals"])
 
 
 @router.post("/signals/scan", response_model=SignalScanResponse)
 def scan_signals(payload: SignalScanRequest, db: Session = Depends(get_db)):
-    service = MarketRadarService()
+    service = ScanJobService()
     try:
-        events_created = service.scan(
+        job = service.create_job(
             db=db,
             account_ids=payload.account_ids,
             lookback_days=payload.lookback_days,
             max_results_per_account=payload.max_results_per_account,
+            concurrency=payload.concurrency,
+            bypass_search_cache=payload.bypass_search_cache,
             use_tavily=payload.use_tavily,
+            incremental=payload.incremental,
         )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if payload.run_in_background:
+        # worker 執行緒需要自己的 session，沿用本次請求的 engine
+        get_scan_job_queue().submit(sessionmaker(bind=db.get_bind(), autoflush=False, future=True), job.id)
+        return SignalScanResponse(job_id=job.id, accounts_processed=0, events_created=0, status=job.status)
+
+    try:
+        job = service.run_job(db, job.id, continue_on_error=False)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    progress = json.loads(job.progress or "{}")
     return SignalScanResponse(
-        job_id=f"scan_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}",
-        accounts_processed=len(payload.account_ids),
-        events_created=events_created,
-        status="completed",
+        job_id=job.id,
+        accounts_processed=job.accounts_processed,
+        events_created=job.events_created,
+        events_updated=job.events_updated,
+        accounts_failed=sum(1 for entry in progress.values() if entry.get("status") == "failed"),
+        status=job.status,
+    )
+
+
+@router.get("/signals/scan/{job_id}", response_model=ScanJobStatusResponse)
+def get_scan_job(job_id: str, db: Session = Depends(get_read_db)):
+    job = ScanJobService().get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Scan job {job_id} not found.")
+
+    accounts = [
+        ScanJobAccountProgress(
+            account_id=int(account_id),
+            status=entry.get("status", "queued"),
+            events_written=entry.get("events_written", 0),
+            events_created=entry.get("events_created", 0),
+            events_updated=entry.get("events_updated", 0),
+            error=entry.get("error"),
+        )
+        for account_id, entry in json.loads(job.progress or "{}").items()
+    ]
+    return ScanJobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        accounts_total=job.accounts_total,
+        accounts_processed=job.accounts_processed,
+        events_created=job.events_created,
+        events_updated=job.events_updated,
+        accounts_failed=sum(1 for item in accounts if item.status == "failed"),
+        accounts=accounts,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
     )
 
 
@@ -38,7 +97,7 @@ def scan_signals(payload: SignalScanRequest, db: Session = Depends(get_db)):
 def list_signals_by_account(
     account_id: int,
     limit: int = Query(default=20, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     account = db.get(Account, account_id)
     if not account:
@@ -48,39 +107,48 @@ def list_signals_by_account(
         db.execute(
             select(SignalEvent)
             .where(SignalEvent.account_id == account_id)
-            .order_by(SignalEvent.fetched_at.desc())
+            .order_by(*signal_rank_order_by())
+            .limit(limit)
         )
         .scalars()
         .all()
     )
-    ranked_rows = sorted(rows, key=rank_signal_for_top20, reverse=True)[:limit]
-    return _serialize_signals(account_id, ranked_rows)
+    return _serialize_signals(account_id, rows)
 
 
 @router.get("/signals/global", response_model=SignalEventListResponse)
 def list_global_signals(
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(default=None, description="上一頁回傳的 next_cursor"),
+    signal_type: str | None = Query(default=None),
+    min_strength: int | None = Query(default=None, ge=0, le=100),
+    max_strength: int | None = Query(default=None, ge=0, le=100),
+    fetched_from: datetime | None = Query(default=None),
+    fetched_to: datetime | None = Query(default=None),
+    db: Session = Depends(get_read_db),
 ):
-    rows = (
-        db.execute(
-            select(SignalEvent)
-            .order_by(SignalEvent.fetched_at.desc())
-            .limit(limit)
-        )
-        .scalars()
-        .all()
+    # 依 (fetched_at, id) keyset 分頁並 join 公司名稱，前端不需再逐筆查 account
+    stmt = select(SignalEvent, Account.company_name).outerjoin(Account, Account.id == SignalEvent.account_id)
+    if signal_type:
+        stmt = stmt.where(SignalEvent.signal_type == signal_type.upper())
+    if min_strength is not None:
+        stmt = stmt.where(SignalEvent.signal_strength >= min_strength)
+    if max_strength is not None:
+        stmt = stmt.where(SignalEvent.signal_strength <= max_strength)
+    if fetched_from is not None:
+        stmt = stmt.where(SignalEvent.fetched_at >= as_utc_naive(fetched_from))
+    if fetched_to is not None:
+        stmt = stmt.where(SignalEvent.fetched_at <= as_utc_naive(fetched_to))
+    try:
+        stmt = keyset_page(stmt, SignalEvent.fetched_at, SignalEvent.id, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    rows, next_cursor = page_with_cursor(
+        db.execute(stmt).all(), limit, lambda row: (row.SignalEvent.fetched_at, row.SignalEvent.id)
     )
-    # Global list not filtered by account, but response model expects account_id. 
-    # We can pass 0 or handling it differently, but for now let's reuse valid schema.
-    # Note: The UI for global list will need company name, which SignalEvent doesn't strictly have joined here yet.
-    # ideally we should join Account. But let's stick to MVP: Client might fetch account details or we enrich.
-    # Actually, for a global table, we usually need the company name. 
-    # Let's verify if SignalEventListResponse allows extra fields or if we need a new schema.
-    # Looking at schema: SignalEventItem has account_id. The list response has `items`.
-    # Frontend will likely need to fetch account info or we should populate it.
-    # For MVP speed, let's return the events. Frontend can show Account ID or we can enrich in a V2.
-    return _serialize_signals(0, rows)
+    items = [_serialize_signal_item(row.SignalEvent, row.company_name) for row in rows]
+    return SignalEventListResponse(account_id=0, items=items, next_cursor=next_cursor)
 
 
 @router.delete("/signals/{signal_id}")
@@ -94,22 +162,24 @@ def delete_signal(signal_id: int, db: Session = Depends(get_db)):
 
 
 def _serialize_signals(account_id: int, rows: list[SignalEvent]) -> SignalEventListResponse:
-    items = [
-        SignalEventItem(
-            id=row.id,
-            account_id=row.account_id,
-            signal_type=row.signal_type,
-            signal_strength=row.signal_strength,
-            event_date=row.event_date,
-            summary=row.summary,
-            evidence_url=row.evidence_url,
-            source_name=row.source_name,
-            source_published_at=row.source_published_at,
-            search_provider=row.search_provider,
-            search_latency_ms=row.search_latency_ms,
-            search_fallback_used=bool(row.search_fallback_used),
-            fetched_at=row.fetched_at,
-        )
-        for row in rows
-    ]
+    items = [_serialize_signal_item(row) for row in rows]
     return SignalEventListResponse(account_id=account_id, items=items)
+
+
+def _serialize_signal_item(row: SignalEvent, company_name: str | None = None) -> SignalEventItem:
+    return SignalEventItem(
+        id=row.id,
+        account_id=row.account_id,
+        signal_type=row.signal_type,
+        signal_strength=row.signal_strength,
+        event_date=row.event_date,
+        summary=row.summary,
+        evidence_url=row.evidence_url,
+        source_name=row.source_name,
+        source_published_at=row.source_published_at,
+        search_provider=row.search_provider,
+        search_latency_ms=row.search_latency_ms,
+        search_fallback_used=bool(row.search_fallback_used),
+        fetched_at=row.fetched_at,
+        company_name=company_name,
+    )
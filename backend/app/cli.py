@@ -1,9 +1,8 @@
 import argparse
-import csv
 import json
 import subprocess
 import sys
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
 from sqlalchemy import select
@@ -11,9 +10,12 @@ from sqlalchemy.exc import OperationalError
 
 from app.db.session import SessionLocal
 from app.models import Account, BANTScorecard, Contact, OutreachDraft, PainProfile, PipelineItem, SignalEvent
+from app.services.account_importer import IMPORT_BATCH_SIZE, AccountImportService, iter_account_csv_rows
 from app.services.bant_scorer import BANTScorerService
+from app.services.exporter import EXPORT_BATCH_SIZE, EXPORT_DATASETS, EXPORT_FORMATS, ExportFilters, iter_export
 from app.services.interaction_logger import InteractionLoggerService
-from app.services.market_radar import MarketRadarService, rank_signal_for_top20
+from app.services.kpi_rollups import rebuild_kpi_rollups, retract_contact_kpis
+from app.services.market_radar import MarketRadarService, signal_rank_order_by
 from app.services.outreach_generator import OutreachGeneratorService
 from app.services.pain_extractor import PainExtractorService
 from app.services.pipeline_console import PipelineConsoleService
@@ -59,65 +61,13 @@ def _contact_to_dict(item: Contact) -> dict:
     }
 
 
-def _parse_csv_accounts(file_path: str) -> list[dict]:
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
-    records: list[dict] = []
-    with path.open("r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        required = {"company_name", "segment"}
-        if not reader.fieldnames or not required.issubset(set(reader.fieldnames)):
-            raise ValueError("CSV must include headers: company_name,segment")
-        for row in reader:
-            company_name = (row.get("company_name") or "").strip()
-            segment = (row.get("segment") or "").strip().upper()
-            if not company_name or not segment:
-                continue
-            records.append(
-                {
-                    "company_name": company_name,
-                    "segment": segment,
-                    "region": (row.get("region") or "").strip() or None,
-                    "website": (row.get("website") or "").strip() or None,
-                    "source": (row.get("source") or "").strip() or "csv_import",
-                    "priority_tier": (row.get("priority_tier") or "").strip() or "T3",
-                }
-            )
-    return records
-
-
 def cmd_import_accounts(args: argparse.Namespace) -> None:
-    records = _parse_csv_accounts(args.file)
-    inserted = 0
-    updated = 0
-    with SessionLocal() as db:
-        for rec in records:
-            existing = db.execute(select(Account).where(Account.company_name == rec["company_name"])).scalar_one_or_none()
-            if existing:
-                existing.segment = rec["segment"]
-                existing.region = rec["region"]
-                existing.website = rec["website"]
-                existing.source = rec["source"]
-                existing.priority_tier = rec["priority_tier"]
-                existing.updated_at = now_utc()
-                updated += 1
-                continue
-            db.add(
-                Account(
-                    company_name=rec["company_name"],
-                    segment=rec["segment"],
-                    region=rec["region"],
-                    website=rec["website"],
-                    source=rec["source"],
-                    priority_tier=rec["priority_tier"],
-                    created_at=now_utc(),
-                    updated_at=now_utc(),
-                )
-            )
-            inserted += 1
-        db.commit()
-    _print({"status": "ok", "inserted": inserted, "updated": updated, "total_rows": len(records)})
+    path = Path(args.file)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {args.file}")
+    with path.open("r", encoding="utf-8-sig", newline="") as handle, SessionLocal() as db:
+        result = AccountImportService(batch_size=args.batch_size).import_rows(db, iter_account_csv_rows(handle))
+    _print(result)
 
 
 def cmd_list_accounts(args: argparse.Namespace) -> None:
@@ -190,6 +140,7 @@ def cmd_delete_account(args: argparse.Namespace) -> None:
         if contacts and not args.force:
             raise ValueError("Account has contacts. Use --force to delete contacts first.")
         for contact in contacts:
+            retract_contact_kpis(db, contact)
             db.delete(contact)
         db.delete(account)
         db.commit()
@@ -217,14 +168,26 @@ def cmd_scan_signals(args: argparse.Namespace) -> None:
         account_ids = _account_ids_from_arg(db, args.account)
         if not account_ids:
             raise ValueError("No accounts found. Import or seed accounts first.")
-        events_created = service.scan(
+        counts = service.scan(
             db=db,
             account_ids=account_ids,
             lookback_days=args.lookback,
             max_results_per_account=args.max_results,
             use_tavily=True,
+            concurrency=args.workers,
+            bypass_search_cache=args.no_search_cache,
+            incremental=not args.full_rescan,
         )
-    _print({"status": "ok", "accounts_processed": len(account_ids), "events_written": events_created})
+    _print(
+        {
+            "status": "ok",
+            "accounts_processed": len(account_ids),
+            "events_written": counts.created + counts.updated,
+            "events_created": counts.created,
+            "events_updated": counts.updated,
+            "accounts_failed": counts.failed,
+        }
+    )
 
 
 def cmd_generate_pains(args: argparse.Namespace) -> None:
@@ -243,6 +206,27 @@ def cmd_generate_pains(args: argparse.Namespace) -> None:
 def cmd_draft_outreach(args: argparse.Namespace) -> None:
     service = OutreachGeneratorService()
     providers = [p.strip().upper() for p in args.providers.split(",") if p.strip()]
+    if args.contacts:
+        contact_ids = [int(c) for c in args.contacts.split(",") if c.strip()]
+        with SessionLocal() as db:
+            items = service.generate_batch(
+                db=db,
+                contact_ids=contact_ids,
+                channel=args.channel,
+                intent=args.intent,
+                tone=args.tone,
+                provider_preference=providers,
+                workers=args.workers,
+            )
+        _print(
+            {
+                "status": "ok",
+                "requested": len(items),
+                "created": sum(1 for item in items if item.status == "CREATED"),
+                "items": [vars(item) for item in items],
+            }
+        )
+        return
     with SessionLocal() as db:
         draft, provider = service.generate(
             db=db,
@@ -314,10 +298,59 @@ def cmd_pipeline_board(args: argparse.Namespace) -> None:
 def cmd_weekly_report(args: argparse.Namespace) -> None:
     service = PipelineConsoleService()
     with SessionLocal() as db:
-        report = service.weekly_report(db=db)
+        report = service.weekly_report(
+            db=db,
+            start_date=_parse_date_arg(args.start),
+            end_date=_parse_date_arg(args.end),
+            group_by=args.group_by,
+        )
     _print({"status": "ok", **report})
 
 
+def cmd_rebuild_kpi_rollups(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        rows = rebuild_kpi_rollups(db, start_date=_parse_date_arg(args.start), end_date=_parse_date_arg(args.end))
+    _print({"status": "ok", "rollup_rows": rows})
+
+
+def _parse_date_arg(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    filters = ExportFilters(
+        account_id=args.account,
+        contact_id=args.contact,
+        since=datetime.fromisoformat(args.since) if args.since else None,
+        until=datetime.fromisoformat(args.until) if args.until else None,
+        signal_type=args.signal_type,
+        min_strength=args.min_strength,
+        persona=args.persona,
+        status=args.status,
+        direction=args.direction,
+    )
+    output = Path(args.output)
+    rows = 0
+
+    def track(total: int) -> None:
+        nonlocal rows
+        rows = total
+
+    with SessionLocal() as db:
+        chunks = iter_export(db, args.dataset, args.format, filters, batch_size=args.batch_size, on_rows=track)
+        # 先寫暫存檔再改名，中途失敗不會留下半份匯出
+        partial = output.with_name(output.name + ".partial")
+        try:
+            with partial.open("wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        partial.replace(output)
+    _print({"status": "ok", "dataset": args.dataset, "format": args.format, "rows": rows, "output": str(output)})
+
+
 def cmd_list_contacts(args: argparse.Namespace) -> None:
     with SessionLocal() as db:
         stmt = select(Contact).order_by(Contact.id.asc())
@@ -374,6 +407,7 @@ def cmd_delete_contact(args: argparse.Namespace) -> None:
         contact = db.get(Contact, args.contact)
         if not contact:
             raise ValueError(f"Contact {args.contact} not found.")
+        retract_contact_kpis(db, contact)
         db.delete(contact)
         db.commit()
     _print({"status": "ok", "deleted_contact_id": args.contact})
@@ -470,12 +504,12 @@ def cmd_demo_report(args: argparse.Namespace) -> None:
             db.execute(
                 select(SignalEvent)
                 .where(SignalEvent.account_id == args.account)
-                .order_by(SignalEvent.fetched_at.desc())
+                .order_by(*signal_rank_order_by())
+                .limit(20)
             )
             .scalars()
             .all()
         )
-        signals = sorted(signals, key=rank_signal_for_top20, reverse=True)[:20]
         pains = (
             db.execute(
                 select(PainProfile)
@@ -615,7 +649,7 @@ def cmd_run_e2e(args: argparse.Namespace) -> None:
             "status": "ok",
             "account_id": args.account,
             "contact_id": contact_id,
-            "signals_written": scan_events,
+            "signals_written": scan_events.created + scan_events.updated,
             "pain_profiles_created": pain_count,
             "pain_provider": pain_provider,
             "outreach_draft_id": draft_id,
@@ -637,6 +671,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     p_import = sub.add_parser("import-accounts", help="Import or update accounts from CSV.")
     p_import.add_argument("--file", required=True, help="CSV path with company_name,segment,... columns")
+    p_import.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per bulk insert/update batch")
     p_import.set_defaults(func=cmd_import_accounts)
 
     p_init = sub.add_parser("init-db", help="Initialize database schema and optional seed data.")
@@ -678,6 +713,13 @@ def build_parser() -> argparse.ArgumentParser:
     p_scan.add_argument("--account", default=None, help="Account id or comma-separated account ids. Default: all.")
     p_scan.add_argument("--lookback", type=int, default=90)
     p_scan.add_argument("--max-results", type=int, default=8)
+    p_scan.add_argument("--workers", type=int, default=None, help="Concurrent account workers. Default: RADAR_SCAN_WORKERS.")
+    p_scan.add_argument("--no-search-cache", action="store_true", help="Bypass the Tavily result cache for this scan.")
+    p_scan.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Reprocess known evidence URLs even when their content is unchanged (JD fetch + translation).",
+    )
     p_scan.set_defaults(func=cmd_scan_signals)
 
     p_pains = sub.add_parser("generate-pains", help="Generate pain profiles from signals.")
@@ -686,12 +728,15 @@ def build_parser() -> argparse.ArgumentParser:
     p_pains.add_argument("--max-items", type=int, default=3)
     p_pains.set_defaults(func=cmd_generate_pains)
 
-    p_draft = sub.add_parser("draft-outreach", help="Generate outreach draft for contact.")
-    p_draft.add_argument("--contact", type=int, required=True)
+    p_draft = sub.add_parser("draft-outreach", help="Generate outreach draft for contact(s).")
+    p_draft_target = p_draft.add_mutually_exclusive_group(required=True)
+    p_draft_target.add_argument("--contact", type=int)
+    p_draft_target.add_argument("--contacts", help="Comma-separated contact ids; drafts are generated as one batch.")
     p_draft.add_argument("--channel", choices=["EMAIL", "LINKEDIN"], default="EMAIL")
     p_draft.add_argument("--intent", choices=["FIRST_TOUCH", "FOLLOW_UP", "REPLY"], default="FIRST_TOUCH")
     p_draft.add_argument("--tone", choices=["TECHNICAL", "CONSULTATIVE", "EXECUTIVE"], default="TECHNICAL")
     p_draft.add_argument("--providers", default="GEMINI,OPENAI")
+    p_draft.add_argument("--workers", type=int, default=None, help="Concurrent LLM calls for --contacts. Default: OUTREACH_BATCH_WORKERS.")
     p_draft.set_defaults(func=cmd_draft_outreach)
 
     p_log = sub.add_parser("log-interaction", help="Log inbound/outbound interaction.")
@@ -713,8 +758,32 @@ def build_parser() -> argparse.ArgumentParser:
     p_board.set_defaults(func=cmd_pipeline_board)
 
     p_weekly = sub.add_parser("weekly-report", help="Display weekly summary report.")
+    p_weekly.add_argument("--start", default=None, help="Start date YYYY-MM-DD. Default: 7 days ago.")
+    p_weekly.add_argument("--end", default=None, help="End date YYYY-MM-DD. Default: today.")
+    p_weekly.add_argument("--group-by", choices=["owner", "segment"], default=None)
     p_weekly.set_defaults(func=cmd_weekly_report)
 
+    p_rollups = sub.add_parser("rebuild-kpi-rollups", help="Recompute daily KPI rollups from raw tables.")
+    p_rollups.add_argument("--start", default=None, help="Start date YYYY-MM-DD. Default: all history.")
+    p_rollups.add_argument("--end", default=None, help="End date YYYY-MM-DD. Default: all history.")
+    p_rollups.set_defaults(func=cmd_rebuild_kpi_rollups)
+
+    p_export = sub.add_parser("export", help="Stream a table to NDJSON / CSV / Parquet file.")
+    p_export.add_argument("--dataset", choices=list(EXPORT_DATASETS), required=True)
+    p_export.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    p_export.add_argument("--output", required=True, help="Output file path")
+    p_export.add_argument("--account", type=int, default=None)
+    p_export.add_argument("--contact", type=int, default=None)
+    p_export.add_argument("--since", default=None, help="ISO datetime, inclusive")
+    p_export.add_argument("--until", default=None, help="ISO datetime, inclusive")
+    p_export.add_argument("--signal-type", default=None)
+    p_export.add_argument("--min-strength", type=int, default=None)
+    p_export.add_argument("--persona", default=None)
+    p_export.add_argument("--status", default=None)
+    p_export.add_argument("--direction", default=None)
+    p_export.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    p_export.set_defaults(func=cmd_export)
+
     p_contacts = sub.add_parser("list-contacts", help="List contacts and ids.")
     p_contacts.add_argument("--account", type=int, default=None)
     p_contacts.set_defaults(func=cmd_list_contacts)
@@ -7,11 +7,75 @@ class Settings(BaseSettings):
     app_name: str = "AI Sales Copilot API"
     app_env: str = "dev"
     database_url: str = "sqlite:///./copilot.db"
+    # SQLite 效能設定（連線建立時套用）：WAL 讓 UI 讀取與掃描寫入並行，busy_timeout 取代立即回報 database is locked
+    sqlite_tuning_enabled: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 20000
+    sqlite_mmap_size_bytes: int = 256 * 1024 * 1024
+    sqlite_temp_store: str = "MEMORY"
+    # 連線池：寫入 engine 與 GET 路由用的唯讀 engine 各自一組
+    db_pool_size: int = 5
+    db_read_pool_size: int = 8
+    db_max_overflow: int = 10
+    db_pool_timeout_s: float = 30.0
     api_prefix: str = "/api/v1"
     tavily_api_key: str | None = None
     gemini_api_key: str | None = None
     openai_api_key: str | None = None
     llm_provider_order: str = "GEMINI,OPENAI"
+    # 單次 LLM 請求逾時；provider 持續失敗時由斷路器直接略過，不再每次等滿逾時
+    llm_timeout_s: float = 30.0
+    # static 依 LLM_PROVIDER_ORDER；latency 依各 provider 最近呼叫的 p50 由快到慢（呼叫端指定的 provider 只限定範圍）
+    llm_routing_mode: str = "static"
+    llm_latency_window: int = 50
+    llm_latency_min_samples: int = 5
+    # 互動式生成（pain / outreach）的 hedged 請求：首選超過 p95（樣本不足時用 LLM_HEDGE_DELAY_MS）就送次選
+    llm_hedge_enabled: bool = False
+    llm_hedge_delay_ms: int = 4000
+    # 市場雷達並行掃描：帳戶 worker 數與各外部 provider 的同時請求上限
+    radar_scan_workers: int = 4
+    tavily_max_concurrency: int = 4
+    llm_max_concurrency: int = 4
+    jd_fetch_max_concurrency: int = 2
+    # 批次開發信的 LLM 並行 worker 數（仍受 LLM_MAX_CONCURRENCY 限制）
+    outreach_batch_workers: int = 4
+    # 各 provider 的 token bucket 速率（每秒請求數），遇 429 自動減半、成功後緩慢回升
+    tavily_rate_per_s: float = 5.0
+    llm_rate_per_s: float = 5.0
+    jd_fetch_rate_per_s: float = 2.0
+    # 斷路器：連續失敗幾次後 open，open 多久後放行探測請求
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_s: float = 30.0
+    # 429 / 5xx / 連線錯誤的重試次數與 full-jitter 指數退避
+    provider_max_retries: int = 2
+    provider_backoff_base_s: float = 0.5
+    provider_backoff_max_s: float = 8.0
+    # 背景掃描 job 的 worker 執行緒數
+    scan_job_workers: int = 2
+    # 啟動時把上次行程遺留的 queued / running job 標記為 failed（job 佇列在行程內，重啟後不會續跑）
+    scan_job_recover_on_startup: bool = True
+    # data/clients.csv 背景同步的輪詢間隔（秒）；0 表示停用，只能經由 POST /accounts/sync 觸發
+    clients_csv_sync_interval_s: float = 10.0
+    # 共用 HTTP 連線池（每個 host 一組）
+    http_max_connections_per_host: int = 10
+    http_max_keepalive_per_host: int = 5
+    http_keepalive_expiry_s: float = 30.0
+    # 外部 API 回應快取（本機 SQLite 檔，相對路徑以 backend/ 為基準）
+    provider_cache_path: str = ".cache/provider_cache.sqlite3"
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 20000
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_s: int = 7 * 86400
+    llm_cache_max_entries: int = 5000
+    # JD 補強快取：新鮮期內不重抓，保留期內以 ETag 重新驗證；抓取失敗以負快取避免重試風暴
+    jd_cache_enabled: bool = True
+    jd_cache_ttl_s: int = 3 * 86400
+    jd_cache_stale_ttl_s: int = 30 * 86400
+    jd_negative_cache_ttl_s: int = 1800
+    jd_cache_max_entries: int = 20000
+    jd_fetch_timeout_s: float = 10.0
     radar_source_allowlist: str = (
         "reuters.com,bloomberg.com,businesswire.com,prnewswire.com,globenewswire.com,"
         "digitimes.com,digitimes.com.tw,cnyes.com,moneydj.com,ctee.com.tw,technews.tw,"
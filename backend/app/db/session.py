@@ -1,13 +1,79 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+def _is_sqlite_file(database_url: str) -> bool:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    return database not in ("", ":memory:") and "mode=memory" not in database
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> list[str]:
+    """依設定產生每條連線建立時要執行的 PRAGMA；空字串 / 0 表示沿用 SQLite 預設。"""
+    if not settings.sqlite_tuning_enabled:
+        return []
+    pragmas = [f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}"]
+    if settings.sqlite_journal_mode:
+        pragmas.append(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    if settings.sqlite_synchronous:
+        pragmas.append(f"PRAGMA synchronous = {settings.sqlite_synchronous}")
+    if settings.sqlite_cache_size_kib:
+        # 負值代表以 KiB 計，與 page_size 無關
+        pragmas.append(f"PRAGMA cache_size = {-int(settings.sqlite_cache_size_kib)}")
+    if settings.sqlite_mmap_size_bytes:
+        pragmas.append(f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size_bytes)}")
+    if settings.sqlite_temp_store:
+        pragmas.append(f"PRAGMA temp_store = {settings.sqlite_temp_store}")
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def build_engine(database_url: str, settings: Settings, read_only: bool = False) -> Engine:
+    """建立 engine；SQLite 檔案庫會套用連線池大小與效能 PRAGMA，read_only 連線另加 query_only。"""
+    if not _is_sqlite_file(database_url):
+        return create_engine(database_url, future=True)
+
+    pool_size = settings.db_read_pool_size if read_only else settings.db_pool_size
+    engine = create_engine(
+        database_url,
+        future=True,
+        pool_size=pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_s,
+        # pysqlite 的 timeout 是拿不到鎖時的等待秒數，與 busy_timeout 對齊
+        connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+    )
+    pragmas = sqlite_pragmas(settings, read_only=read_only)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):  # noqa: ANN001
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return engine
+
+
+engine = build_engine(settings.database_url, settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
+# GET 路由專用的唯讀連線池：WAL 下讀取不會被掃描寫入擋住，也不會佔用寫入連線
+read_engine = (
+    build_engine(settings.database_url, settings, read_only=True) if _is_sqlite_file(settings.database_url) else engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, future=True)
+
 
 def get_db():
     db = SessionLocal()
@@ -16,3 +82,10 @@ def get_db():
     finally:
         db.close()
 
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 from uuid import uuid4
 
@@ -10,6 +11,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.api.routes.accounts import router as accounts_router
 from app.api.routes.bant import router as bant_router
 from app.api.routes.contacts import router as contacts_router
+from app.api.routes.exports import router as exports_router
 from app.api.routes.health import router as health_router
 from app.api.routes.interactions import router as interactions_router
 from app.api.routes.outreach import router as outreach_router
@@ -18,12 +20,38 @@ from app.api.routes.knowledge_docs import router as knowledge_router
 from app.api.routes.pipeline import router as pipeline_router
 from app.api.routes.signals import router as signals_router
 from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.services.csv_utils import ClientsCsvWatcher
+from app.services.providers.cache import close_response_caches
+from app.services.providers.http_pool import close_http_clients
+from app.services.scan_jobs import ScanJobService, shutdown_scan_job_queue
 
 settings = get_settings()
 
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.scan_job_recover_on_startup:
+        # 背景 job 只存在於行程內，重啟前未完成的 job 不會再被執行
+        with SessionLocal() as db:
+            ScanJobService().fail_orphaned_jobs(db)
+    csv_watcher = None
+    if settings.clients_csv_sync_interval_s > 0:
+        csv_watcher = ClientsCsvWatcher(SessionLocal, settings.clients_csv_sync_interval_s)
+        csv_watcher.start()
+    yield
+    if csv_watcher is not None:
+        csv_watcher.stop()
+    # 先停掉背景掃描 worker，再關閉它們可能仍在使用的連線池與快取
+    shutdown_scan_job_queue()
+    # 關閉共用 HTTP 連線池，避免 reload / 關機時殘留 keep-alive 連線
+    close_http_clients()
+    close_response_caches()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 # Set all CORS enabled origins
 app.add_middleware(
@@ -44,6 +72,7 @@ app.include_router(interactions_router, prefix=settings.api_prefix)
 app.include_router(bant_router, prefix=settings.api_prefix)
 app.include_router(pipeline_router, prefix=settings.api_prefix)
 app.include_router(knowledge_router, prefix=settings.api_prefix)
+app.include_router(exports_router, prefix=settings.api_prefix)
 
 @app.get("/", include_in_schema=False)
 def index():
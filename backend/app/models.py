@@ -1,6 +1,18 @@
 from datetime import date, datetime
 
-from sqlalchemy import CheckConstraint, Date, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -27,6 +39,9 @@ class SignalEvent(Base):
     __table_args__ = (
         UniqueConstraint("account_id", "evidence_url", name="uq_signal_event_account_url"),
         CheckConstraint("signal_strength BETWEEN 0 AND 100", name="ck_signal_strength_range"),
+        Index("ix_signal_events_account_fetched", "account_id", "fetched_at"),
+        Index("ix_signal_events_account_strength", "account_id", "signal_strength", "fetched_at"),
+        Index("ix_signal_events_fetched_at", "fetched_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -41,12 +56,18 @@ class SignalEvent(Base):
     search_provider: Mapped[str] = mapped_column(String(32), nullable=True)
     search_latency_ms: Mapped[int] = mapped_column(Integer, nullable=True)
     search_fallback_used: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # 搜尋結果原始內容的 sha256，增量掃描據此判斷是否需要重新處理
+    content_fingerprint: Mapped[str] = mapped_column(String(64), nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
 
 
 class PainProfile(Base):
     __tablename__ = "pain_profiles"
-    __table_args__ = (CheckConstraint("confidence >= 0.0 AND confidence <= 1.0", name="ck_pain_confidence_range"),)
+    __table_args__ = (
+        CheckConstraint("confidence >= 0.0 AND confidence <= 1.0", name="ck_pain_confidence_range"),
+        Index("ix_pain_profiles_account_confidence", "account_id", "confidence", "created_at"),
+        Index("ix_pain_profiles_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
@@ -65,7 +86,10 @@ class PainProfile(Base):
 
 class Contact(Base):
     __tablename__ = "contacts"
-    __table_args__ = (CheckConstraint("contactability_score BETWEEN 0 AND 100", name="ck_contactability_range"),)
+    __table_args__ = (
+        CheckConstraint("contactability_score BETWEEN 0 AND 100", name="ck_contactability_range"),
+        Index("ix_contacts_account_id", "account_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
@@ -79,6 +103,10 @@ class Contact(Base):
 
 class OutreachDraft(Base):
     __tablename__ = "outreach_drafts"
+    __table_args__ = (
+        Index("ix_outreach_drafts_contact_created", "contact_id", "created_at"),
+        Index("ix_outreach_drafts_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.id"), nullable=False)
@@ -98,6 +126,7 @@ class OutreachDraft(Base):
 
 class InteractionLog(Base):
     __tablename__ = "interaction_logs"
+    __table_args__ = (Index("ix_interaction_logs_contact_occurred", "contact_id", "occurred_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     contact_id: Mapped[int] = mapped_column(ForeignKey("contacts.id"), nullable=False)
@@ -111,7 +140,10 @@ class InteractionLog(Base):
 
 class BANTScorecard(Base):
     __tablename__ = "bant_scorecards"
-    __table_args__ = (CheckConstraint("total_score BETWEEN 0 AND 100", name="ck_bant_total_score_range"),)
+    __table_args__ = (
+        CheckConstraint("total_score BETWEEN 0 AND 100", name="ck_bant_total_score_range"),
+        Index("ix_bant_scorecards_account_created", "account_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
@@ -128,7 +160,10 @@ class BANTScorecard(Base):
 
 class PipelineItem(Base):
     __tablename__ = "pipeline_items"
-    __table_args__ = (CheckConstraint("probability >= 0.0 AND probability <= 1.0", name="ck_pipeline_probability_range"),)
+    __table_args__ = (
+        CheckConstraint("probability >= 0.0 AND probability <= 1.0", name="ck_pipeline_probability_range"),
+        Index("ix_pipeline_items_account_updated", "account_id", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), nullable=False)
@@ -155,3 +190,56 @@ class KnowledgeDoc(Base):
     created_by: Mapped[str] = mapped_column(String(128), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DailyKpiRollup(Base):
+    """每日 × 帳戶的 KPI 計數，於互動 / 草稿 / BANT 寫入時同交易遞增，報表只讀這張表。"""
+
+    __tablename__ = "daily_kpi_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    account_id: Mapped[int] = mapped_column(ForeignKey("accounts.id"), primary_key=True)
+    interactions_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    outbound_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    inbound_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    drafts_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bant_a_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bant_b_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bant_c_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class ScanJob(Base):
+    __tablename__ = "scan_jobs"
+    # 啟動時以 status 找出上次行程遺留的未完成 job
+    __table_args__ = (Index("ix_scan_jobs_status_created_at", "status", "created_at"),)
+
+    id: Mapped[str] = mapped_column(String(40), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    account_ids: Mapped[str] = mapped_column(Text, nullable=False)
+    lookback_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_results_per_account: Mapped[int] = mapped_column(Integer, nullable=False)
+    concurrency: Mapped[int] = mapped_column(Integer, nullable=True)
+    bypass_search_cache: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    incremental: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    accounts_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    accounts_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    events_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    events_updated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    progress: Mapped[str] = mapped_column(Text, nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+
+
+class CsvSyncState(Base):
+    """記錄上次同步的 CSV 簽章（mtime / size / sha256），檔案未變動時略過解析。"""
+
+    __tablename__ = "csv_sync_state"
+
+    source: Mapped[str] = mapped_column(String(255), primary_key=True)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    synced_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -23,6 +23,14 @@ class AccountImportResponse(BaseModel):
     total_rows: int
 
 
+class AccountSyncResponse(BaseModel):
+    status: str
+    inserted: int
+    updated: int
+    unchanged: int
+    total_rows: int
+
+
 class AccountCreateRequest(BaseModel):
     company_name: str = Field(min_length=2, max_length=255)
     segment: str = Field(min_length=2, max_length=32)
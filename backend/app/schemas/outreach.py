@@ -17,6 +17,29 @@ class OutreachGenerateResponse(BaseModel):
     status: str
 
 
+class OutreachBatchGenerateRequest(BaseModel):
+    contact_ids: list[int] = Field(min_length=1, max_length=500)
+    channel: str = Field(pattern="^(EMAIL|LINKEDIN)$")
+    intent: str = Field(pattern="^(FIRST_TOUCH|FOLLOW_UP|REPLY)$")
+    tone: str = Field(default="TECHNICAL", pattern="^(TECHNICAL|CONSULTATIVE|EXECUTIVE)$")
+    llm_provider_preference: list[str] = Field(default_factory=lambda: ["GEMINI", "OPENAI"])
+
+
+class OutreachBatchItemResponse(BaseModel):
+    contact_id: int
+    status: str
+    draft_id: int | None = None
+    model_provider: str | None = None
+    error: str | None = None
+
+
+class OutreachBatchGenerateResponse(BaseModel):
+    requested: int
+    created: int
+    failed: int
+    items: list[OutreachBatchItemResponse]
+
+
 class OutreachStatusPatchRequest(BaseModel):
     status: str = Field(pattern="^(DRAFT|APPROVED|REJECTED)$")
 
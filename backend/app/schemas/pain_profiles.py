@@ -41,8 +41,12 @@ class PainProfileItem(BaseModel):
     llm_token_usage: int | None
     llm_fallback_used: bool
     created_at: datetime
+    # 只有 /pain-profiles/global 會帶入（join accounts）
+    company_name: str | None = None
 
 
 class PainProfileListResponse(BaseModel):
     account_id: int
     items: list[PainProfileItem]
+    # 下一頁的 keyset cursor；None 表示已到最後一頁
+    next_cursor: str | None = None
@@ -18,4 +18,5 @@ class PipelineBoardItem(BaseModel):
 
 class PipelineBoardResponse(BaseModel):
     items: list[PipelineBoardItem]
+    total: int
 
@@ -3,6 +3,17 @@ from datetime import date
 from pydantic import BaseModel
 
 
+class KpiBreakdownItem(BaseModel):
+    key: str
+    outbound_count: int
+    inbound_count: int
+    accounts_touched: int
+    drafts_created: int
+    bant_a_count: int
+    bant_b_count: int
+    bant_c_count: int
+
+
 class WeeklyReportResponse(BaseModel):
     start_date: date
     end_date: date
@@ -13,4 +24,5 @@ class WeeklyReportResponse(BaseModel):
     bant_a_count: int
     bant_b_count: int
     bant_c_count: int
-
+    group_by: str | None = None
+    breakdown: list[KpiBreakdownItem] = []
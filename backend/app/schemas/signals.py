@@ -8,15 +8,51 @@ class SignalScanRequest(BaseModel):
     lookback_days: int = Field(default=90, ge=1, le=365)
     max_results_per_account: int = Field(default=8, ge=1, le=20)
     use_tavily: bool = True
+    # 同時掃描的帳戶數；未指定時使用 RADAR_SCAN_WORKERS
+    concurrency: int | None = Field(default=None, ge=1, le=16)
+    # True 時略過搜尋結果快取，強制重新查詢 Tavily
+    bypass_search_cache: bool = False
+    # True 時既有且內容未變的結果只刷新 fetched_at / 強度，不再抓 JD 與翻譯；False 強制完整重跑
+    incremental: bool = True
+    # True 時立即回傳 queued job，由背景 worker 執行；以 GET /signals/scan/{job_id} 查詢進度
+    run_in_background: bool = False
 
 
 class SignalScanResponse(BaseModel):
     job_id: str
     accounts_processed: int
     events_created: int
+    # 既有 evidence_url 被覆寫或刷新的筆數（不計入 events_created）
+    events_updated: int = 0
+    # 搜尋 provider 不可用等原因而失敗的帳戶數，明細見 GET /signals/scan/{job_id}
+    accounts_failed: int = 0
     status: str
 
 
+class ScanJobAccountProgress(BaseModel):
+    account_id: int
+    status: str
+    events_written: int = 0
+    events_created: int = 0
+    events_updated: int = 0
+    error: str | None = None
+
+
+class ScanJobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    accounts_total: int
+    accounts_processed: int
+    events_created: int
+    events_updated: int = 0
+    accounts_failed: int
+    accounts: list[ScanJobAccountProgress]
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
 class SignalEventItem(BaseModel):
     id: int
     account_id: int
@@ -31,8 +67,12 @@ class SignalEventItem(BaseModel):
     search_latency_ms: int | None
     search_fallback_used: bool
     fetched_at: datetime
+    # 只有 /signals/global 會帶入（join accounts），單一帳戶列表維持 None
+    company_name: str | None = None
 
 
 class SignalEventListResponse(BaseModel):
     account_id: int
     items: list[SignalEventItem]
+    # 下一頁的 keyset cursor；None 表示已到最後一頁
+    next_cursor: str | None = None
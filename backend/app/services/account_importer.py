@@ -0,0 +1,86 @@
+import csv
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Account
+from app.services.utils import now_utc
+
+IMPORT_BATCH_SIZE = 1000
+_REQUIRED_CSV_HEADERS = {"company_name", "segment"}
+
+
+def iter_account_csv_rows(lines: Iterable[str], default_source: str = "csv_import") -> Iterator[dict]:
+    """逐列解析帳戶 CSV（產生器），大檔不需整份讀進記憶體。"""
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not _REQUIRED_CSV_HEADERS.issubset(set(reader.fieldnames)):
+        raise ValueError("CSV must include headers: company_name,segment")
+    for row in reader:
+        company_name = (row.get("company_name") or "").strip()
+        segment = (row.get("segment") or "").strip().upper()
+        if not company_name or not segment:
+            continue
+        yield {
+            "company_name": company_name,
+            "segment": segment,
+            "region": (row.get("region") or "").strip() or None,
+            "website": (row.get("website") or "").strip() or None,
+            "source": (row.get("source") or "").strip() or default_source,
+            "priority_tier": (row.get("priority_tier") or "").strip() or "T3",
+        }
+
+
+class AccountImportService:
+    """以 company_name 比對的批次 upsert：既有名稱一次載入，新增與更新各自批次送出。"""
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE) -> None:
+        self.batch_size = max(1, batch_size)
+
+    def import_rows(self, db: Session, rows: Iterable[dict]) -> dict:
+        # 重複名稱沿用最早建立的帳戶，與 UI 上看到的第一筆一致
+        id_by_name: dict[str, int] = dict(
+            db.execute(select(Account.company_name, func.min(Account.id)).group_by(Account.company_name)).all()
+        )
+        inserted = 0
+        updated = 0
+        total_rows = 0
+        iterator = iter(rows)
+        while batch := list(islice(iterator, self.batch_size)):
+            total_rows += len(batch)
+            now = now_utc()
+            inserts: dict[str, dict] = {}
+            updates: dict[int, dict] = {}
+            for rec in batch:
+                values = {
+                    "company_name": rec["company_name"],
+                    "segment": rec["segment"].upper(),
+                    "region": rec.get("region"),
+                    "website": rec.get("website"),
+                    "source": rec.get("source"),
+                    "priority_tier": rec.get("priority_tier"),
+                    "updated_at": now,
+                }
+                account_id = id_by_name.get(rec["company_name"])
+                if account_id is not None:
+                    updates[account_id] = {"id": account_id, **values}
+                    updated += 1
+                elif rec["company_name"] in inserts:
+                    # 同一批內重複出現：以最後一筆為準，視為更新
+                    inserts[rec["company_name"]].update(values)
+                    updated += 1
+                else:
+                    inserts[rec["company_name"]] = {**values, "created_at": now}
+                    inserted += 1
+
+            if inserts:
+                created = db.execute(
+                    insert(Account).returning(Account.id, Account.company_name), list(inserts.values())
+                ).all()
+                id_by_name.update({company_name: account_id for account_id, company_name in created})
+            if updates:
+                db.execute(update(Account), list(updates.values()))
+
+        db.commit()
+        return {"status": "ok", "inserted": inserted, "updated": updated, "total_rows": total_rows}
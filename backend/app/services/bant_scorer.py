@@ -4,14 +4,14 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import BANTScorecard, Contact, InteractionLog
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.kpi_rollups import bant_kpi_increments, record_kpi
 from app.services.pipeline_utils import upsert_pipeline_item
 from app.services.utils import now_utc
 
 
-def _keyword_score(text: str, keywords: list[str], step: int, cap: int) -> int:
-    lower = text.lower()
-    hits = sum(1 for token in keywords if token in lower)
-    return min(cap, hits * step)
+def _keyword_score(hits: set[str], step: int, cap: int) -> int:
+    return min(cap, len(hits) * step)
 
 
 class BANTScorerService:
@@ -21,6 +21,17 @@ class BANTScorerService:
     timeline_keywords = ["q1", "q2", "q3", "q4", "week", "month", "deadline", "pilot", "poc", "schedule"]
     technical_track_keywords = ["rd", "npi", "yield", "alignment", "inspection", "optical", "process", "validation"]
 
+    def __init__(self) -> None:
+        self.keyword_matcher = KeywordMatcher(
+            {
+                "budget": self.budget_keywords,
+                "authority": self.authority_keywords,
+                "need": self.need_keywords,
+                "timeline": self.timeline_keywords,
+                "technical_track": self.technical_track_keywords,
+            }
+        )
+
     def score(self, db: Session, account_id: int, lookback_days: int) -> BANTScorecard:
         cutoff = now_utc() - timedelta(days=lookback_days)
         logs = (
@@ -39,11 +50,12 @@ class BANTScorerService:
         merged_text = " ".join(log.content_summary for log in logs)
         inbound_positive = sum(1 for log in logs if log.direction == "INBOUND" and log.sentiment == "POSITIVE")
 
-        budget = _keyword_score(merged_text, self.budget_keywords, step=6, cap=25)
-        authority = _keyword_score(merged_text, self.authority_keywords, step=6, cap=25)
-        need = _keyword_score(merged_text, self.need_keywords, step=6, cap=30)
-        timeline = _keyword_score(merged_text, self.timeline_keywords, step=5, cap=20)
-        technical_track = _keyword_score(merged_text, self.technical_track_keywords, step=4, cap=20)
+        hits = self.keyword_matcher.scan(merged_text)
+        budget = _keyword_score(hits["budget"], step=6, cap=25)
+        authority = _keyword_score(hits["authority"], step=6, cap=25)
+        need = _keyword_score(hits["need"], step=6, cap=30)
+        timeline = _keyword_score(hits["timeline"], step=5, cap=20)
+        technical_track = _keyword_score(hits["technical_track"], step=4, cap=20)
 
         if inbound_positive:
             need = min(30, need + 3)
@@ -95,6 +107,7 @@ class BANTScorerService:
             created_at=now_utc(),
         )
         db.add(scorecard)
+        record_kpi(db, account_id, scorecard.created_at, **bant_kpi_increments(grade))
         upsert_pipeline_item(
             db=db,
             account_id=account_id,
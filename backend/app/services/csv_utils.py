@@ -1,8 +1,17 @@
 import csv
+import hashlib
+import io
+import logging
 import os
+import threading
+from collections.abc import Callable
 from pathlib import Path
 from datetime import datetime
-from app.models import Account
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Account, CsvSyncState
 from app.services.utils import now_utc
 
 DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
@@ -29,33 +38,111 @@ def get_accounts_from_csv():
             })
     return accounts
 
-def sync_csv_to_db(db):
-    if not CLIENTS_CSV.exists():
-        return
-    
-    with open(CLIENTS_CSV, mode='r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            acc_id = int(row["id"])
-            existing = db.get(Account, acc_id)
-            if existing:
-                existing.company_name = row["company_name"]
-                existing.segment = row["segment"].upper()
-                existing.region = row.get("region")
-                existing.website = row.get("website")
-                existing.source = row.get("source")
-                existing.priority_tier = row.get("priority_tier")
-                existing.updated_at = now_utc()
-            else:
-                db.add(Account(
-                    id=acc_id,
-                    company_name=row["company_name"],
-                    segment=row["segment"].upper(),
-                    region=row.get("region"),
-                    website=row.get("website"),
-                    source=row.get("source"),
-                    priority_tier=row.get("priority_tier"),
-                    created_at=now_utc(),
-                    updated_at=now_utc()
-                ))
+_ACCOUNT_CSV_FIELDS = ("company_name", "segment", "region", "website", "source", "priority_tier")
+
+_logger = logging.getLogger(__name__)
+
+
+def _csv_account_values(row: dict) -> dict:
+    return {
+        "company_name": row["company_name"],
+        "segment": row["segment"].upper(),
+        "region": row.get("region"),
+        "website": row.get("website"),
+        "source": row.get("source"),
+        "priority_tier": row.get("priority_tier"),
+    }
+
+
+def sync_csv_to_db(db: Session, force: bool = False, path: Path | None = None) -> dict:
+    """CSV 有變動才解析並做差異 upsert。
+
+    先比 mtime / size，再比內容 sha256（touch 但內容沒變也會略過）；只更新欄位有差異的帳戶。
+    """
+    path = path or CLIENTS_CSV
+    result = {"status": "skipped", "inserted": 0, "updated": 0, "unchanged": 0, "total_rows": 0}
+    if not path.exists():
+        result["status"] = "missing"
+        return result
+
+    stat = path.stat()
+    state = db.get(CsvSyncState, path.name)
+    if not force and state and state.mtime_ns == stat.st_mtime_ns and state.size_bytes == stat.st_size:
+        return result
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    if not force and state and state.content_sha256 == digest:
+        state.mtime_ns = stat.st_mtime_ns
+        state.size_bytes = stat.st_size
         db.commit()
+        return result
+
+    rows = {int(row["id"]): _csv_account_values(row) for row in csv.DictReader(io.StringIO(content.decode("utf-8")))}
+    existing = {
+        account.id: account
+        for account in db.execute(select(Account).where(Account.id.in_(list(rows)))).scalars()
+    } if rows else {}
+
+    now = now_utc()
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for acc_id, values in rows.items():
+        current = existing.get(acc_id)
+        if current is None:
+            inserts.append({"id": acc_id, **values, "created_at": now, "updated_at": now})
+        elif any(getattr(current, field) != values[field] for field in _ACCOUNT_CSV_FIELDS):
+            updates.append({"id": acc_id, **values, "updated_at": now})
+    if inserts:
+        db.execute(insert(Account), inserts)
+    if updates:
+        db.execute(update(Account), updates)
+
+    if state is None:
+        state = CsvSyncState(source=path.name, mtime_ns=0, size_bytes=0, content_sha256="", synced_at=now)
+        db.add(state)
+    state.mtime_ns = stat.st_mtime_ns
+    state.size_bytes = stat.st_size
+    state.content_sha256 = digest
+    state.synced_at = now
+    db.commit()
+
+    result.update(
+        status="synced",
+        inserted=len(inserts),
+        updated=len(updates),
+        unchanged=len(rows) - len(inserts) - len(updates),
+        total_rows=len(rows),
+    )
+    return result
+
+
+class ClientsCsvWatcher:
+    """背景輪詢 clients.csv；檔案簽章沒變時每次只有一次 stat 與一次主鍵查詢。"""
+
+    def __init__(self, session_factory: Callable[[], Session], interval_s: float) -> None:
+        self.session_factory = session_factory
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="clients-csv-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with self.session_factory() as db:
+                    result = sync_csv_to_db(db)
+                if result["status"] == "synced":
+                    _logger.info("clients.csv synced: %s", result)
+            except Exception:  # noqa: BLE001
+                _logger.exception("clients.csv sync failed")
+            if self._stop.wait(self.interval_s):
+                return
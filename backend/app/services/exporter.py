@@ -0,0 +1,218 @@
+import csv
+import importlib.util
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, Select, select
+from sqlalchemy.orm import Session
+
+from app.models import Contact, InteractionLog, OutreachDraft, PainProfile, SignalEvent
+from app.services.feed_pagination import as_utc_naive
+
+# pyarrow 為選用套件；未安裝時僅提供 ndjson / csv
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_BATCH_SIZE = 1000
+
+
+@dataclass
+class ExportFilters:
+    account_id: int | None = None
+    contact_id: int | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    signal_type: str | None = None
+    min_strength: int | None = None
+    persona: str | None = None
+    status: str | None = None
+    direction: str | None = None
+
+
+@dataclass(frozen=True)
+class _ExportDataset:
+    model: type
+    time_column: str
+    # 各資料集支援的篩選欄位（since / until 一律套在 time_column）
+    filters: tuple[str, ...]
+
+
+EXPORT_DATASETS: dict[str, _ExportDataset] = {
+    "signals": _ExportDataset(SignalEvent, "fetched_at", ("account_id", "signal_type", "min_strength")),
+    "pain-profiles": _ExportDataset(PainProfile, "created_at", ("account_id", "persona")),
+    "outreach-drafts": _ExportDataset(OutreachDraft, "created_at", ("account_id", "contact_id", "status")),
+    "interactions": _ExportDataset(InteractionLog, "occurred_at", ("account_id", "contact_id", "direction")),
+}
+
+
+def build_export_query(dataset: str, filters: ExportFilters | None = None) -> tuple[Select, list[Column]]:
+    """依資料集與篩選條件組出匯出查詢；不支援的資料集或篩選欄位丟 ValueError。"""
+    spec = EXPORT_DATASETS.get(dataset)
+    if spec is None:
+        raise ValueError(f"不支援的匯出資料集: {dataset}（可用: {', '.join(EXPORT_DATASETS)}）")
+    filters = filters or ExportFilters()
+    requested = {
+        item.name
+        for item in fields(filters)
+        if item.name not in ("since", "until") and getattr(filters, item.name) is not None
+    }
+    unsupported = requested - set(spec.filters)
+    if unsupported:
+        raise ValueError(f"{dataset} 不支援篩選欄位: {', '.join(sorted(unsupported))}")
+
+    table = spec.model.__table__
+    columns = list(table.columns)
+    time_column = table.c[spec.time_column]
+    stmt = select(*columns)
+    if filters.account_id is not None:
+        if "account_id" in table.c:
+            stmt = stmt.where(table.c.account_id == filters.account_id)
+        else:
+            # 草稿與互動紀錄掛在 contact 底下，經由 contacts 反查帳戶
+            account_contacts = select(Contact.id).where(Contact.account_id == filters.account_id)
+            stmt = stmt.where(table.c.contact_id.in_(account_contacts))
+    if filters.contact_id is not None:
+        stmt = stmt.where(table.c.contact_id == filters.contact_id)
+    if filters.signal_type:
+        stmt = stmt.where(table.c.signal_type == filters.signal_type.upper())
+    if filters.min_strength is not None:
+        stmt = stmt.where(table.c.signal_strength >= filters.min_strength)
+    if filters.persona:
+        stmt = stmt.where(table.c.persona == filters.persona.upper())
+    if filters.status:
+        stmt = stmt.where(table.c.status == filters.status.upper())
+    if filters.direction:
+        stmt = stmt.where(table.c.direction == filters.direction.upper())
+    if filters.since is not None:
+        stmt = stmt.where(time_column >= as_utc_naive(filters.since))
+    if filters.until is not None:
+        stmt = stmt.where(time_column <= as_utc_naive(filters.until))
+    return stmt.order_by(time_column.asc(), table.c.id.asc()), columns
+
+
+def _json_value(value):  # noqa: ANN001, ANN202
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _iter_ndjson(batches: Iterable[list], names: list[str]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = (json.dumps(dict(zip(names, map(_json_value, row))), ensure_ascii=False) for row in batch)
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _iter_csv(batches: Iterable[list], names: list[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in batches:
+        writer.writerows([_json_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """給 ParquetWriter 的檔案介面：寫入的位元組暫存起來，每個 row group 後取走送出。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # noqa: ANN001
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(columns: list[Column]):  # noqa: ANN202
+    import pyarrow as pa
+
+    def arrow_type(column: Column):  # noqa: ANN202
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us")
+        if isinstance(column.type, Date):
+            return pa.date32()
+        return pa.string()
+
+    return pa.schema([(column.name, arrow_type(column)) for column in columns])
+
+
+def _iter_parquet(batches: Iterable[list], columns: list[Column]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    names = [column.name for column in columns]
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            # 每批寫成一個 row group，記憶體只保留當批資料
+            writer.write_table(pa.Table.from_pylist([dict(zip(names, row)) for row in batch], schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_export(
+    db: Session,
+    dataset: str,
+    fmt: str,
+    filters: ExportFilters | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    on_rows: Callable[[int], None] | None = None,
+) -> Iterator[bytes]:
+    """以 server-side cursor（yield_per）分批讀取並逐批編碼，匯出任意筆數時記憶體維持常數。
+
+    on_rows 在每批送出後以累計筆數呼叫，供 CLI 回報進度。
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支援的匯出格式: {fmt}（可用: {', '.join(EXPORT_FORMATS)}）")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ValueError("parquet 匯出需要安裝 pyarrow。")
+    stmt, columns = build_export_query(dataset, filters)
+
+    def batches() -> Iterator[list]:
+        total = 0
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            total += len(partition)
+            yield partition
+            if on_rows is not None:
+                on_rows(total)
+
+    names = [column.name for column in columns]
+    if fmt == "ndjson":
+        return _iter_ndjson(batches(), names)
+    if fmt == "csv":
+        return _iter_csv(batches(), names)
+    return _iter_parquet(batches(), columns)
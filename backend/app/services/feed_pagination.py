@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from datetime import UTC, datetime
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def as_utc_naive(value: datetime | None) -> datetime | None:
+    """查詢參數的時間統一轉成 UTC 無時區，與 SQLite 內儲存的格式一致才能正確比較。"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """將 (排序時間, id) 編成不透明的 cursor 字串，前端原封不動帶回即可。"""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return as_utc_naive(datetime.fromisoformat(sort_value)), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise ValueError("cursor 格式錯誤。") from exc
+
+
+def keyset_page(
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+) -> Select:
+    """以 (sort_column, id) 遞減做 keyset 分頁：從上一頁最後一筆之後接續，不用 OFFSET。
+
+    多取一筆用來判斷是否還有下一頁，呼叫端以 page_with_cursor 切回 limit 筆。
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+        )
+    return stmt.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def page_with_cursor(rows: list, limit: int, sort_key) -> tuple[list, str | None]:  # noqa: ANN001
+    """切出本頁資料並產生下一頁 cursor；sort_key(row) 回傳 (排序時間, id)。"""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*sort_key(page[-1]))
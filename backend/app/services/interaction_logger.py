@@ -1,6 +1,9 @@
+from datetime import UTC
+
 from sqlalchemy.orm import Session
 
 from app.models import Contact, InteractionLog
+from app.services.kpi_rollups import interaction_kpi_increments, record_kpi
 from app.services.pipeline_utils import upsert_pipeline_item
 from app.services.utils import now_utc
 
@@ -21,6 +24,9 @@ class InteractionLoggerService:
         if not contact:
             raise ValueError(f"找不到聯絡人 Contact {contact_id}。")
 
+        if occurred_at is not None and occurred_at.tzinfo is not None:
+            # SQLite 的 DateTime 只存時鐘數字不轉時區；統一換成 UTC，rollup 的日期才與 date(occurred_at) 一致
+            occurred_at = occurred_at.astimezone(UTC)
         interaction = InteractionLog(
             contact_id=contact_id,
             channel=channel,
@@ -31,6 +37,7 @@ class InteractionLoggerService:
             occurred_at=occurred_at or now_utc(),
         )
         db.add(interaction)
+        record_kpi(db, contact.account_id, interaction.occurred_at, **interaction_kpi_increments(direction))
 
         if direction == "OUTBOUND":
             stage = "CONTACTED"
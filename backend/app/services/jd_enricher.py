@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.providers.cache import get_response_cache
+from app.services.providers.http_pool import get_async_http_client, run_async
+from app.services.providers.limits import CircuitOpenError, acall_with_resilience, async_provider_slot
+
+_104_JD_API = "https://www.104.com.tw/job/ajax/content/{job_id}"
+_JINA_READER = "https://r.jina.ai/{url}"
+_104_JOB_ID_RE = re.compile(r"104\.com\.tw/job/([A-Za-z0-9]+)")
+
+_logger = logging.getLogger(__name__)
+
+
+def extract_104_job_id(url: str) -> str | None:
+    match = _104_JOB_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def parse_104_jd(payload: dict) -> str | None:
+    """104 職缺 API 回應轉成 JD 純文字；實際欄位為 jobDescription（非 jobContent），技能在 condition.skill。"""
+    data = payload.get("data") or {}
+    header = data.get("header") or {}
+    job_detail = data.get("jobDetail") or {}
+    condition = data.get("condition") or {}
+    welfare = data.get("welfare") or {}
+    skill_labels = " ".join(s.get("description", "") for s in (condition.get("skill") or []) if s.get("description"))
+    parts = [
+        header.get("jobName", ""),
+        (job_detail.get("jobDescription") or "")[:600],
+        skill_labels,
+        (condition.get("other") or "")[:200],
+        (welfare.get("welfare") or "")[:200],
+    ]
+    text = " ".join(p for p in parts if p).strip()
+    return text[:1200] if text else None
+
+
+def _parse_jina(resp: httpx.Response) -> str | None:
+    text = resp.text.strip()
+    return text[:2000] if text else None
+
+
+@dataclass(frozen=True)
+class JDRequest:
+    # 快取 key：104 以職缺 ID、其他來源以原始 URL，同一職缺不同追蹤參數共用一筆
+    cache_key: str
+    fetch_url: str
+    # 限流與斷路器使用的 provider 名稱
+    provider: str
+    headers: dict[str, str] = field(default_factory=dict)
+    parse: Callable[[httpx.Response], str | None] = _parse_jina
+
+
+def jd_request_for(url: str) -> JDRequest | None:
+    """決定職缺頁的抓取方式；不支援的網址回傳 None。"""
+    lowered = (url or "").lower()
+    if "104.com.tw/job/" in lowered:
+        job_id = extract_104_job_id(url)
+        if not job_id:
+            return None
+        return JDRequest(
+            cache_key=f"104:{job_id}",
+            provider="JD_104",
+            fetch_url=_104_JD_API.format(job_id=job_id),
+            headers={"Referer": "https://www.104.com.tw/", "Accept": "application/json"},
+            parse=lambda resp: parse_104_jd(resp.json()),
+        )
+    if "linkedin.com/jobs/view/" in lowered:
+        return JDRequest(cache_key=f"url:{url}", fetch_url=_JINA_READER.format(url=url), provider="JINA")
+    return None
+
+
+@dataclass
+class JDEnrichStats:
+    cache_hits: int = 0
+    negative_hits: int = 0
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0
+
+
+class JDEnricher:
+    """招募訊號的 JD 補強階段：先查 JD 快取，未命中的職缺頁在背景 event loop 並行抓取。
+
+    快取存在 provider 快取檔的 jd_content 表：新鮮期內直接使用；過期但仍保留的項目帶
+    ETag / Last-Modified 做條件式請求，304 時延長新鮮期；失敗以較短 TTL 記為負快取。
+    查快取在進入 event loop 前完成，抓取後的寫入以 asyncio.to_thread 執行，不阻塞其他並行請求。
+    """
+
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
+    def enrich(self, urls: list[str]) -> dict[str, str | None]:
+        """回傳 {url: JD 文字或 None}；不支援的網址直接對應 None。"""
+        if not urls:
+            return {}
+        stats = JDEnrichStats()
+        texts: dict[str, str | None] = {}
+        pending: dict[str, tuple[JDRequest, dict | None, list[str]]] = {}
+        cache = self._cache()
+        now = time.time()
+        for url in dict.fromkeys(urls):
+            request = jd_request_for(url)
+            if request is None:
+                texts[url] = None
+                continue
+            if request.cache_key in pending:
+                pending[request.cache_key][2].append(url)
+                continue
+            entry = cache.get(request.cache_key) if cache is not None else None
+            if entry is not None and entry.get("fresh_until", 0) > now:
+                texts[url] = entry.get("text")
+                if entry.get("text") is None:
+                    stats.negative_hits += 1
+                else:
+                    stats.cache_hits += 1
+                continue
+            pending[request.cache_key] = (request, entry, [url])
+
+        if pending:
+            jobs = list(pending.values())
+            fetched = run_async(self._fetch_all([(request, entry) for request, entry, _ in jobs], stats))
+            for (_, _, job_urls), text in zip(jobs, fetched):
+                for url in job_urls:
+                    texts[url] = text
+        _logger.info(
+            "JD enrichment: %d urls, %d cache hits, %d negative hits, %d fetched, %d not modified, %d failed",
+            len(texts),
+            stats.cache_hits,
+            stats.negative_hits,
+            stats.fetched,
+            stats.not_modified,
+            stats.failed,
+        )
+        return texts
+
+    def _cache(self):  # noqa: ANN202
+        if not self.settings.jd_cache_enabled:
+            return None
+        return get_response_cache("jd_content", self.settings.jd_cache_max_entries)
+
+    async def _fetch_all(self, jobs: list[tuple[JDRequest, dict | None]], stats: JDEnrichStats) -> list[str | None]:
+        return await asyncio.gather(*(self._fetch_one(request, entry, stats) for request, entry in jobs))
+
+    async def _fetch_one(self, request: JDRequest, entry: dict | None, stats: JDEnrichStats) -> str | None:
+        stale_text = entry.get("text") if entry else None
+        headers = dict(request.headers)
+        if stale_text is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        client = get_async_http_client(request.fetch_url)
+
+        async def fetch() -> httpx.Response:
+            resp = await client.get(request.fetch_url, headers=headers, timeout=self.settings.jd_fetch_timeout_s)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            return resp
+
+        try:
+            async with async_provider_slot(request.provider):
+                resp = await acall_with_resilience(request.provider, fetch)
+            if resp.status_code == 304 and stale_text is not None:
+                stats.not_modified += 1
+                await asyncio.to_thread(
+                    self._store, request.cache_key, stale_text, entry.get("etag"), entry.get("last_modified")
+                )
+                return stale_text
+            text = request.parse(resp) if resp.status_code != 304 else None
+        except CircuitOpenError:
+            # 斷路器 open 時請求未送出，不寫負快取，冷卻後的掃描可再嘗試
+            stats.failed += 1
+            return stale_text
+        except Exception as exc:  # noqa: BLE001
+            _logger.debug("JD fetch failed for %s: %s", request.fetch_url, exc)
+            text = None
+        if text is None:
+            stats.failed += 1
+            if stale_text is not None:
+                # 重新驗證失敗時沿用舊內容，負快取期間內不再重試
+                await asyncio.to_thread(
+                    self._store,
+                    request.cache_key,
+                    stale_text,
+                    entry.get("etag"),
+                    entry.get("last_modified"),
+                    fresh_for=self.settings.jd_negative_cache_ttl_s,
+                )
+                return stale_text
+            await asyncio.to_thread(self._store_failure, request.cache_key)
+            return None
+        stats.fetched += 1
+        await asyncio.to_thread(
+            self._store, request.cache_key, text, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        )
+        return text
+
+    def _store(
+        self,
+        key: str,
+        text: str,
+        etag: str | None,
+        last_modified: str | None,
+        fresh_for: float | None = None,
+    ) -> None:
+        cache = self._cache()
+        if cache is None:
+            return
+        fresh_for = self.settings.jd_cache_ttl_s if fresh_for is None else fresh_for
+        value = {"text": text, "etag": etag, "last_modified": last_modified, "fresh_until": time.time() + fresh_for}
+        # 保留期比新鮮期長，過期後仍可帶 ETag 做條件式請求
+        cache.set(key, value, ttl_seconds=max(self.settings.jd_cache_stale_ttl_s, fresh_for))
+
+    def _store_failure(self, key: str) -> None:
+        cache = self._cache()
+        if cache is None:
+            return
+        ttl = self.settings.jd_negative_cache_ttl_s
+        cache.set(key, {"text": None, "fresh_until": time.time() + ttl}, ttl_seconds=ttl)
@@ -0,0 +1,29 @@
+from collections.abc import Iterable, Mapping
+
+
+class KeywordMatcher:
+    """多類別關鍵字比對器：文字只小寫化一次，回傳每個類別命中的關鍵字集合。
+
+    跨類別重複的關鍵字（如 BANT 的 yield / npi）只比對一次。比對採 C 實作的子字串搜尋：
+    在目前幾十個關鍵字的規模下，純 Python 的 Aho-Corasick 或 regex alternation 實測都慢 5 倍以上。
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]]) -> None:
+        self.categories: dict[str, tuple[str, ...]] = {
+            name: tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+            for name, keywords in categories.items()
+        }
+        owners: dict[str, list[str]] = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(name)
+        self._owners = {keyword: tuple(names) for keyword, names in owners.items()}
+
+    def scan(self, text: str) -> dict[str, set[str]]:
+        lowered = (text or "").lower()
+        hits: dict[str, set[str]] = {name: set() for name in self.categories}
+        for keyword, names in self._owners.items():
+            if keyword in lowered:
+                for name in names:
+                    hits[name].add(keyword)
+        return hits
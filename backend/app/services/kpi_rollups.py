@@ -0,0 +1,172 @@
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Integer, cast, delete, func, literal, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import BANTScorecard, Contact, DailyKpiRollup, InteractionLog, OutreachDraft
+from app.services.utils import now_utc
+
+KPI_COLUMNS = (
+    "interactions_count",
+    "outbound_count",
+    "inbound_count",
+    "drafts_created",
+    "bant_a_count",
+    "bant_b_count",
+    "bant_c_count",
+)
+
+
+def _utc_day(value: datetime) -> date:
+    return value.astimezone(UTC).date() if value.tzinfo else value.date()
+
+
+def record_kpi(db: Session, account_id: int, occurred_at: datetime, **increments: int) -> None:
+    """在呼叫端交易內遞增當日計數；與原始資料一起 commit，不另開交易。"""
+    unknown = set(increments) - set(KPI_COLUMNS)
+    if unknown:
+        raise ValueError(f"未知的 KPI 欄位: {sorted(unknown)}")
+    increments = {column: amount for column, amount in increments.items() if amount}
+    if not increments:
+        return
+
+    stmt = sqlite_insert(DailyKpiRollup).values(
+        day=_utc_day(occurred_at),
+        account_id=account_id,
+        updated_at=now_utc(),
+        **{column: increments.get(column, 0) for column in KPI_COLUMNS},
+    )
+    set_ = {column: getattr(DailyKpiRollup, column) + stmt.excluded[column] for column in increments}
+    set_["updated_at"] = stmt.excluded.updated_at
+    db.execute(stmt.on_conflict_do_update(index_elements=["day", "account_id"], set_=set_))
+
+
+def retract_kpi(db: Session, account_id: int, day: date, **decrements: int) -> None:
+    """record_kpi 的反向操作：在呼叫端交易內扣回當日計數（不低於 0），用於刪除原始資料時。"""
+    unknown = set(decrements) - set(KPI_COLUMNS)
+    if unknown:
+        raise ValueError(f"未知的 KPI 欄位: {sorted(unknown)}")
+    values = {
+        column: func.max(getattr(DailyKpiRollup, column) - amount, 0)
+        for column, amount in decrements.items()
+        if amount
+    }
+    if not values:
+        return
+    db.execute(
+        update(DailyKpiRollup)
+        .where(DailyKpiRollup.day == day, DailyKpiRollup.account_id == account_id)
+        .values(updated_at=now_utc(), **values)
+    )
+
+
+def retract_contact_kpis(db: Session, contact: Contact) -> None:
+    """刪除聯絡人前呼叫：把他的互動與草稿從帳戶的 rollup 扣回，與 rebuild_kpi_rollups 的結果一致。"""
+    interactions = db.execute(
+        select(
+            func.date(InteractionLog.occurred_at).label("day"),
+            func.count().label("interactions_count"),
+            func.sum(cast(InteractionLog.direction == "OUTBOUND", Integer)).label("outbound_count"),
+            func.sum(cast(InteractionLog.direction == "INBOUND", Integer)).label("inbound_count"),
+        )
+        .where(InteractionLog.contact_id == contact.id)
+        .group_by("day")
+    ).all()
+    for row in interactions:
+        retract_kpi(
+            db,
+            contact.account_id,
+            date.fromisoformat(row.day),
+            interactions_count=row.interactions_count,
+            outbound_count=int(row.outbound_count or 0),
+            inbound_count=int(row.inbound_count or 0),
+        )
+    drafts = db.execute(
+        select(func.date(OutreachDraft.created_at).label("day"), func.count().label("drafts_created"))
+        .where(OutreachDraft.contact_id == contact.id)
+        .group_by("day")
+    ).all()
+    for row in drafts:
+        retract_kpi(db, contact.account_id, date.fromisoformat(row.day), drafts_created=row.drafts_created)
+
+
+def interaction_kpi_increments(direction: str) -> dict[str, int]:
+    return {
+        "interactions_count": 1,
+        "outbound_count": int(direction == "OUTBOUND"),
+        "inbound_count": int(direction == "INBOUND"),
+    }
+
+
+def bant_kpi_increments(grade: str) -> dict[str, int]:
+    column = f"bant_{grade.lower()}_count"
+    return {column: 1} if column in KPI_COLUMNS else {}
+
+
+def rebuild_kpi_rollups(db: Session, start_date: date | None = None, end_date: date | None = None) -> int:
+    """由原始表重算區間內的 rollup（預設全部），用於回填或修正；回傳寫入的列數。"""
+
+    def _flag(condition):
+        return cast(condition, Integer)
+
+    zero = literal(0)
+    interactions_day = func.date(InteractionLog.occurred_at)
+    drafts_day = func.date(OutreachDraft.created_at)
+    bant_day = func.date(BANTScorecard.created_at)
+    sources = union_all(
+        select(
+            interactions_day.label("day"),
+            Contact.account_id.label("account_id"),
+            literal(1).label("interactions_count"),
+            _flag(InteractionLog.direction == "OUTBOUND").label("outbound_count"),
+            _flag(InteractionLog.direction == "INBOUND").label("inbound_count"),
+            zero.label("drafts_created"),
+            zero.label("bant_a_count"),
+            zero.label("bant_b_count"),
+            zero.label("bant_c_count"),
+        ).join(Contact, Contact.id == InteractionLog.contact_id),
+        select(
+            drafts_day, Contact.account_id, zero, zero, zero, literal(1), zero, zero, zero
+        ).join(Contact, Contact.id == OutreachDraft.contact_id),
+        select(
+            bant_day,
+            BANTScorecard.account_id,
+            zero,
+            zero,
+            zero,
+            zero,
+            _flag(BANTScorecard.grade == "A"),
+            _flag(BANTScorecard.grade == "B"),
+            _flag(BANTScorecard.grade == "C"),
+        ),
+    ).subquery()
+
+    aggregate = select(
+        sources.c.day,
+        sources.c.account_id,
+        *(func.sum(sources.c[column]).label(column) for column in KPI_COLUMNS),
+    ).group_by(sources.c.day, sources.c.account_id)
+    clear = delete(DailyKpiRollup)
+    if start_date is not None:
+        aggregate = aggregate.where(sources.c.day >= start_date.isoformat())
+        clear = clear.where(DailyKpiRollup.day >= start_date)
+    if end_date is not None:
+        aggregate = aggregate.where(sources.c.day <= end_date.isoformat())
+        clear = clear.where(DailyKpiRollup.day <= end_date)
+
+    now = now_utc()
+    rows = [
+        {
+            "day": date.fromisoformat(row.day),
+            "account_id": row.account_id,
+            "updated_at": now,
+            **{column: int(getattr(row, column) or 0) for column in KPI_COLUMNS},
+        }
+        for row in db.execute(aggregate).all()
+    ]
+    db.execute(clear)
+    if rows:
+        db.execute(sqlite_insert(DailyKpiRollup), rows)
+    db.commit()
+    return len(rows)
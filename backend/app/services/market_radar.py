@@ -1,19 +1,25 @@
+import hashlib
+import json
 import logging
 import re
-from datetime import UTC, timedelta
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from urllib.parse import urlparse
 
-import httpx
-
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, case, cast, func, literal, select, update
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models import Account, SignalEvent
+from app.services.jd_enricher import JDEnricher
+from app.services.keyword_matcher import KeywordMatcher
 from app.services.providers.llm import LLMRouter
-from app.services.providers.search import TavilySearchProvider
-from app.services.utils import now_utc, parse_datetime
+from app.services.providers.search import SearchResultItem, SearchUnavailableError, TavilySearchProvider
+from app.services.utils import extract_first_json_object, now_utc, parse_datetime
 
 
 KEYWORDS_BY_SEGMENT = {
@@ -115,9 +121,6 @@ _SOURCE_QUALITY_BOOST = {
 }
 
 
-_104_JD_API = "https://www.104.com.tw/job/ajax/content/{job_id}"
-_JINA_READER = "https://r.jina.ai/{url}"
-
 _PAIN_POINT_MAP = [
     (r"(?i)\byield\b|良率|defect rate|缺陷率|CPK|in-line inspection|製程良率", "生產良率優化壓力，需要更精準的製程控制設備"),
     (r"(?i)\bOEE\b|uptime|設備稼動|availability|MTBF|MTTR|預防性維護", "設備稼動率不足，需要預防性維護或升級方案"),
@@ -143,105 +146,67 @@ _EXPANSION_SIGNAL_MAP = [
     (r"(?i)business.?develop|BD|市場開發|海外業務|international", "海外市場拓展"),
 ]
 
-_logger = logging.getLogger(__name__)
-
-
-def _extract_104_job_id(url: str) -> str | None:
-    match = re.search(r"104\.com\.tw/job/([A-Za-z0-9]+)", url or "")
-    return match.group(1) if match else None
-
-
-def _fetch_104_jd(job_id: str) -> str | None:
-    api_url = _104_JD_API.format(job_id=job_id)
-    try:
-        resp = httpx.get(
-            api_url,
-            headers={"Referer": "https://www.104.com.tw/", "Accept": "application/json"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json().get("data", {})
-        header = data.get("header", {})
-        job_detail = data.get("jobDetail", {})
-        condition = data.get("condition", {})
-        welfare = data.get("welfare", {})
-        # 實際欄位名稱：jobDescription（非 jobContent），技能在 condition.skill 陣列
-        skill_labels = " ".join(
-            s.get("description", "") for s in (condition.get("skill") or []) if s.get("description")
-        )
-        parts = [
-            header.get("jobName", ""),
-            (job_detail.get("jobDescription") or "")[:600],
-            skill_labels,
-            (condition.get("other") or "")[:200],
-            (welfare.get("welfare") or "")[:200],
-        ]
-        text = " ".join(p for p in parts if p).strip()
-        return text[:1200] if text else None
-    except Exception as exc:
-        _logger.debug("104 JD fetch failed for %s: %s", job_id, exc)
-        return None
-
-
-def _fetch_jd_via_jina(url: str) -> str | None:
-    jina_url = _JINA_READER.format(url=url)
-    try:
-        resp = httpx.get(jina_url, timeout=15)
-        resp.raise_for_status()
-        text = resp.text.strip()
-        return text[:2000] if text else None
-    except Exception as exc:
-        _logger.debug("Jina JD fetch failed for %s: %s", url, exc)
-        return None
 
+# 熱路徑用到的 pattern 一律在 import 時編譯
+_NOISE_RES = [re.compile(pattern) for pattern in _NOISE_PATTERNS]
+_HIGH_VALUE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in _HIGH_VALUE_TERMS]
+_LOW_VALUE_TEXT_RE = re.compile("|".join(_LOW_VALUE_TEXT_PATTERNS), re.IGNORECASE)
+_LOW_VALUE_URL_RE = re.compile("|".join(_LOW_VALUE_URL_PATTERNS), re.IGNORECASE)
+_HIRING_OPENINGS_RES = [re.compile(pattern, re.IGNORECASE) for pattern in _HIRING_OPENINGS_PATTERNS]
+_HIRING_NO_OPENINGS_RE = re.compile("|".join(_HIRING_NO_OPENINGS_PATTERNS), re.IGNORECASE)
+# 多 label 表維持一條 pattern 一個 label：每條都需回報是否命中，併成單一 alternation 在
+# CPython re 下反而更慢（每個位置仍要逐一嘗試所有分支），只有「任一命中」的檢查才合併。
+_PAIN_POINT_RES = [(re.compile(pattern), label) for pattern, label in _PAIN_POINT_MAP]
+_EXPANSION_SIGNAL_RES = [(re.compile(pattern), label) for pattern, label in _EXPANSION_SIGNAL_MAP]
+_HIRING_JOBS_SECTION_RE = re.compile(r"徵才職缺】(.+?)(?:【公司簡介】|$)")
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_CJK_KANA_RE = re.compile(r"[\u4e00-\u9fff\u3040-\u30ff]")
+_WORD_CHAR_RE = re.compile(r"[A-Za-z0-9\u4e00-\u9fff]")
+_CN_PUNCT_RE = re.compile(r"[，。；：]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_NON_LATIN_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_PAREN_ABBR_RE = re.compile(r"\(([^)]+)\)")
+_PAREN_PART_RE = re.compile(r"\s*\(.*?\)")
+
+# classify_signal_type / hiring_priority_bonus 共用的關鍵字表，一次掃描取得各類命中
+_SIGNAL_KEYWORD_MATCHER = KeywordMatcher(
+    {
+        "CAPEX": ["capex", "capital expenditure", "investment", "expansion"],
+        "NPI": ["npi", "new product", "launch", "mass production"],
+        "HIRING": [
+            "hiring",
+            "recruit",
+            "job",
+            "jobs",
+            "career",
+            "careers",
+            "headcount",
+            "talent acquisition",
+            "招募",
+            "徵才",
+            "職缺",
+            "擴編",
+            "人才招募",
+        ],
+        "SUPPLY_CHAIN": ["supplier", "supply chain", "partnership"],
+        "HIRING_PRIORITY": ["徵才", "招募", "職缺", "hiring", "jobs", "careers"],
+    }
+)
 
-def _fetch_jd_content(url: str) -> str | None:
-    lowered = (url or "").lower()
-    if "104.com.tw/job/" in lowered:
-        job_id = _extract_104_job_id(url)
-        if job_id:
-            return _fetch_104_jd(job_id)
-    elif "linkedin.com/jobs/view/" in lowered:
-        return _fetch_jd_via_jina(url)
-    return None
+_logger = logging.getLogger(__name__)
 
 
 def extract_jd_tech_signals(jd_text: str) -> dict:
-    pain_points: list[str] = []
-    expansion_signals: list[str] = []
-    for pattern, label in _PAIN_POINT_MAP:
-        if re.search(pattern, jd_text):
-            pain_points.append(label)
-    for pattern, label in _EXPANSION_SIGNAL_MAP:
-        if re.search(pattern, jd_text):
-            expansion_signals.append(label)
     return {
-        "pain_points": pain_points,
-        "expansion_signals": expansion_signals,
+        "pain_points": [label for pattern, label in _PAIN_POINT_RES if pattern.search(jd_text)],
+        "expansion_signals": [label for pattern, label in _EXPANSION_SIGNAL_RES if pattern.search(jd_text)],
         "has_jd": True,
     }
 
 
 def classify_signal_type(text: str, source_url: str | None = None) -> str:
-    t = text.lower()
     source = (source_url or "").lower()
-
-    hiring_terms = [
-        "hiring",
-        "recruit",
-        "job",
-        "jobs",
-        "career",
-        "careers",
-        "headcount",
-        "talent acquisition",
-        "招募",
-        "徵才",
-        "職缺",
-        "擴編",
-        "人才招募",
-    ]
-
     if (
         "linkedin.com/jobs" in source
         or ("linkedin.com/company/" in source and "/jobs" in source)
@@ -249,14 +214,11 @@ def classify_signal_type(text: str, source_url: str | None = None) -> str:
         or "104.com.tw/company/" in source
     ):
         return "HIRING"
-    if any(word in t for word in ["capex", "capital expenditure", "investment", "expansion"]):
-        return "CAPEX"
-    if any(word in t for word in ["npi", "new product", "launch", "mass production"]):
-        return "NPI"
-    if any(word in t for word in hiring_terms):
-        return "HIRING"
-    if any(word in t for word in ["supplier", "supply chain", "partnership"]):
-        return "SUPPLY_CHAIN"
+    hits = _SIGNAL_KEYWORD_MATCHER.scan(text)
+    # 依優先序判斷：同時命中多類時取最前面的類別
+    for signal_type in ("CAPEX", "NPI", "HIRING", "SUPPLY_CHAIN"):
+        if hits[signal_type]:
+            return signal_type
     return "EXPANSION"
 
 
@@ -289,7 +251,7 @@ def clean_summary(text: str, max_len: int = 360) -> str:
         lowered = candidate.lower()
         if lowered in {"policy", "read more", "latest news", "sign in", "home", "subscribe"}:
             return False
-        token_count = len(re.findall(r"[A-Za-z0-9\u4e00-\u9fff]", candidate))
+        token_count = len(_WORD_CHAR_RE.findall(candidate))
         if token_count < 8:
             return False
         # 財經跑馬燈：密集含「數字+元/點/億/%/萬」→ 視為 ticker，丟棄
@@ -297,9 +259,9 @@ def clean_summary(text: str, max_len: int = 360) -> str:
             return False
         # 長 CJK 段落但無中文句子標點（，。；：）→ 財經跑馬燈（公司名串流），丟棄
         if len(candidate) > 50:
-            cjk_count = len(re.findall(r"[\u4e00-\u9fff]", candidate))
+            cjk_count = len(_CJK_RE.findall(candidate))
             if cjk_count / len(candidate) > 0.4:
-                cn_punct = len(re.findall(r"[，。；：]", candidate))
+                cn_punct = len(_CN_PUNCT_RE.findall(candidate))
                 if cn_punct == 0:
                     return False
         return True
@@ -307,13 +269,13 @@ def clean_summary(text: str, max_len: int = 360) -> str:
     # 先截斷側欄邊界（延伸閱讀、猜你喜歡、※ 等），保留正文部分
     m = _SIDEBAR_CUTOFF_RE.search(text)
     cleaned = (text[:m.start()] if m else text).replace("\n", " ").strip()
-    for pattern in _NOISE_PATTERNS:
-        cleaned = re.sub(pattern, " ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip(" -|,.;")
+    for pattern in _NOISE_RES:
+        cleaned = pattern.sub(" ", cleaned)
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip(" -|,.;")
     if not cleaned:
         return ""
     # Select informative sentence-like chunks, not just the first two.
-    chunks = re.split(r"(?<=[.!?])\s+", cleaned)
+    chunks = _SENTENCE_SPLIT_RE.split(cleaned)
     meaningful = [chunk for chunk in chunks if _is_informative_chunk(chunk)]
     summary = " ".join((meaningful or chunks)[:2]).strip()
     if len(summary) > max_len:
@@ -325,7 +287,7 @@ def is_summary_usable(summary: str) -> bool:
     """中文摘要可較短，英文摘要維持較長門檻，避免有效訊號被誤濾。"""
     if not summary:
         return False
-    cjk_count = len(re.findall(r"[\u4e00-\u9fff]", summary))
+    cjk_count = len(_CJK_RE.findall(summary))
     if cjk_count >= 8:
         return len(summary) >= 20
     return len(summary) >= 40
@@ -334,7 +296,7 @@ def is_summary_usable(summary: str) -> bool:
 def is_hiring_summary_usable(summary: str) -> bool:
     if not summary:
         return False
-    cjk_count = len(re.findall(r"[\u4e00-\u9fff]", summary))
+    cjk_count = len(_CJK_RE.findall(summary))
     if cjk_count >= 4:
         return len(summary) >= 12
     return len(summary) >= 24
@@ -359,7 +321,7 @@ def _is_english_summary(text: str) -> bool:
     """摘要以英文為主（CJK 字元佔比 < 15%）時回傳 True。"""
     if not text:
         return False
-    cjk = len(re.findall(r"[\u4e00-\u9fff\u3040-\u30ff]", text))
+    cjk = len(_CJK_KANA_RE.findall(text))
     return cjk / max(len(text), 1) < 0.15
 
 
@@ -381,6 +343,53 @@ def _translate_to_zh_tw(text: str, llm_router: LLMRouter) -> str:
         return text
 
 
+_TRANSLATION_BATCH_SIZE = 20
+
+
+def _translate_batch_to_zh_tw(texts: list[str], llm_router: LLMRouter) -> list[str]:
+    """批次翻譯多筆英文摘要；每批一次 LLM 呼叫，回傳順序與輸入一致。"""
+    if len(texts) <= 1:
+        return [_translate_to_zh_tw(text, llm_router) for text in texts]
+    translated: list[str] = []
+    for start in range(0, len(texts), _TRANSLATION_BATCH_SIZE):
+        translated.extend(_translate_chunk_to_zh_tw(texts[start : start + _TRANSLATION_BATCH_SIZE], llm_router))
+    return translated
+
+
+def _translate_chunk_to_zh_tw(texts: list[str], llm_router: LLMRouter) -> list[str]:
+    numbered = [{"id": index, "text": text} for index, text in enumerate(texts, start=1)]
+    try:
+        result = llm_router.generate(
+            system_prompt=(
+                "你是專業財經科技翻譯。將每一筆英文市場訊號摘要翻譯成繁體中文。"
+                "保留公司名稱、產品型號、專有名詞原文。"
+                '回傳嚴格 JSON：{"items": [{"id": 編號, "text": "譯文"}]}，id 必須與輸入一致，不可合併或省略。'
+            ),
+            user_prompt=json.dumps({"items": numbered}, ensure_ascii=False),
+        )
+    except Exception as exc:
+        # 所有 provider 都失敗時逐筆重試也不會成功，直接保留原文
+        _logger.debug("Batch summary translation failed: %s", exc)
+        return list(texts)
+
+    parsed = extract_first_json_object(result.text) or {}
+    by_id: dict[int, str] = {}
+    for entry in parsed.get("items") or []:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        text = str(entry.get("text") or "").strip()
+        if text:
+            by_id[index] = text
+    if len(by_id) < len(texts):
+        _logger.debug("Batch translation parsed %d/%d items; falling back per item", len(by_id), len(texts))
+    # 只有解析不到的項目才逐筆翻譯
+    return [by_id.get(index) or _translate_to_zh_tw(text, llm_router) for index, text in enumerate(texts, start=1)]
+
+
 def is_hiring_company_page_url(url: str) -> bool:
     lowered = (url or "").lower()
     if "104.com.tw/company/" in lowered:
@@ -394,8 +403,8 @@ def extract_hiring_openings_count(text: str) -> int | None:
     candidate = (text or "").strip()
     if not candidate:
         return None
-    for pattern in _HIRING_OPENINGS_PATTERNS:
-        match = re.search(pattern, candidate, flags=re.IGNORECASE)
+    for pattern in _HIRING_OPENINGS_RES:
+        match = pattern.search(candidate)
         if not match:
             continue
         try:
@@ -410,7 +419,7 @@ def extract_hiring_openings_count(text: str) -> int | None:
 def has_hiring_openings_signal(title: str, snippet: str) -> bool:
     combined = f"{title} {snippet}".strip()
     lowered = combined.lower()
-    if any(re.search(pattern, lowered, flags=re.IGNORECASE) for pattern in _HIRING_NO_OPENINGS_PATTERNS):
+    if _HIRING_NO_OPENINGS_RE.search(lowered):
         return False
     openings = extract_hiring_openings_count(combined)
     if openings is not None and openings > 0:
@@ -465,8 +474,8 @@ def build_hiring_summary(title: str, snippet: str, url: str, jd_text: str | None
         signals = extract_jd_tech_signals(jd_text)
         # Extract top-3 keyword hits for display
         keywords: list[str] = []
-        for pattern, _ in _PAIN_POINT_MAP:
-            m = re.search(pattern, jd_text)
+        for pattern, _ in _PAIN_POINT_RES:
+            m = pattern.search(jd_text)
             if m:
                 keywords.append(m.group(0)[:20])
             if len(keywords) >= 3:
@@ -479,9 +488,9 @@ def build_hiring_summary(title: str, snippet: str, url: str, jd_text: str | None
         return summary[:300]
 
     text = (snippet or "").strip()
-    match = re.search(r"徵才職缺】(.+?)(?:【公司簡介】|$)", text)
+    match = _HIRING_JOBS_SECTION_RE.search(text)
     if match:
-        jobs = re.sub(r"\s+", " ", match.group(1)).strip("。;； ")
+        jobs = _WHITESPACE_RE.sub(" ", match.group(1)).strip("。;； ")
         if jobs:
             return f"職缺重點: {jobs[:300]}"
     openings = extract_hiring_openings_count(f"{title} {snippet}")
@@ -499,25 +508,13 @@ def build_hiring_summary(title: str, snippet: str, url: str, jd_text: str | None
 
 
 def is_low_value_signal(title: str, snippet: str, url: str) -> bool:
-    text = f"{title} {snippet}"
-    for pattern in _LOW_VALUE_TEXT_PATTERNS:
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            return True
-    for pattern in _LOW_VALUE_URL_PATTERNS:
-        if re.search(pattern, url, flags=re.IGNORECASE):
-            return True
-    return False
+    return bool(_LOW_VALUE_TEXT_RE.search(f"{title} {snippet}") or _LOW_VALUE_URL_RE.search(url))
 
 
 def signal_value_score(title: str, snippet: str, source_name: str | None) -> int:
     score = 0
-    title_hits = 0
-    snippet_hits = 0
-    for pattern in _HIGH_VALUE_TERMS:
-        if re.search(pattern, title, flags=re.IGNORECASE):
-            title_hits += 1
-        if re.search(pattern, snippet, flags=re.IGNORECASE):
-            snippet_hits += 1
+    title_hits = sum(1 for pattern in _HIGH_VALUE_RES if pattern.search(title))
+    snippet_hits = sum(1 for pattern in _HIGH_VALUE_RES if pattern.search(snippet))
     score += title_hits * 18
     score += snippet_hits * 10
     if source_name:
@@ -527,7 +524,6 @@ def signal_value_score(title: str, snippet: str, source_name: str | None) -> int
 
 
 def hiring_priority_bonus(title: str, snippet: str, source_name: str | None, url: str | None) -> int:
-    text = f"{title} {snippet}".lower()
     host = (source_name or "").lower().replace("www.", "")
     raw_url = (url or "").lower()
 
@@ -538,7 +534,7 @@ def hiring_priority_bonus(title: str, snippet: str, source_name: str | None, url
         bonus += 16
     if "linkedin.com/company/" in raw_url and "/jobs" in raw_url:
         bonus += 14
-    if any(token in text for token in ("徵才", "招募", "職缺", "hiring", "jobs", "careers")):
+    if _SIGNAL_KEYWORD_MATCHER.scan(f"{title} {snippet}")["HIRING_PRIORITY"]:
         bonus += 12
     return bonus
 
@@ -567,13 +563,13 @@ def _extract_name_variants(company_name: str) -> list[str]:
     """從「玉晶光 (GSEO)」提取所有可能的名稱變體（包含英文全名）。"""
     variants: list[str] = []
     # 英文縮寫或名稱 (括號內)
-    match = re.search(r'\(([^)]+)\)', company_name)
+    match = _PAREN_ABBR_RE.search(company_name)
     abbr = None
     if match:
         abbr = match.group(1).strip()
         variants.append(abbr.lower())
     # 中文部分 (括號前)
-    chinese_part = re.sub(r'\s*\(.*?\)', '', company_name).strip()
+    chinese_part = _PAREN_PART_RE.sub('', company_name).strip()
     if chinese_part:
         variants.append(chinese_part.lower())
     # 查英文全名對照表
@@ -597,56 +593,90 @@ def _extract_name_variants(company_name: str) -> list[str]:
 
 def _normalize_latin(text: str) -> str:
     lowered = text.lower()
-    cleaned = re.sub(r"[^a-z0-9]+", " ", lowered)
-    return re.sub(r"\s+", " ", cleaned).strip()
-
-
-def is_relevant_to_company(text: str, name_variants: list[str], url: str | None = None) -> bool:
-    """確認文章至少提到公司名稱（含 ticker、中文名或英文全名）。"""
-    raw = f"{text or ''} {url or ''}".lower()
-    normalized = _normalize_latin(raw)
+    cleaned = _NON_LATIN_ALNUM_RE.sub(" ", lowered)
+    return _WHITESPACE_RE.sub(" ", cleaned).strip()
+
+
+def _word_boundary_re(tokens: list[str]) -> re.Pattern[str]:
+    alternation = "|".join(re.escape(tok) for tok in tokens)
+    return re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])")
+
+
+class CompanyNameMatcher:
+    """單一帳戶的名稱比對器；名稱變體在建構時就編譯成 pattern，掃描中逐筆結果重用。"""
+
+    def __init__(self, name_variants: list[str]) -> None:
+        cjk_names: list[str] = []
+        short_tokens: list[str] = []
+        phrases: list[str] = []
+        token_groups: list[list[re.Pattern[str]]] = []
+        for variant in name_variants:
+            candidate = (variant or "").strip().lower()
+            if not candidate:
+                continue
+
+            # 中文名直接子字串比對
+            if _CJK_RE.search(candidate):
+                cjk_names.append(candidate)
+                continue
+
+            tokens = [tok for tok in _normalize_latin(candidate).split(" ") if tok]
+            if not tokens:
+                continue
+
+            # ticker / 短縮寫採字界比對，避免字串部分重疊造成誤判
+            if len(tokens) == 1 and len(tokens[0]) <= 6:
+                short_tokens.append(tokens[0])
+                continue
+
+            phrases.append(" ".join(tokens))
+            meaningful = [tok for tok in tokens if tok not in _LATIN_STOPWORDS and len(tok) >= 3]
+            if len(meaningful) >= 2:
+                token_groups.append([_word_boundary_re([tok]) for tok in meaningful[:3]])
+
+        self._cjk_names = tuple(cjk_names)
+        self._short_token_re = _word_boundary_re(short_tokens) if short_tokens else None
+        self._phrases = tuple(phrases)
+        self._compact_phrases = tuple(
+            compact for compact in (phrase.replace(" ", "") for phrase in phrases) if len(compact) >= 8
+        )
+        self._token_groups = token_groups
 
-    for variant in name_variants:
-        candidate = (variant or "").strip().lower()
-        if not candidate:
-            continue
+    def matches(self, text: str, url: str | None = None) -> bool:
+        raw = f"{text or ''} {url or ''}".lower()
+        if any(name in raw for name in self._cjk_names):
+            return True
+        if self._short_token_re is not None and self._short_token_re.search(raw):
+            return True
+        if not (self._phrases or self._token_groups):
+            return False
 
-        # 中文名直接子字串比對
-        if re.search(r"[\u4e00-\u9fff]", candidate):
-            if candidate in raw:
+        normalized = _normalize_latin(raw)
+        if any(phrase in normalized for phrase in self._phrases):
+            return True
+        if self._compact_phrases:
+            compact_normalized = normalized.replace(" ", "")
+            if any(phrase in compact_normalized for phrase in self._compact_phrases):
                 return True
-            continue
+        return any(all(pattern.search(normalized) for pattern in group) for group in self._token_groups)
 
-        norm_variant = _normalize_latin(candidate)
-        if not norm_variant:
-            continue
-        tokens = [tok for tok in norm_variant.split(" ") if tok]
-        if not tokens:
-            continue
 
-        # ticker / 短縮寫採字界比對，避免字串部分重疊造成誤判
-        if len(tokens) == 1 and len(tokens[0]) <= 6:
-            pat = rf"(?<![a-z0-9]){re.escape(tokens[0])}(?![a-z0-9])"
-            if re.search(pat, raw):
-                return True
-            continue
+@lru_cache(maxsize=256)
+def _company_name_matcher(name_variants: tuple[str, ...]) -> CompanyNameMatcher:
+    return CompanyNameMatcher(list(name_variants))
 
-        phrase = " ".join(tokens)
-        if phrase in normalized:
-            return True
-        compact_phrase = phrase.replace(" ", "")
-        compact_normalized = normalized.replace(" ", "")
-        if len(compact_phrase) >= 8 and compact_phrase in compact_normalized:
-            return True
 
-        meaningful = [tok for tok in tokens if tok not in _LATIN_STOPWORDS and len(tok) >= 3]
-        if len(meaningful) >= 2 and all(
-            re.search(rf"(?<![a-z0-9]){re.escape(tok)}(?![a-z0-9])", normalized)
-            for tok in meaningful[:3]
-        ):
-            return True
+def is_relevant_to_company(text: str, name_variants: list[str], url: str | None = None) -> bool:
+    """確認文章至少提到公司名稱（含 ticker、中文名或英文全名）。"""
+    return _company_name_matcher(tuple(name_variants)).matches(text, url)
 
-    return False
+
+def search_item_fingerprint(item: SearchResultItem) -> str:
+    """搜尋結果原始內容（標題 / 摘要 / 發布時間）的指紋；內容不變即可略過 JD 抓取與翻譯。"""
+    normalized = "\n".join(
+        " ".join((value or "").split()) for value in (item.title, item.snippet, item.published_at)
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
 def rank_signal_for_top20(signal: SignalEvent) -> tuple[float, float, float]:
@@ -660,12 +690,100 @@ def rank_signal_for_top20(signal: SignalEvent) -> tuple[float, float, float]:
     return (float(signal.signal_strength), recency, fetched_ts)
 
 
+def signal_rank_order_by(now: datetime | None = None) -> tuple:
+    """rank_signal_for_top20 的 SQL 版本：由資料庫排序並搭配 LIMIT，只取回需要的列。"""
+    reference = (now or now_utc()).astimezone(UTC).replace(tzinfo=None)
+    published = SignalEvent.source_published_at
+    elapsed = func.julianday(literal(reference, DateTime)) - func.julianday(published)
+    truncated = cast(elapsed, Integer)
+    # timedelta.days 向下取整，CAST 則向零截斷；未來日期（負值）需再減一才一致
+    days = truncated - case((elapsed < truncated, 1), else_=0)
+    recency = case((published.is_(None), 0), else_=func.max(0, 180 - days))
+    return (SignalEvent.signal_strength.desc(), recency.desc(), SignalEvent.fetched_at.desc(), SignalEvent.id.desc())
+
+
+@dataclass(frozen=True)
+class _ScanTarget:
+    """掃描 worker 使用的帳戶快照；ORM 物件不跨執行緒傳遞。"""
+
+    account_id: int
+    company_name: str
+    segment: str
+    region: str
+
+
+# 多列 upsert 的欄位；衝突時覆寫除了 account_id / evidence_url / event_date 以外的內容
+_SIGNAL_UPSERT_COLUMNS = (
+    "account_id",
+    "signal_type",
+    "signal_strength",
+    "event_date",
+    "summary",
+    "evidence_url",
+    "source_name",
+    "source_published_at",
+    "search_provider",
+    "search_latency_ms",
+    "search_fallback_used",
+    "content_fingerprint",
+)
+_SIGNAL_UPDATE_COLUMNS = (
+    "signal_type",
+    "signal_strength",
+    "summary",
+    "source_name",
+    "source_published_at",
+    "search_provider",
+    "search_latency_ms",
+    "search_fallback_used",
+    "content_fingerprint",
+    "fetched_at",
+)
+# 每條 INSERT 的列數上限，避免超過 SQLite 綁定參數上限
+_SIGNAL_UPSERT_CHUNK = 500
+
+
+@dataclass
+class SignalWriteCounts:
+    """寫入結果：created 為新 evidence_url，updated 為既有 URL 內容變動後的覆寫；failed 為失敗的帳戶數。"""
+
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+
+    def add(self, other: "SignalWriteCounts") -> None:
+        self.created += other.created
+        self.updated += other.updated
+        self.failed += other.failed
+
+
+@dataclass
+class _SignalCandidate:
+    """通過本地過濾、等待 JD 補強與摘要的搜尋結果。"""
+
+    item: SearchResultItem
+    signal_type: str
+    strength: int
+    published_at: datetime | None
+    fingerprint: str | None = None
+
+
+@dataclass
+class _AccountScanResult:
+    # 新出現或內容有變動的訊號，需完整 upsert
+    rows: list[dict]
+    # 增量掃描下內容未變的既有訊號，只更新 fetched_at / signal_strength
+    refreshed: list[dict]
+
+
 class MarketRadarService:
     def __init__(self) -> None:
         self.search_provider = TavilySearchProvider()
         self.llm_router = LLMRouter()
+        self.jd_enricher = JDEnricher()
         settings = get_settings()
         self.allowlist = _parse_allowlist(settings.radar_source_allowlist)
+        self.default_workers = max(1, settings.radar_scan_workers)
 
     def scan(
         self,
@@ -674,116 +792,296 @@ class MarketRadarService:
         lookback_days: int,
         max_results_per_account: int,
         use_tavily: bool,
-    ) -> int:
+        concurrency: int | None = None,
+        bypass_search_cache: bool = False,
+        on_account_done: Callable[[int, SignalWriteCounts, str | None], None] | None = None,
+        continue_on_error: bool = False,
+        incremental: bool = False,
+    ) -> SignalWriteCounts:
+        """掃描帳戶訊號並回傳新增 / 更新筆數。
+
+        on_account_done(account_id, counts, error) 於每個帳戶寫入後在呼叫端執行緒觸發；
+        continue_on_error=True 時單一帳戶失敗只回報 error，不中斷其餘帳戶；搜尋 provider 不可用
+        （SearchUnavailableError）一律如此處理。
+        incremental=True 時先載入各帳戶既有的 evidence_url 與內容指紋，未變動的結果不再抓 JD / 翻譯。
+        """
         if not use_tavily:
             raise ValueError("Market radar requires Tavily. Set use_tavily=true.")
+        # 以參數往下傳，不改 search provider 的共用狀態；同一個 service 可同時跑多個掃描
+        use_search_cache = self.search_provider.use_cache and not bypass_search_cache
 
         accounts = db.execute(select(Account).where(Account.id.in_(account_ids))).scalars().all()
         if not accounts:
-            return 0
+            return SignalWriteCounts()
 
-        created_count = 0
-        for account in accounts:
-            keywords = KEYWORDS_BY_SEGMENT.get(account.segment, ["semiconductor", "equipment", "manufacturing"])
-            name_variants = _extract_name_variants(account.company_name)
-            results = self.search_provider.search_company_signals(
+        targets = [
+            _ScanTarget(
+                account_id=account.id,
                 company_name=account.company_name,
-                keywords=keywords,
-                lookback_days=lookback_days,
-                max_results=max_results_per_account,
+                segment=account.segment,
                 region=account.region or "",
             )
-            # 先依商務價值排序，再做入庫；避免低價值結果佔掉名額。
-            ranked_results = sorted(
-                results,
-                key=lambda item: (
-                    signal_value_score(item.title, item.snippet, item.source_name)
-                    + hiring_priority_bonus(item.title, item.snippet, item.source_name, item.url)
-                ),
-                reverse=True,
+            for account in accounts
+        ]
+        workers = min(max(1, concurrency or self.default_workers), len(targets))
+        known_by_account = self._load_known_signals(db, [target.account_id for target in targets]) if incremental else {}
+
+        def collect_for(target: _ScanTarget) -> _AccountScanResult:
+            return self._collect_account_signals(
+                target,
+                lookback_days,
+                max_results_per_account,
+                known=known_by_account.get(target.account_id),
+                use_search_cache=use_search_cache,
             )
-            cutoff = now_utc() - timedelta(days=lookback_days)
-            accepted_for_account = 0
-            for item in ranked_results:
-                if accepted_for_account >= max_results_per_account:
+
+        totals = SignalWriteCounts()
+
+        def finish(target: _ScanTarget, collect: Callable[[], _AccountScanResult]) -> None:
+            try:
+                result = collect()
+            except Exception as exc:  # noqa: BLE001
+                # 搜尋 provider 暫時不可用只影響該帳戶，即使 continue_on_error=False 也不中斷整批掃描
+                if not continue_on_error and not isinstance(exc, SearchUnavailableError):
+                    raise
+                _logger.warning("Radar scan failed for account %s: %s", target.account_id, exc)
+                totals.failed += 1
+                if on_account_done is not None:
+                    on_account_done(target.account_id, SignalWriteCounts(), str(exc) or exc.__class__.__name__)
+                return
+            known = known_by_account.get(target.account_id, {}) if incremental else None
+            counts = self._write_account_signals(db, target.account_id, result.rows, result.refreshed, known=known)
+            totals.add(counts)
+            if on_account_done is not None:
+                on_account_done(target.account_id, counts, None)
+
+        if workers == 1:
+            for target in targets:
+                finish(target, lambda target=target: collect_for(target))
+            return totals
+
+        # 搜尋 / JD / 翻譯在 worker 執行緒並行；寫入一律回到呼叫端執行緒，SQLite 只有單一 writer。
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="radar-scan") as executor:
+            futures = {executor.submit(collect_for, target): target for target in targets}
+            try:
+                for future in as_completed(futures):
+                    finish(futures[future], future.result)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return totals
+
+    def _load_known_signals(self, db: Session, account_ids: list[int]) -> dict[int, dict[str, tuple[int, str | None]]]:
+        """一次查出所有目標帳戶既有訊號的 {evidence_url: (id, content_fingerprint)}。"""
+        known: dict[int, dict[str, tuple[int, str | None]]] = {account_id: {} for account_id in account_ids}
+        rows = db.execute(
+            select(SignalEvent.account_id, SignalEvent.evidence_url, SignalEvent.id, SignalEvent.content_fingerprint)
+            .where(SignalEvent.account_id.in_(account_ids))
+        )
+        for account_id, evidence_url, signal_id, fingerprint in rows:
+            known[account_id][evidence_url] = (signal_id, fingerprint)
+        return known
+
+    def _collect_account_signals(
+        self,
+        target: _ScanTarget,
+        lookback_days: int,
+        max_results_per_account: int,
+        known: dict[str, tuple[int, str | None]] | None = None,
+        use_search_cache: bool = True,
+    ) -> _AccountScanResult:
+        """搜尋並過濾單一帳戶的訊號，回傳待寫入的 signal_events 欄位；不碰資料庫。"""
+        keywords = KEYWORDS_BY_SEGMENT.get(target.segment, ["semiconductor", "equipment", "manufacturing"])
+        # 名稱比對規則每個帳戶只編譯一次，供所有搜尋結果重用
+        name_matcher = CompanyNameMatcher(_extract_name_variants(target.company_name))
+        # Tavily 並行上限由 search provider 逐請求控管，這裡不再以帳戶為單位佔名額
+        results = self.search_provider.search_company_signals(
+            company_name=target.company_name,
+            keywords=keywords,
+            lookback_days=lookback_days,
+            max_results=max_results_per_account,
+            region=target.region,
+            use_cache=use_search_cache,
+        )
+        # 先依商務價值排序，再做入庫；避免低價值結果佔掉名額。
+        ranked_results = sorted(
+            results,
+            key=lambda item: (
+                signal_value_score(item.title, item.snippet, item.source_name)
+                + hiring_priority_bonus(item.title, item.snippet, item.source_name, item.url)
+            ),
+            reverse=True,
+        )
+        cutoff = now_utc() - timedelta(days=lookback_days)
+        rows: list[dict] = []
+        refreshed: list[dict] = []
+        remaining = iter(ranked_results)
+        exhausted = False
+        while not exhausted and len(rows) + len(refreshed) < max_results_per_account:
+            # 篩選階段：只做本地規則，湊滿剩餘名額的候選後才進入 JD 階段
+            candidates: list[_SignalCandidate] = []
+            while len(rows) + len(refreshed) + len(candidates) < max_results_per_account:
+                item = next(remaining, None)
+                if item is None:
+                    exhausted = True
                     break
-                # 確認文章確實提到目標公司，過濾掉產業大盤新聞
-                combined_text = f"{item.title} {item.snippet}"
-                signal_type = classify_signal_type(combined_text, item.url)
-                # 招募訊號允許來自 104 / LinkedIn，即使外部 allowlist 未設定這些 domain。
-                if is_junk_url(item.url):
-                    continue
-                if not is_allowed_source(item.url, self.allowlist) and not (
-                    signal_type == "HIRING" and is_priority_hiring_source(item.url)
-                ):
-                    continue
-                if not is_relevant_to_company(combined_text, name_variants, item.url):
-                    continue
-                if signal_type == "HIRING" and is_hiring_company_page_url(item.url):
-                    # 對公司頁採更嚴格校驗：標題必須命中目標公司，避免被「瀏覽紀錄/推薦公司」污染。
-                    if not is_relevant_to_company(item.title, name_variants):
-                        continue
-                if signal_type == "HIRING" and not has_hiring_detail_signal(item.title, item.snippet, item.url):
-                    continue
-                # 104 / LinkedIn 職缺頁常包含「公司簡介」字樣，不應被低價值規則誤刪。
-                if is_low_value_signal(item.title, item.snippet, item.url) and not (
-                    signal_type == "HIRING" and is_priority_hiring_source(item.url)
-                ):
-                    continue
-                strength = signal_strength(signal_type, item.published_at)
-                published_at = parse_datetime(item.published_at)
-                if published_at and published_at < cutoff:
-                    continue
-                jd_text = None
-                if signal_type == "HIRING" and is_hiring_job_url(item.url):
-                    jd_text = _fetch_jd_content(item.url)
-                    if jd_text:
-                        _logger.info("JD fetched for %s (%d chars)", item.url, len(jd_text))
-                    else:
-                        _logger.debug("JD fetch returned nothing for %s", item.url)
-                summary = (
-                    build_hiring_summary(item.title, item.snippet, item.url, jd_text)
-                    if signal_type == "HIRING"
-                    else clean_summary(f"{item.title}. {item.snippet}".strip())
-                )
-                if signal_type == "HIRING":
-                    if not is_hiring_summary_usable(summary):
-                        continue
-                elif not is_summary_usable(summary):
+                fingerprint = search_item_fingerprint(item)
+                known_signal = (known or {}).get(item.url)
+                if known_signal is not None and known_signal[1] == fingerprint:
+                    # 內容與上次入庫時相同：已通過過濾，不需再抓 JD / 翻譯，只刷新時間與強度
+                    refresh = self._build_refresh_row(known_signal[0], item, cutoff)
+                    if refresh is not None:
+                        refreshed.append(refresh)
                     continue
-                if _is_english_summary(summary):
-                    summary = _translate_to_zh_tw(summary, self.llm_router)
-
-                stmt = sqlite_insert(SignalEvent).values(
-                    account_id=account.id,
-                    signal_type=signal_type,
-                    signal_strength=strength,
-                    event_date=published_at.date() if published_at else None,
-                    summary=summary[:1200],
-                    evidence_url=item.url,
-                    source_name=item.source_name,
-                    source_published_at=published_at,
-                    search_provider=item.provider,
-                    search_latency_ms=item.latency_ms,
-                    search_fallback_used=1 if item.fallback_used else 0,
-                    fetched_at=now_utc(),
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["account_id", "evidence_url"],
-                    set_={
-                        "signal_type": signal_type,
-                        "signal_strength": strength,
-                        "summary": summary[:1200],
-                        "source_name": item.source_name,
-                        "source_published_at": published_at,
-                        "search_provider": item.provider,
-                        "search_latency_ms": item.latency_ms,
-                        "search_fallback_used": 1 if item.fallback_used else 0,
-                        "fetched_at": now_utc(),
-                    },
+                candidate = self._screen_signal_item(item, name_matcher, cutoff)
+                if candidate is not None:
+                    candidate.fingerprint = fingerprint
+                    candidates.append(candidate)
+            # JD 階段：本輪所有職缺頁一次並行抓取（先查快取），摘要不可用而被淘汰時下一輪補位
+            jd_texts = self.jd_enricher.enrich(
+                [
+                    candidate.item.url
+                    for candidate in candidates
+                    if candidate.signal_type == "HIRING" and is_hiring_job_url(candidate.item.url)
+                ]
+            )
+            for candidate in candidates:
+                row = self._finalize_signal_row(target.account_id, candidate, jd_texts.get(candidate.item.url))
+                if row is not None:
+                    rows.append(row)
+        if known is not None:
+            _logger.info(
+                "incremental scan account %s: %d unchanged, %d new or changed",
+                target.account_id,
+                len(refreshed),
+                len(rows),
+            )
+
+        # 英文摘要集中成一次批次翻譯，而非每筆一個 LLM round trip
+        english_rows = [row for row in rows if _is_english_summary(row["summary"])]
+        if english_rows:
+            translated = _translate_batch_to_zh_tw([row["summary"] for row in english_rows], self.llm_router)
+            for row, summary in zip(english_rows, translated):
+                row["summary"] = summary
+        for row in rows:
+            row["summary"] = row["summary"][:1200]
+        return _AccountScanResult(rows=rows, refreshed=refreshed)
+
+    def _build_refresh_row(self, signal_id: int, item: SearchResultItem, cutoff) -> dict | None:  # noqa: ANN001
+        published_at = parse_datetime(item.published_at)
+        if published_at and published_at < cutoff:
+            return None
+        signal_type = classify_signal_type(f"{item.title} {item.snippet}", item.url)
+        return {"id": signal_id, "signal_strength": signal_strength(signal_type, item.published_at)}
+
+    def _screen_signal_item(
+        self,
+        item: SearchResultItem,
+        name_matcher: CompanyNameMatcher,
+        cutoff,
+    ) -> _SignalCandidate | None:
+        """不需外部請求的過濾規則；通過者才進入 JD 補強與摘要階段。"""
+        # 確認文章確實提到目標公司，過濾掉產業大盤新聞
+        combined_text = f"{item.title} {item.snippet}"
+        signal_type = classify_signal_type(combined_text, item.url)
+        # 招募訊號允許來自 104 / LinkedIn，即使外部 allowlist 未設定這些 domain。
+        if is_junk_url(item.url):
+            return None
+        if not is_allowed_source(item.url, self.allowlist) and not (
+            signal_type == "HIRING" and is_priority_hiring_source(item.url)
+        ):
+            return None
+        if not name_matcher.matches(combined_text, item.url):
+            return None
+        if signal_type == "HIRING" and is_hiring_company_page_url(item.url):
+            # 對公司頁採更嚴格校驗：標題必須命中目標公司，避免被「瀏覽紀錄/推薦公司」污染。
+            if not name_matcher.matches(item.title):
+                return None
+        if signal_type == "HIRING" and not has_hiring_detail_signal(item.title, item.snippet, item.url):
+            return None
+        # 104 / LinkedIn 職缺頁常包含「公司簡介」字樣，不應被低價值規則誤刪。
+        if is_low_value_signal(item.title, item.snippet, item.url) and not (
+            signal_type == "HIRING" and is_priority_hiring_source(item.url)
+        ):
+            return None
+        strength = signal_strength(signal_type, item.published_at)
+        published_at = parse_datetime(item.published_at)
+        if published_at and published_at < cutoff:
+            return None
+        return _SignalCandidate(item=item, signal_type=signal_type, strength=strength, published_at=published_at)
+
+    def _finalize_signal_row(self, account_id: int, candidate: _SignalCandidate, jd_text: str | None) -> dict | None:
+        item = candidate.item
+        summary = (
+            build_hiring_summary(item.title, item.snippet, item.url, jd_text)
+            if candidate.signal_type == "HIRING"
+            else clean_summary(f"{item.title}. {item.snippet}".strip())
+        )
+        if candidate.signal_type == "HIRING":
+            if not is_hiring_summary_usable(summary):
+                return None
+        elif not is_summary_usable(summary):
+            return None
+
+        return {
+            "account_id": account_id,
+            "signal_type": candidate.signal_type,
+            "signal_strength": candidate.strength,
+            "event_date": candidate.published_at.date() if candidate.published_at else None,
+            "summary": summary,
+            "evidence_url": item.url,
+            "source_name": item.source_name,
+            "source_published_at": candidate.published_at,
+            "search_provider": item.provider,
+            "search_latency_ms": item.latency_ms,
+            "search_fallback_used": 1 if item.fallback_used else 0,
+            "content_fingerprint": candidate.fingerprint,
+        }
+
+    def _write_account_signals(
+        self,
+        db: Session,
+        account_id: int,
+        rows: list[dict],
+        refreshed: list[dict] | None = None,
+        known: dict[str, tuple[int, str | None]] | None = None,
+    ) -> SignalWriteCounts:
+        """單一帳戶的訊號以一條多列 upsert 寫入，再以 executemany 刷新未變動列，整批只 commit 一次。
+
+        known 為增量掃描預先載入的 {evidence_url: ...}；未提供時另查一次既有 URL 以區分新增與更新。
+        刷新的未變動列計入 updated。
+        """
+        # 同一批內重複的 URL 以最後一筆為準（與逐列 upsert 的結果相同）
+        by_url = {row["evidence_url"]: row for row in rows}
+        counts = SignalWriteCounts()
+        if by_url:
+            if known is None:
+                known = dict.fromkeys(
+                    db.execute(
+                        select(SignalEvent.evidence_url).where(
+                            SignalEvent.account_id == account_id, SignalEvent.evidence_url.in_(list(by_url))
+                        )
+                    ).scalars()
                 )
-                db.execute(stmt)
-                created_count += 1
-                accepted_for_account += 1
+            counts.updated = sum(1 for url in by_url if url in known)
+            counts.created = len(by_url) - counts.updated
+
+        fetched_at = now_utc()
+        values = [
+            {column: row.get(column) for column in _SIGNAL_UPSERT_COLUMNS} | {"fetched_at": fetched_at}
+            for row in by_url.values()
+        ]
+        for start in range(0, len(values), _SIGNAL_UPSERT_CHUNK):
+            stmt = sqlite_insert(SignalEvent).values(values[start : start + _SIGNAL_UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["account_id", "evidence_url"],
+                set_={column: stmt.excluded[column] for column in _SIGNAL_UPDATE_COLUMNS},
+            )
+            db.execute(stmt)
+        if refreshed:
+            # 未變動的訊號以單一 executemany UPDATE（依主鍵）刷新
+            db.execute(update(SignalEvent), [{**refresh, "fetched_at": fetched_at} for refresh in refreshed])
+            counts.updated += len(refreshed)
         db.commit()
-        return created_count
+        return counts
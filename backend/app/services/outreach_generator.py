@@ -1,16 +1,52 @@
 import json
+import logging
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models import Account, Contact, OutreachDraft, PainProfile
-from app.services.providers.llm import LLMRouter
+from app.services.kpi_rollups import record_kpi
+from app.services.providers.llm import LLMResult, LLMRouter
 from app.services.utils import extract_first_json_object, now_utc
 
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutreachPrompt:
+    """組好的 prompt 與寫入草稿所需欄位；不持有 ORM 物件，可跨 session 使用。"""
+
+    contact_id: int
+    account_id: int
+    channel: str
+    intent: str
+    tone: str
+    provider_preference: list[str]
+    system_prompt: str
+    user_prompt: str
+
+
+@dataclass
+class OutreachBatchItem:
+    contact_id: int
+    # CREATED / NOT_FOUND / FAILED
+    status: str
+    draft_id: int | None = None
+    model_provider: str | None = None
+    error: str | None = None
+
 
 class OutreachGeneratorService:
     def __init__(self) -> None:
-        self.llm_router = LLMRouter()
+        # 互動式生成：開啟 LLM_HEDGE_ENABLED 時可對次選 provider 送 hedged 請求
+        self.llm_router = LLMRouter(interactive=True)
+        # 批次生成不需要 hedge，避免整批請求量加倍
+        self.batch_llm_router = LLMRouter()
 
     def _build_prompt(
         self,
@@ -62,7 +98,7 @@ class OutreachGeneratorService:
             "cta": "本週是否可安排 20 分鐘 technical discovery call？",
         }
 
-    def generate(
+    def prepare(
         self,
         db: Session,
         contact_id: int,
@@ -70,7 +106,8 @@ class OutreachGeneratorService:
         intent: str,
         tone: str,
         provider_preference: list[str],
-    ) -> tuple[OutreachDraft, str]:
+    ) -> OutreachPrompt:
+        """查出聯絡人、帳戶與痛點並組好 prompt；找不到聯絡人或帳戶時丟 ValueError。"""
         contact = db.get(Contact, contact_id)
         if not contact:
             raise ValueError(f"找不到聯絡人 Contact {contact_id}。")
@@ -78,16 +115,36 @@ class OutreachGeneratorService:
         if not account:
             raise ValueError(f"找不到 Contact {contact_id} 對應的 account。")
 
-        pains = (
+        pains = self._load_pains(db, [account.id]).get(account.id, [])
+        return self._make_prompt(account, contact, pains, channel, intent, tone, provider_preference)
+
+    @staticmethod
+    def _load_pains(db: Session, account_ids: list[int]) -> dict[int, list[PainProfile]]:
+        """一次查出多個帳戶的痛點，依信心度排序後按帳戶分組。"""
+        pains_by_account: dict[int, list[PainProfile]] = defaultdict(list)
+        rows = (
             db.execute(
                 select(PainProfile)
-                .where(PainProfile.account_id == account.id)
+                .where(PainProfile.account_id.in_(account_ids))
                 .order_by(PainProfile.confidence.desc(), PainProfile.created_at.desc())
             )
             .scalars()
             .all()
         )
+        for pain in rows:
+            pains_by_account[pain.account_id].append(pain)
+        return pains_by_account
 
+    def _make_prompt(
+        self,
+        account: Account,
+        contact: Contact,
+        pains: list[PainProfile],
+        channel: str,
+        intent: str,
+        tone: str,
+        provider_preference: list[str],
+    ) -> OutreachPrompt:
         system_prompt = "你是 B2B 半導體設備與工廠自動化解決方案的技術型業務開發助手，熟悉台灣半導體產業生態系，請以繁體中文輸出。"
         user_prompt = self._build_prompt(
             account=account,
@@ -97,31 +154,174 @@ class OutreachGeneratorService:
             intent=intent,
             tone=tone,
         )
-        llm_result = self.llm_router.generate(
+        return OutreachPrompt(
+            contact_id=contact.id,
+            account_id=account.id,
+            channel=channel,
+            intent=intent,
+            tone=tone,
+            provider_preference=provider_preference,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            preferred_order=provider_preference,
         )
+
+    def _draft_values(self, prompt: OutreachPrompt, llm_result: LLMResult) -> dict:
         parsed = extract_first_json_object(llm_result.text)
         if not parsed:
-            parsed = self._fallback_content(channel=channel, intent=intent)
+            parsed = self._fallback_content(channel=prompt.channel, intent=prompt.intent)
+        return {
+            "contact_id": prompt.contact_id,
+            "channel": prompt.channel,
+            "intent": prompt.intent,
+            "subject": parsed.get("subject"),
+            "body": str(parsed.get("body", ""))[:4000] or self._fallback_content(prompt.channel, prompt.intent)["body"],
+            "cta": str(parsed.get("cta", ""))[:1000] or self._fallback_content(prompt.channel, prompt.intent)["cta"],
+            "tone": prompt.tone,
+            "model_provider": llm_result.provider,
+            "llm_latency_ms": llm_result.latency_ms,
+            "llm_token_usage": llm_result.token_usage,
+            "llm_fallback_used": 1 if llm_result.fallback_used else 0,
+            "status": "DRAFT",
+            "created_at": now_utc(),
+        }
 
-        draft = OutreachDraft(
-            contact_id=contact_id,
-            channel=channel,
-            intent=intent,
-            subject=parsed.get("subject"),
-            body=str(parsed.get("body", ""))[:4000] or self._fallback_content(channel, intent)["body"],
-            cta=str(parsed.get("cta", ""))[:1000] or self._fallback_content(channel, intent)["cta"],
-            tone=tone,
-            model_provider=llm_result.provider,
-            llm_latency_ms=llm_result.latency_ms,
-            llm_token_usage=llm_result.token_usage,
-            llm_fallback_used=1 if llm_result.fallback_used else 0,
-            status="DRAFT",
-            created_at=now_utc(),
-        )
+    def save_draft(self, db: Session, prompt: OutreachPrompt, llm_result: LLMResult) -> OutreachDraft:
+        draft = OutreachDraft(**self._draft_values(prompt, llm_result))
         db.add(draft)
+        record_kpi(db, prompt.account_id, draft.created_at, drafts_created=1)
         db.commit()
         db.refresh(draft)
-        return draft, llm_result.provider
+        return draft
+
+    def generate(
+        self,
+        db: Session,
+        contact_id: int,
+        channel: str,
+        intent: str,
+        tone: str,
+        provider_preference: list[str],
+    ) -> tuple[OutreachDraft, str]:
+        prompt = self.prepare(db, contact_id, channel, intent, tone, provider_preference)
+        llm_result = self.llm_router.generate(
+            system_prompt=prompt.system_prompt,
+            user_prompt=prompt.user_prompt,
+            preferred_order=prompt.provider_preference,
+        )
+        return self.save_draft(db, prompt, llm_result), llm_result.provider
+
+    def generate_batch(
+        self,
+        db: Session,
+        contact_ids: list[int],
+        channel: str,
+        intent: str,
+        tone: str,
+        provider_preference: list[str],
+        workers: int | None = None,
+    ) -> list[OutreachBatchItem]:
+        """一次為多位聯絡人產生草稿，回傳與輸入順序一致的逐筆結果。
+
+        聯絡人、帳戶與痛點各只查一次（痛點按帳戶分組共用），LLM 呼叫在 worker 執行緒並行，
+        成功的草稿以單一 INSERT 寫入並一次 commit；單一聯絡人失敗不影響其他人。
+        """
+        contact_ids = list(dict.fromkeys(contact_ids))
+        if not contact_ids:
+            return []
+        contacts = {
+            contact.id: contact
+            for contact in db.execute(select(Contact).where(Contact.id.in_(contact_ids))).scalars()
+        }
+        account_ids = sorted({contact.account_id for contact in contacts.values()})
+        accounts = {
+            account.id: account
+            for account in db.execute(select(Account).where(Account.id.in_(account_ids))).scalars()
+        }
+        pains_by_account = self._load_pains(db, list(accounts))
+
+        items: dict[int, OutreachBatchItem] = {}
+        prompts: list[OutreachPrompt] = []
+        for contact_id in contact_ids:
+            contact = contacts.get(contact_id)
+            account = accounts.get(contact.account_id) if contact else None
+            if account is None:
+                # 訊息與 prepare() 一致，呼叫端才分得出是聯絡人不存在還是帳戶已不存在
+                error = (
+                    f"找不到 Contact {contact_id} 對應的 account。" if contact else f"找不到聯絡人 Contact {contact_id}。"
+                )
+                items[contact_id] = OutreachBatchItem(contact_id=contact_id, status="NOT_FOUND", error=error)
+                continue
+            prompts.append(
+                self._make_prompt(
+                    account, contact, pains_by_account.get(account.id, []), channel, intent, tone, provider_preference
+                )
+            )
+
+        def call(prompt: OutreachPrompt) -> LLMResult:
+            return self.batch_llm_router.generate(
+                system_prompt=prompt.system_prompt,
+                user_prompt=prompt.user_prompt,
+                preferred_order=prompt.provider_preference,
+            )
+
+        workers = max(1, min(workers or get_settings().outreach_batch_workers, len(prompts) or 1))
+        # LLM 呼叫在 worker 執行緒並行（各 provider 另受 LLM_MAX_CONCURRENCY 限制）；寫入回到呼叫端執行緒
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outreach-batch") as executor:
+            futures = [(prompt, executor.submit(call, prompt)) for prompt in prompts]
+            results: list[tuple[OutreachPrompt, LLMResult]] = []
+            for prompt, future in futures:
+                try:
+                    results.append((prompt, future.result()))
+                except Exception as exc:  # noqa: BLE001
+                    _logger.warning("Batch outreach failed for contact %s: %s", prompt.contact_id, exc)
+                    items[prompt.contact_id] = OutreachBatchItem(
+                        contact_id=prompt.contact_id, status="FAILED", error=str(exc) or exc.__class__.__name__
+                    )
+
+        if results:
+            rows = [self._draft_values(prompt, llm_result) for prompt, llm_result in results]
+            draft_ids = db.scalars(
+                insert(OutreachDraft).returning(OutreachDraft.id, sort_by_parameter_order=True), rows
+            ).all()
+            drafts_by_account = Counter(prompt.account_id for prompt, _ in results)
+            created_at = rows[0]["created_at"]
+            for account_id, count in drafts_by_account.items():
+                record_kpi(db, account_id, created_at, drafts_created=count)
+            db.commit()
+            for (prompt, llm_result), draft_id in zip(results, draft_ids):
+                items[prompt.contact_id] = OutreachBatchItem(
+                    contact_id=prompt.contact_id,
+                    status="CREATED",
+                    draft_id=draft_id,
+                    model_provider=llm_result.provider,
+                )
+        return [items[contact_id] for contact_id in contact_ids]
+
+    def generate_stream(
+        self,
+        session_factory: Callable[[], Session],
+        prompt: OutreachPrompt,
+    ) -> Iterator[tuple[str, dict]]:
+        """逐段回傳 ("token", {"text"})，完成後以 session_factory 開新 session 寫入草稿並回傳 ("draft", {...})。"""
+        llm_result = None
+        for event in self.llm_router.stream(
+            system_prompt=prompt.system_prompt,
+            user_prompt=prompt.user_prompt,
+            preferred_order=prompt.provider_preference,
+        ):
+            if event.result is not None:
+                llm_result = event.result
+            else:
+                yield "token", {"text": event.delta}
+        with session_factory() as db:
+            draft = self.save_draft(db, prompt, llm_result)
+            yield "draft", {
+                "draft_id": draft.id,
+                "model_provider": llm_result.provider,
+                "status": draft.status,
+                "subject": draft.subject,
+                "body": draft.body,
+                "cta": draft.cta,
+                "llm_latency_ms": llm_result.latency_ms,
+                "first_token_ms": llm_result.first_token_ms,
+            }
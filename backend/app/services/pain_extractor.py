@@ -1,17 +1,33 @@
 import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from datetime import date, datetime
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import Account, PainProfile, SignalEvent
-from app.services.providers.llm import LLMRouter
+from app.services.providers.llm import LLMResult, LLMRouter
 from app.services.utils import extract_first_json_object, now_utc
 
 
+@dataclass
+class PainPrompt:
+    """組好的 prompt 與寫入痛點所需資料；證據先轉成純 dict，可跨 session 使用。"""
+
+    account_id: int
+    persona_targets: list[str]
+    max_items: int
+    default_signal_ids: list[int]
+    evidence_by_id: dict[int, dict]
+    system_prompt: str
+    user_prompt: str
+
+
 class PainExtractorService:
     def __init__(self) -> None:
-        self.llm_router = LLMRouter()
+        # 互動式生成：開啟 LLM_HEDGE_ENABLED 時可對次選 provider 送 hedged 請求
+        self.llm_router = LLMRouter(interactive=True)
 
     def _build_prompt(
         self,
@@ -115,31 +131,27 @@ class PainExtractorService:
             return None
         return value.isoformat()
 
+    def _evidence_entry(self, signal: SignalEvent) -> dict:
+        return {
+            "signal_id": signal.id,
+            "signal_type": signal.signal_type,
+            "signal_strength": signal.signal_strength,
+            "summary": signal.summary,
+            "source_name": signal.source_name,
+            "evidence_url": signal.evidence_url,
+            "event_date": self._serialize_datetime(signal.event_date),
+            "fetched_at": self._serialize_datetime(signal.fetched_at),
+        }
+
     def _build_evidence_ref(
         self,
         signal_ids: list[int],
-        signals_by_id: dict[int, SignalEvent],
+        evidence_by_id: dict[int, dict],
         reasoning: str,
     ) -> str | None:
         if not signal_ids:
             return None
-        evidence = []
-        for signal_id in signal_ids:
-            signal = signals_by_id.get(signal_id)
-            if not signal:
-                continue
-            evidence.append(
-                {
-                    "signal_id": signal.id,
-                    "signal_type": signal.signal_type,
-                    "signal_strength": signal.signal_strength,
-                    "summary": signal.summary,
-                    "source_name": signal.source_name,
-                    "evidence_url": signal.evidence_url,
-                    "event_date": self._serialize_datetime(signal.event_date),
-                    "fetched_at": self._serialize_datetime(signal.fetched_at),
-                }
-            )
+        evidence = [evidence_by_id[signal_id] for signal_id in signal_ids if signal_id in evidence_by_id]
         if not evidence:
             return None
         return json.dumps(
@@ -164,7 +176,7 @@ class PainExtractorService:
             return min(confidence, 0.78)
         return confidence
 
-    def generate(
+    def prepare(
         self,
         db: Session,
         account_id: int,
@@ -173,7 +185,8 @@ class PainExtractorService:
         signal_ids: list[int] | None = None,
         user_annotations: dict[str, str] | None = None,
         use_knowledge_base: bool = True,
-    ) -> tuple[int, str]:
+    ) -> PainPrompt:
+        """查出帳戶與訊號並組好 prompt；找不到帳戶丟 ValueError，沒有可引用的訊號丟 RuntimeError。"""
         account = db.get(Account, account_id)
         if not account:
             raise ValueError(f"找不到 account {account_id}。")
@@ -199,10 +212,6 @@ class PainExtractorService:
         else:
             signals = list(all_signals)
 
-        signals_by_id = {signal.id: signal for signal in all_signals}
-        available_signal_ids = set(signals_by_id)
-        default_signal_ids = [signals[0].id]
-
         knowledge_context = None
         if use_knowledge_base:
             from app.services.knowledge_service import KnowledgeService
@@ -219,34 +228,44 @@ class PainExtractorService:
             is_hitl=is_hitl,
             knowledge_context=knowledge_context,
         )
+        return PainPrompt(
+            account_id=account_id,
+            persona_targets=persona_targets,
+            max_items=max_items,
+            default_signal_ids=[signals[0].id],
+            evidence_by_id={signal.id: self._evidence_entry(signal) for signal in all_signals},
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+        )
 
-        llm_result = self.llm_router.generate(system_prompt=system_prompt, user_prompt=user_prompt)
+    def save_profiles(self, db: Session, prompt: PainPrompt, llm_result: LLMResult) -> int:
         parsed = extract_first_json_object(llm_result.text)
         items = parsed.get("items", []) if parsed else []
         if not isinstance(items, list) or not items:
             items = self._fallback_items(
-                persona_targets=persona_targets,
-                max_items=max_items,
-                default_signal_ids=default_signal_ids,
+                persona_targets=prompt.persona_targets,
+                max_items=prompt.max_items,
+                default_signal_ids=prompt.default_signal_ids,
             )
 
+        available_signal_ids = set(prompt.evidence_by_id)
         created_count = 0
-        for item in items[:max_items]:
+        for item in items[: prompt.max_items]:
             evidence_signal_ids = self._normalize_evidence_ids(
                 raw_ids=item.get("evidence_signal_ids"),
                 available_ids=available_signal_ids,
-                default_ids=default_signal_ids,
+                default_ids=prompt.default_signal_ids,
             )
             reasoning = str(item.get("reasoning", "")).strip()[:600]
             confidence = self._normalize_confidence(item.get("confidence", 0.5), len(evidence_signal_ids))
             evidence_ref = self._build_evidence_ref(
                 signal_ids=evidence_signal_ids,
-                signals_by_id=signals_by_id,
+                evidence_by_id=prompt.evidence_by_id,
                 reasoning=reasoning,
             )
             db.add(
                 PainProfile(
-                    account_id=account_id,
+                    account_id=prompt.account_id,
                     persona=str(item.get("persona", "RD")).upper()[:32],
                     pain_statement=str(item.get("pain_statement", ""))[:2000] or "未提供 pain statement。",
                     business_impact=str(item.get("business_impact", ""))[:2000] or "未提供 business impact。",
@@ -262,4 +281,42 @@ class PainExtractorService:
             )
             created_count += 1
         db.commit()
-        return created_count, llm_result.provider
+        return created_count
+
+    def generate(
+        self,
+        db: Session,
+        account_id: int,
+        persona_targets: list[str],
+        max_items: int,
+        signal_ids: list[int] | None = None,
+        user_annotations: dict[str, str] | None = None,
+        use_knowledge_base: bool = True,
+    ) -> tuple[int, str]:
+        prompt = self.prepare(
+            db, account_id, persona_targets, max_items, signal_ids, user_annotations, use_knowledge_base
+        )
+        llm_result = self.llm_router.generate(system_prompt=prompt.system_prompt, user_prompt=prompt.user_prompt)
+        return self.save_profiles(db, prompt, llm_result), llm_result.provider
+
+    def generate_stream(
+        self,
+        session_factory: Callable[[], Session],
+        prompt: PainPrompt,
+    ) -> Iterator[tuple[str, dict]]:
+        """逐段回傳 ("token", {"text"})，完成後以 session_factory 開新 session 寫入痛點並回傳 ("done", {...})。"""
+        llm_result = None
+        for event in self.llm_router.stream(system_prompt=prompt.system_prompt, user_prompt=prompt.user_prompt):
+            if event.result is not None:
+                llm_result = event.result
+            else:
+                yield "token", {"text": event.delta}
+        with session_factory() as db:
+            created_count = self.save_profiles(db, prompt, llm_result)
+        yield "done", {
+            "account_id": prompt.account_id,
+            "created_count": created_count,
+            "provider_used": llm_result.provider,
+            "llm_latency_ms": llm_result.latency_ms,
+            "first_token_ms": llm_result.first_token_ms,
+        }
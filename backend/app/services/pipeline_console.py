@@ -1,110 +1,169 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
-from app.models import Account, BANTScorecard, Contact, InteractionLog, OutreachDraft, PipelineItem
+from app.models import Account, BANTScorecard, DailyKpiRollup, PipelineItem
 from app.services.utils import now_utc
 
 
-class PipelineConsoleService:
-    def board(self, db: Session) -> list[dict]:
-        rows = (
-            db.execute(
-                select(PipelineItem, Account)
-                .join(Account, Account.id == PipelineItem.account_id)
-                .order_by(PipelineItem.due_date.asc(), PipelineItem.probability.desc())
-            )
-            .all()
-        )
-        items: list[dict] = []
-        for pipeline, account in rows:
-            latest_score = (
-                db.execute(
-                    select(BANTScorecard)
-                    .where(BANTScorecard.account_id == account.id)
-                    .order_by(BANTScorecard.created_at.desc())
-                    .limit(1)
-                )
-                .scalars()
-                .first()
-            )
-            items.append(
-                {
-                    "account_id": account.id,
-                    "company_name": account.company_name,
-                    "stage": pipeline.stage,
-                    "probability": pipeline.probability,
-                    "due_date": pipeline.due_date,
-                    "owner": pipeline.owner,
-                    "next_action": pipeline.next_action,
-                    "blocker": pipeline.blocker,
-                    "latest_bant_grade": latest_score.grade if latest_score else None,
-                    "latest_bant_score": latest_score.total_score if latest_score else None,
-                }
-            )
-        return items
-
-    def weekly_report(self, db: Session) -> dict:
-        end = now_utc().date()
-        start = (now_utc() - timedelta(days=7)).date()
-        start_ts = now_utc() - timedelta(days=7)
-
-        outbound_count = (
-            db.execute(
-                select(func.count(InteractionLog.id)).where(
-                    InteractionLog.direction == "OUTBOUND", InteractionLog.occurred_at >= start_ts
-                )
-            )
-            .scalar_one()
-        )
-        inbound_count = (
-            db.execute(
-                select(func.count(InteractionLog.id)).where(
-                    InteractionLog.direction == "INBOUND", InteractionLog.occurred_at >= start_ts
-                )
-            )
-            .scalar_one()
-        )
-        accounts_touched = (
-            db.execute(
-                select(func.count(func.distinct(Contact.account_id)))
-                .select_from(InteractionLog)
-                .join(Contact, Contact.id == InteractionLog.contact_id)
-                .where(InteractionLog.occurred_at >= start_ts)
-            )
-            .scalar_one()
-        )
-        drafts_created = (
-            db.execute(select(func.count(OutreachDraft.id)).where(OutreachDraft.created_at >= start_ts)).scalar_one()
+BOARD_SORTS = ("due_date", "probability", "bant_score", "company_name", "updated_at")
+
+
+def _latest_scorecards():
+    """每個帳戶最新一張 BANT scorecard（row_number 視窗），供 board 一次 outer join。"""
+    ranked = select(
+        BANTScorecard.account_id.label("account_id"),
+        BANTScorecard.grade.label("grade"),
+        BANTScorecard.total_score.label("total_score"),
+        func.row_number()
+        .over(
+            partition_by=BANTScorecard.account_id,
+            order_by=(BANTScorecard.created_at.desc(), BANTScorecard.id.desc()),
         )
-        bant_a_count = (
-            db.execute(
-                select(func.count(BANTScorecard.id)).where(BANTScorecard.created_at >= start_ts, BANTScorecard.grade == "A")
-            )
-            .scalar_one()
+        .label("rn"),
+    ).subquery()
+    return select(ranked.c.account_id, ranked.c.grade, ranked.c.total_score).where(ranked.c.rn == 1).subquery()
+
+
+def _account_owners():
+    """每個帳戶一位 owner（最近更新的 pipeline item），報表 join 時每個帳戶只會對到一列。"""
+    ranked = select(
+        PipelineItem.account_id.label("account_id"),
+        PipelineItem.owner.label("owner"),
+        func.row_number()
+        .over(
+            partition_by=PipelineItem.account_id,
+            order_by=(PipelineItem.updated_at.desc(), PipelineItem.id.desc()),
         )
-        bant_b_count = (
-            db.execute(
-                select(func.count(BANTScorecard.id)).where(BANTScorecard.created_at >= start_ts, BANTScorecard.grade == "B")
-            )
-            .scalar_one()
+        .label("rn"),
+    ).subquery()
+    return select(ranked.c.account_id, ranked.c.owner).where(ranked.c.rn == 1).subquery()
+
+
+class PipelineConsoleService:
+    def board(
+        self,
+        db: Session,
+        stage: str | None = None,
+        owner: str | None = None,
+        sort: str = "due_date",
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        latest = _latest_scorecards()
+        stmt = self._filter_board(
+            select(PipelineItem, Account, latest.c.grade, latest.c.total_score)
+            .join(Account, Account.id == PipelineItem.account_id)
+            .outerjoin(latest, latest.c.account_id == PipelineItem.account_id),
+            stage=stage,
+            owner=owner,
         )
-        bant_c_count = (
-            db.execute(
-                select(func.count(BANTScorecard.id)).where(BANTScorecard.created_at >= start_ts, BANTScorecard.grade == "C")
+        order_by = {
+            "due_date": (PipelineItem.due_date.asc(), PipelineItem.probability.desc()),
+            "probability": (PipelineItem.probability.desc(), PipelineItem.due_date.asc()),
+            "bant_score": (latest.c.total_score.desc().nulls_last(), PipelineItem.due_date.asc()),
+            "company_name": (Account.company_name.asc(),),
+            "updated_at": (PipelineItem.updated_at.desc(),),
+        }.get(sort)
+        if order_by is None:
+            raise ValueError(f"sort 必須是 {list(BOARD_SORTS)} 之一。")
+        stmt = stmt.order_by(*order_by, PipelineItem.id.asc()).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        return [
+            {
+                "account_id": account.id,
+                "company_name": account.company_name,
+                "stage": pipeline.stage,
+                "probability": pipeline.probability,
+                "due_date": pipeline.due_date,
+                "owner": pipeline.owner,
+                "next_action": pipeline.next_action,
+                "blocker": pipeline.blocker,
+                "latest_bant_grade": grade,
+                "latest_bant_score": total_score,
+            }
+            for pipeline, account, grade, total_score in db.execute(stmt).all()
+        ]
+
+    def board_count(self, db: Session, stage: str | None = None, owner: str | None = None) -> int:
+        stmt = self._filter_board(select(func.count(PipelineItem.id)), stage=stage, owner=owner)
+        return db.execute(stmt).scalar_one()
+
+    @staticmethod
+    def _filter_board(stmt, stage: str | None, owner: str | None):
+        if stage:
+            stmt = stmt.where(PipelineItem.stage == stage.upper())
+        if owner:
+            stmt = stmt.where(PipelineItem.owner == owner)
+        return stmt
+
+    def weekly_report(
+        self,
+        db: Session,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        group_by: str | None = None,
+    ) -> dict:
+        """讀 daily_kpi_rollups 彙總區間 KPI（預設含今天在內的近 7 天）；group_by 可為 owner / segment。
+
+        owner 以帳戶最近更新的 pipeline item 為準，帳戶有多筆 pipeline item 時 KPI 不會重複計算。
+        """
+        end = end_date or now_utc().date()
+        # 首尾日都含在區間內，今天往前 6 天剛好 7 天
+        start = start_date or end - timedelta(days=6)
+        if start > end:
+            raise ValueError("start_date 不可晚於 end_date。")
+
+        in_range = (DailyKpiRollup.day >= start, DailyKpiRollup.day <= end)
+        totals = db.execute(select(*_kpi_aggregates()).where(*in_range)).one()
+        report = {"start_date": start, "end_date": end, **_kpi_row_to_dict(totals)}
+        if group_by is None:
+            return report
+
+        if group_by == "segment":
+            key = Account.segment
+            stmt = select(key.label("key"), *_kpi_aggregates()).join(Account, Account.id == DailyKpiRollup.account_id)
+        elif group_by == "owner":
+            owners = _account_owners()
+            key = func.coalesce(owners.c.owner, "UNASSIGNED")
+            stmt = select(key.label("key"), *_kpi_aggregates()).outerjoin(
+                owners, owners.c.account_id == DailyKpiRollup.account_id
             )
-            .scalar_one()
-        )
-        return {
-            "start_date": start,
-            "end_date": end,
-            "outbound_count": outbound_count,
-            "inbound_count": inbound_count,
-            "accounts_touched": accounts_touched,
-            "drafts_created": drafts_created,
-            "bant_a_count": bant_a_count,
-            "bant_b_count": bant_b_count,
-            "bant_c_count": bant_c_count,
-        }
+        else:
+            raise ValueError("group_by 必須是 owner 或 segment。")
+        rows = db.execute(stmt.where(*in_range).group_by(key).order_by(key)).all()
+        report["group_by"] = group_by
+        report["breakdown"] = [{"key": row.key, **_kpi_row_to_dict(row)} for row in rows]
+        return report
+
+
+def _kpi_aggregates() -> list:
+    def total(column):
+        return func.coalesce(func.sum(column), 0)
+
+    return [
+        total(DailyKpiRollup.outbound_count).label("outbound_count"),
+        total(DailyKpiRollup.inbound_count).label("inbound_count"),
+        func.count(func.distinct(case((DailyKpiRollup.interactions_count > 0, DailyKpiRollup.account_id)))).label(
+            "accounts_touched"
+        ),
+        total(DailyKpiRollup.drafts_created).label("drafts_created"),
+        total(DailyKpiRollup.bant_a_count).label("bant_a_count"),
+        total(DailyKpiRollup.bant_b_count).label("bant_b_count"),
+        total(DailyKpiRollup.bant_c_count).label("bant_c_count"),
+    ]
+
 
+def _kpi_row_to_dict(row) -> dict:
+    return {
+        "outbound_count": int(row.outbound_count),
+        "inbound_count": int(row.inbound_count),
+        "accounts_touched": int(row.accounts_touched),
+        "drafts_created": int(row.drafts_created),
+        "bant_a_count": int(row.bant_a_count),
+        "bant_b_count": int(row.bant_b_count),
+        "bant_c_count": int(row.bant_c_count),
+    }
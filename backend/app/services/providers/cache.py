@@ -0,0 +1,148 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[3]
+
+_registry_lock = threading.Lock()
+_registry: dict[tuple[str, str], "ResponseCache"] = {}
+
+
+def cache_key(payload: dict) -> str:
+    """以正規化後的 payload 產生 sha256；key 順序不影響結果。"""
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """存在本機 SQLite 檔的 key/value 快取，支援 TTL 與 LRU 上限。
+
+    快取只服務外部 API 回應，不放在業務資料庫，避免與 signal_events 寫入搶鎖。
+    """
+
+    def __init__(self, path: Path, table: str, max_entries: int) -> None:
+        self.path = path
+        self.table = table
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_last_used_at ON {table} (last_used_at)")
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET last_used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO {self.table} (key, value, expires_at, last_used_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+                "last_used_at = excluded.last_used_at",
+                (key, encoded, now + ttl_seconds, now),
+            )
+            self._writes_since_evict += 1
+            # 每累積一批寫入才做一次淘汰，避免每次寫入都 COUNT 整張表
+            if self._writes_since_evict >= max(1, self.max_entries // 20):
+                self._evict(now)
+                self._writes_since_evict = 0
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_used_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _cache_path() -> Path:
+    path = Path(get_settings().provider_cache_path)
+    return path if path.is_absolute() else _BACKEND_ROOT / path
+
+
+def get_response_cache(table: str, max_entries: int) -> ResponseCache:
+    path = _cache_path()
+    key = (str(path), table)
+    with _registry_lock:
+        cache = _registry.get(key)
+        if cache is None:
+            cache = ResponseCache(path=path, table=table, max_entries=max_entries)
+            _registry[key] = cache
+        return cache
+
+
+def get_search_cache() -> ResponseCache:
+    return get_response_cache("search_results", get_settings().search_cache_max_entries)
+
+
+def get_llm_cache() -> ResponseCache:
+    return get_response_cache("llm_responses", get_settings().llm_cache_max_entries)
+
+
+def search_cache_ttl_seconds(lookback_days: int) -> int:
+    """回看窗越長，新聞變動相對越小，可容忍較舊的快取；介於 6 小時到 7 天。"""
+    return int(min(7 * 86400, max(6 * 3600, lookback_days * 2 * 3600)))
+
+
+def cache_stats() -> dict[str, dict]:
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.table: cache.stats() for cache in caches}
+
+
+def close_response_caches() -> None:
+    with _registry_lock:
+        caches = list(_registry.values())
+        _registry.clear()
+    for cache in caches:
+        cache.close()
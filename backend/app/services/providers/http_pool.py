@@ -0,0 +1,106 @@
+import asyncio
+import importlib.util
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+# h2 未安裝時 httpx 開 http2 會直接報錯，因此只在可用時啟用。
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_sync_clients: dict[str, httpx.Client] = {}
+_async_clients: dict[str, httpx.AsyncClient] = {}
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+
+
+def _host_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=max(1, settings.http_max_connections_per_host),
+        max_keepalive_connections=max(0, settings.http_max_keepalive_per_host),
+        keepalive_expiry=settings.http_keepalive_expiry_s,
+    )
+
+
+def get_http_client(url: str) -> httpx.Client:
+    """回傳該 host 共用的同步 client；同 host 的請求共用 keep-alive 連線池。"""
+    key = _host_key(url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(timeout=30.0, limits=_limits(), http2=HTTP2_AVAILABLE)
+            _sync_clients[key] = client
+        return client
+
+
+def get_async_http_client(url: str) -> httpx.AsyncClient:
+    """回傳該 host 共用的 async client；只能在 run_async 的背景 event loop 內使用。"""
+    key = _host_key(url)
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=30.0, limits=_limits(), http2=HTTP2_AVAILABLE)
+            _async_clients[key] = client
+        return client
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is not None and _loop_thread is not None and _loop_thread.is_alive():
+            return _loop
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="http-pool-loop", daemon=True)
+        thread.start()
+        _loop, _loop_thread = loop, thread
+        return loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """在共用的背景 event loop 執行 coroutine 並阻塞等待結果。
+
+    async client 綁定在這個 loop 上，因此同步呼叫端（FastAPI threadpool、掃描 worker、CLI）
+    都經由這裡進入，才能跨請求重用連線。
+    """
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def close_http_clients() -> None:
+    """關閉所有共用 client 與背景 loop；之後的呼叫會自動重新建立。"""
+    global _loop, _loop_thread
+    with _lock:
+        sync_clients = list(_sync_clients.values())
+        async_clients = list(_async_clients.values())
+        loop, thread = _loop, _loop_thread
+        _sync_clients.clear()
+        _async_clients.clear()
+        _loop, _loop_thread = None, None
+
+    for client in sync_clients:
+        client.close()
+    if loop is None:
+        return
+    if async_clients and thread is not None and thread.is_alive():
+
+        async def _close_all() -> None:
+            await asyncio.gather(*(client.aclose() for client in async_clients), return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(_close_all(), loop).result(timeout=10)
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=10)
+    loop.close()
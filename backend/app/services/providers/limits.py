@@ -0,0 +1,367 @@
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import TypeVar
+
+import httpx
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+_logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_async_gates: dict[str, asyncio.Semaphore] = {}
+_async_gates_loop: asyncio.AbstractEventLoop | None = None
+_buckets: dict[str, "TokenBucket"] = {}
+_breakers: dict[str, "CircuitBreaker"] = {}
+
+
+def provider_limit(provider: str) -> int:
+    settings = get_settings()
+    limits = {
+        "TAVILY": settings.tavily_max_concurrency,
+        "GEMINI": settings.llm_max_concurrency,
+        "OPENAI": settings.llm_max_concurrency,
+        "JD_104": settings.jd_fetch_max_concurrency,
+        "JINA": settings.jd_fetch_max_concurrency,
+    }
+    return max(1, limits.get(provider.upper(), 4))
+
+
+def provider_rate(provider: str) -> float:
+    """各 provider 每秒可送出的請求數（token bucket 的補充速率）。"""
+    settings = get_settings()
+    rates = {
+        "TAVILY": settings.tavily_rate_per_s,
+        "GEMINI": settings.llm_rate_per_s,
+        "OPENAI": settings.llm_rate_per_s,
+        "JD_104": settings.jd_fetch_rate_per_s,
+        "JINA": settings.jd_fetch_rate_per_s,
+    }
+    return max(0.01, rates.get(provider.upper(), 5.0))
+
+
+def _semaphore(provider: str) -> threading.BoundedSemaphore:
+    key = provider.upper()
+    with _lock:
+        semaphore = _semaphores.get(key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(provider_limit(key))
+            _semaphores[key] = semaphore
+        return semaphore
+
+
+@contextmanager
+def provider_slot(provider: str) -> Iterator[None]:
+    """佔用某 provider 的一個並行名額；名額用完時阻塞直到其他 worker 釋放。"""
+    semaphore = _semaphore(provider)
+    with semaphore:
+        yield
+
+
+def _async_gate(provider: str) -> asyncio.Semaphore:
+    global _async_gates_loop
+    key = provider.upper()
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if _async_gates_loop is not loop:
+            # http_pool 重建 loop 後舊的 semaphore 不能再用
+            _async_gates.clear()
+            _async_gates_loop = loop
+        gate = _async_gates.get(key)
+        if gate is None:
+            gate = asyncio.Semaphore(provider_limit(key))
+            _async_gates[key] = gate
+        return gate
+
+
+@asynccontextmanager
+async def async_provider_slot(provider: str) -> AsyncIterator[None]:
+    """provider_slot 的 async 版本，在 http_pool 的背景 event loop 內以單一請求為單位佔用名額。"""
+    async with _async_gate(provider):
+        yield
+
+
+class TokenBucket:
+    """跨執行緒與背景 event loop 共用的 token bucket，遇 429 時自動降速（AIMD）。
+
+    reserve() 立即預約一個 token 並回傳需等待的秒數，同步端 time.sleep、async 端 asyncio.sleep，
+    不會在鎖內阻塞。
+    """
+
+    def __init__(self, rate_per_s: float, burst: float | None = None, min_rate_per_s: float | None = None) -> None:
+        self.max_rate = rate_per_s
+        self.rate = rate_per_s
+        self.min_rate = min_rate_per_s if min_rate_per_s is not None else rate_per_s / 8
+        self.burst = max(1.0, burst if burst is not None else rate_per_s)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # token 不足時以負值記帳，等待時間即補回這個缺口所需的時間
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def penalize(self) -> None:
+        """被限流時速率減半（不低於 min_rate）。"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        """成功時緩慢回升，每次加回上限的 5%。"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class CircuitOpenError(RuntimeError):
+    """provider 的斷路器為 open，請求未送出即被拒絕。"""
+
+
+class CircuitBreaker:
+    """連續失敗達門檻即 open，冷卻後進入 half-open 只放行一個探測請求。"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_s: float) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected = 0
+        self.open_count = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.opened_at: float | None = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """仍在冷卻期的 open 狀態；呼叫端可據此直接改走備援，不必佔用並行名額。"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - (self.opened_at or 0) < self.reset_timeout_s
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - (self.opened_at or 0) < self.reset_timeout_s:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"{self.name} circuit is open.")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"{self.name} circuit is half-open; probe in flight.")
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.total_successes += 1
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """請求被取消（例如 hedge 落敗）時不計成敗，只放回 half-open 探測名額，讓下一個請求能再探測。"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.open_count += 1
+                    _logger.warning("%s circuit opened after %d failures", self.name, self.consecutive_failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            open_for = time.monotonic() - self.opened_at if self.state == self.OPEN and self.opened_at else None
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "total_failures": self.total_failures,
+                "total_successes": self.total_successes,
+                "rejected": self.rejected,
+                "open_count": self.open_count,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "open_for_s": round(open_for, 1) if open_for is not None else None,
+            }
+
+
+def get_token_bucket(provider: str) -> TokenBucket:
+    key = provider.upper()
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(provider_rate(key))
+            _buckets[key] = bucket
+        return bucket
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    key = provider.upper()
+    with _lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            settings = get_settings()
+            breaker = CircuitBreaker(key, settings.breaker_failure_threshold, settings.breaker_reset_timeout_s)
+            _breakers[key] = breaker
+        return breaker
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429 / 5xx 與連線層錯誤（逾時、斷線）值得重試，其餘 4xx 重試也不會成功。"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _retry_after_s(exc: BaseException) -> float | None:
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    raw = exc.response.headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+def retry_delay_s(attempt: int, exc: BaseException | None = None) -> float:
+    """指數退避加 full jitter；伺服器給了 Retry-After 時以它為下限。"""
+    settings = get_settings()
+    ceiling = min(settings.provider_backoff_max_s, settings.provider_backoff_base_s * (2**attempt))
+    delay = random.uniform(0, ceiling)
+    retry_after = _retry_after_s(exc) if exc is not None else None
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.provider_backoff_max_s))
+    return delay
+
+
+def _after_failure(provider: str, exc: BaseException, attempt: int) -> float | None:
+    """記錄失敗；可重試時回傳等待秒數，否則回傳 None 讓呼叫端往外拋。"""
+    breaker = get_circuit_breaker(provider)
+    if not is_retryable(exc):
+        # 參數錯誤、金鑰無效等 4xx 代表請求本身有問題，不代表 provider 不可用
+        if isinstance(exc, httpx.HTTPStatusError):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return None
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429:
+        breaker.rate_limited += 1
+        get_token_bucket(provider).penalize()
+    breaker.record_failure()
+    if attempt >= get_settings().provider_max_retries or breaker.state == CircuitBreaker.OPEN:
+        return None
+    breaker.retries += 1
+    return retry_delay_s(attempt, exc)
+
+
+def call_with_resilience(provider: str, call: Callable[[], T]) -> T:
+    """同步呼叫外部 provider：斷路器檢查 → token bucket 等待 → 呼叫；429 / 5xx 以 jitter 退避重試。"""
+    breaker = get_circuit_breaker(provider)
+    bucket = get_token_bucket(provider)
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            time.sleep(bucket.reserve())
+            result = call()
+        except Exception as exc:
+            delay = _after_failure(provider, exc, attempt)
+            if delay is None:
+                raise
+            _logger.info("%s request failed (%s); retry %d in %.2fs", provider, exc, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # 取消 / 中斷不是 provider 的錯，但不放回探測名額的話斷路器會永遠卡在 half-open
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        bucket.reward()
+        return result
+
+
+async def acall_with_resilience(provider: str, call: Callable[[], Awaitable[T]]) -> T:
+    """call_with_resilience 的 async 版本，等待一律用 asyncio.sleep，不阻塞背景 event loop。"""
+    breaker = get_circuit_breaker(provider)
+    bucket = get_token_bucket(provider)
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            await asyncio.sleep(bucket.reserve())
+            result = await call()
+        except Exception as exc:
+            delay = _after_failure(provider, exc, attempt)
+            if delay is None:
+                raise
+            _logger.info("%s request failed (%s); retry %d in %.2fs", provider, exc, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # 取消 / 中斷不是 provider 的錯，但不放回探測名額的話斷路器會永遠卡在 half-open
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        bucket.reward()
+        return result
+
+
+def provider_health() -> dict[str, dict]:
+    """各 provider 斷路器狀態與目前限流速率，供 /health/providers 使用。"""
+    with _lock:
+        names = sorted(set(_breakers) | set(_buckets))
+    health = {}
+    for name in names:
+        entry = get_circuit_breaker(name).snapshot()
+        bucket = get_token_bucket(name)
+        entry["rate_per_s"] = round(bucket.rate, 3)
+        entry["max_rate_per_s"] = bucket.max_rate
+        health[name] = entry
+    return health
+
+
+def reset_provider_limits() -> None:
+    """設定變更後（例如測試中 monkeypatch settings）重新建立並行名額、token bucket 與斷路器。"""
+    with _lock:
+        _semaphores.clear()
+        _async_gates.clear()
+        _buckets.clear()
+        _breakers.clear()
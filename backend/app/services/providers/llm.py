@@ -1,9 +1,66 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from time import perf_counter
 
 import httpx
 
 from app.core.config import get_settings
+from app.services.providers.cache import cache_key, get_llm_cache
+from app.services.providers.http_pool import get_async_http_client, get_http_client, run_async
+from app.services.providers.limits import (
+    acall_with_resilience,
+    async_provider_slot,
+    call_with_resilience,
+    get_circuit_breaker,
+    provider_slot,
+)
+
+_OPENAI_ENDPOINT = "https://api.openai.com/v1/chat/completions"
+
+ROUTING_STATIC = "static"
+ROUTING_LATENCY = "latency"
+
+
+def _post_checked(url: str, **kwargs) -> httpx.Response:  # noqa: ANN003
+    resp = get_http_client(url).post(url, **kwargs)
+    resp.raise_for_status()
+    return resp
+
+
+def _open_stream(url: str, **kwargs) -> httpx.Response:  # noqa: ANN003
+    """送出串流請求並回傳尚未讀取 body 的回應；呼叫端負責 close。非 2xx 直接丟 HTTPStatusError。"""
+    client = get_http_client(url)
+    resp = client.send(client.build_request("POST", url, **kwargs), stream=True)
+    if resp.is_error:
+        resp.close()
+        resp.raise_for_status()
+    return resp
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """解析 SSE 串流，逐一回傳每個事件的 data 欄位（同一事件多行 data 以換行串接）。"""
+    buffer: list[str] = []
+    for line in lines:
+        if not line:
+            if buffer:
+                yield "\n".join(buffer)
+                buffer = []
+            continue
+        if line.startswith("data:"):
+            value = line[5:]
+            buffer.append(value[1:] if value.startswith(" ") else value)
+    if buffer:
+        yield "\n".join(buffer)
+
+
+async def _apost_checked(url: str, **kwargs) -> httpx.Response:  # noqa: ANN003
+    resp = await get_async_http_client(url).post(url, **kwargs)
+    resp.raise_for_status()
+    return resp
 
 
 @dataclass
@@ -13,30 +70,100 @@ class LLMResult:
     latency_ms: int
     token_usage: int | None
     fallback_used: bool = False
+    # 命中回應快取時為 True；此時 latency_ms 為查快取耗時、token_usage 為 0
+    cache_hit: bool = False
+    # 首選 provider 超過 p95 仍未回應時，是否對次選 provider 送出了 hedged 請求
+    hedged: bool = False
+    # 串流呼叫時第一個 token 抵達的耗時
+    first_token_ms: int | None = None
+
+
+@dataclass
+class LLMStreamEvent:
+    """串流中的一個事件：delta 為新增文字；最後一個事件帶完整的 result。"""
+
+    delta: str = ""
+    result: LLMResult | None = None
+
+
+class LatencyTracker:
+    """每個 provider 最近 N 次呼叫的延遲，用來估 p50 / p95。"""
+
+    def __init__(self, window: int) -> None:
+        self.window = max(1, window)
+        self._samples: dict[str, deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, latency_ms: int) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(provider, deque(maxlen=self.window))
+            samples.append(max(0, int(latency_ms)))
+
+    def sample_count(self, provider: str) -> int:
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+
+    def percentile(self, provider: str, q: float) -> int | None:
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(q * (len(samples) - 1))))
+        return samples[index]
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            names = list(self._samples)
+        return {
+            name: {
+                "samples": self.sample_count(name),
+                "p50_ms": self.percentile(name, 0.5),
+                "p95_ms": self.percentile(name, 0.95),
+            }
+            for name in names
+        }
+
+
+_tracker_lock = threading.Lock()
+_tracker: LatencyTracker | None = None
+
+
+def get_latency_tracker() -> LatencyTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker(get_settings().llm_latency_window)
+        return _tracker
+
+
+def reset_latency_tracker() -> None:
+    global _tracker
+    with _tracker_lock:
+        _tracker = None
 
 
 class GeminiProvider:
+    model = "gemini-2.0-flash"
+    temperature: float | None = None
+
     def __init__(self) -> None:
         self.settings = get_settings()
 
-    def generate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+    def _request(self, system_prompt: str, user_prompt: str, stream: bool = False) -> tuple[str, dict, dict]:
         if not self.settings.gemini_api_key:
             raise RuntimeError("GEMINI_API_KEY is not configured.")
+        method = "streamGenerateContent?alt=sse&" if stream else "generateContent?"
         endpoint = (
             "https://generativelanguage.googleapis.com/v1beta/models/"
-            f"gemini-2.0-flash:generateContent?key={self.settings.gemini_api_key}"
+            f"{self.model}:{method}key={self.settings.gemini_api_key}"
         )
         payload = {
             "system_instruction": {"parts": [{"text": system_prompt}]},
             "contents": [{"parts": [{"text": user_prompt}]}],
         }
-        started = perf_counter()
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(endpoint, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-        latency_ms = int((perf_counter() - started) * 1000)
+        return endpoint, payload, {}
 
+    def _parse(self, data: dict, latency_ms: int) -> LLMResult:
         candidates = data.get("candidates", [])
         if not candidates:
             raise RuntimeError("Gemini returned no candidates.")
@@ -48,30 +175,81 @@ class GeminiProvider:
         token_usage = usage.get("totalTokenCount")
         return LLMResult(text=text, provider="GEMINI", latency_ms=latency_ms, token_usage=token_usage)
 
+    def generate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt)
+        started = perf_counter()
+        resp = call_with_resilience(
+            "GEMINI",
+            lambda: _post_checked(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        return self._parse(resp.json(), int((perf_counter() - started) * 1000))
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt)
+        started = perf_counter()
+        resp = await acall_with_resilience(
+            "GEMINI",
+            lambda: _apost_checked(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        return self._parse(resp.json(), int((perf_counter() - started) * 1000))
+
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[LLMStreamEvent]:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt, stream=True)
+        started = perf_counter()
+        resp = call_with_resilience(
+            "GEMINI",
+            lambda: _open_stream(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        parts: list[str] = []
+        token_usage = None
+        first_token_ms = None
+        try:
+            for data in iter_sse_data(resp.iter_lines()):
+                chunk = json.loads(data)
+                candidates = chunk.get("candidates") or [{}]
+                text = "".join(part.get("text", "") for part in candidates[0].get("content", {}).get("parts", []))
+                token_usage = (chunk.get("usageMetadata") or {}).get("totalTokenCount", token_usage)
+                if text:
+                    if first_token_ms is None:
+                        first_token_ms = int((perf_counter() - started) * 1000)
+                    parts.append(text)
+                    yield LLMStreamEvent(delta=text)
+        finally:
+            resp.close()
+        if not parts:
+            raise RuntimeError("Gemini returned empty text.")
+        result = LLMResult(
+            text="".join(parts),
+            provider="GEMINI",
+            latency_ms=int((perf_counter() - started) * 1000),
+            token_usage=token_usage,
+            first_token_ms=first_token_ms,
+        )
+        yield LLMStreamEvent(result=result)
+
 
 class OpenAIProvider:
+    model = "gpt-4o-mini"
+    temperature: float | None = 0.2
+
     def __init__(self) -> None:
         self.settings = get_settings()
 
-    def generate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+    def _request(self, system_prompt: str, user_prompt: str) -> tuple[str, dict, dict]:
         if not self.settings.openai_api_key:
             raise RuntimeError("OPENAI_API_KEY is not configured.")
-
         payload = {
-            "model": "gpt-4o-mini",
+            "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            "temperature": 0.2,
+            "temperature": self.temperature,
         }
         headers = {"Authorization": f"Bearer {self.settings.openai_api_key}"}
-        started = perf_counter()
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post("https://api.openai.com/v1/chat/completions", json=payload, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-        latency_ms = int((perf_counter() - started) * 1000)
+        return _OPENAI_ENDPOINT, payload, headers
+
+    def _parse(self, data: dict, latency_ms: int) -> LLMResult:
         choices = data.get("choices", [])
         if not choices:
             raise RuntimeError("OpenAI returned no choices.")
@@ -81,9 +259,71 @@ class OpenAIProvider:
         token_usage = data.get("usage", {}).get("total_tokens")
         return LLMResult(text=text, provider="OPENAI", latency_ms=latency_ms, token_usage=token_usage)
 
+    def generate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt)
+        started = perf_counter()
+        resp = call_with_resilience(
+            "OPENAI",
+            lambda: _post_checked(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        return self._parse(resp.json(), int((perf_counter() - started) * 1000))
+
+    async def agenerate(self, system_prompt: str, user_prompt: str) -> LLMResult:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt)
+        started = perf_counter()
+        resp = await acall_with_resilience(
+            "OPENAI",
+            lambda: _apost_checked(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        return self._parse(resp.json(), int((perf_counter() - started) * 1000))
+
+    def stream(self, system_prompt: str, user_prompt: str) -> Iterator[LLMStreamEvent]:
+        endpoint, payload, headers = self._request(system_prompt, user_prompt)
+        # include_usage 讓最後一個 chunk 帶回 token 用量
+        payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        started = perf_counter()
+        resp = call_with_resilience(
+            "OPENAI",
+            lambda: _open_stream(endpoint, json=payload, headers=headers, timeout=self.settings.llm_timeout_s),
+        )
+        parts: list[str] = []
+        token_usage = None
+        first_token_ms = None
+        try:
+            for data in iter_sse_data(resp.iter_lines()):
+                if data.strip() == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                token_usage = (chunk.get("usage") or {}).get("total_tokens", token_usage)
+                choices = chunk.get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content") or ""
+                if text:
+                    if first_token_ms is None:
+                        first_token_ms = int((perf_counter() - started) * 1000)
+                    parts.append(text)
+                    yield LLMStreamEvent(delta=text)
+        finally:
+            resp.close()
+        if not parts:
+            raise RuntimeError("OpenAI returned empty text.")
+        result = LLMResult(
+            text="".join(parts),
+            provider="OPENAI",
+            latency_ms=int((perf_counter() - started) * 1000),
+            token_usage=token_usage,
+            first_token_ms=first_token_ms,
+        )
+        yield LLMStreamEvent(result=result)
+
 
 class LLMRouter:
-    def __init__(self) -> None:
+    """依設定順序或延遲統計挑選 LLM provider。
+
+    interactive=True 的 router（pain / outreach 生成）在開啟 LLM_HEDGE_ENABLED 時，首選 provider
+    超過自身 p95 仍未回應就對次選 provider 送出 hedged 請求，採用先成功者並取消另一個。
+    """
+
+    def __init__(self, interactive: bool = False) -> None:
         settings = get_settings()
         configured_order = [item.strip().upper() for item in settings.llm_provider_order.split(",") if item.strip()]
         self.default_order = configured_order if configured_order else ["GEMINI", "OPENAI"]
@@ -91,6 +331,61 @@ class LLMRouter:
             "GEMINI": GeminiProvider(),
             "OPENAI": OpenAIProvider(),
         }
+        self.cache_enabled = settings.llm_cache_enabled
+        self.cache_ttl_s = settings.llm_cache_ttl_s
+        self.routing_mode = settings.llm_routing_mode.strip().lower()
+        self.hedge_enabled = interactive and settings.llm_hedge_enabled
+        self.hedge_default_delay_ms = settings.llm_hedge_delay_ms
+        self.latency_min_samples = max(1, settings.llm_latency_min_samples)
+
+    def _cache_key(self, name: str, provider, system_prompt: str, user_prompt: str) -> str:  # noqa: ANN001
+        return cache_key(
+            {
+                "provider": name,
+                "model": provider.model,
+                "temperature": provider.temperature,
+                "system_prompt": system_prompt,
+                "user_prompt": user_prompt,
+            }
+        )
+
+    def routing_order(self, preferred_order: list[str] | None = None) -> list[str]:
+        """static 模式照呼叫端指定（或設定）的順序；latency 模式下指定的 provider 只決定可用範圍，
+        範圍內依 p50 由快到慢排序（p95 只用來決定 hedge 延遲），斷路器 open 的排到最後。"""
+        order = [item.upper() for item in (preferred_order or self.default_order)]
+        order = [name for name in order if name in self.providers]
+        if self.routing_mode != ROUTING_LATENCY:
+            return order
+        tracker = get_latency_tracker()
+        healthy = [name for name in order if not get_circuit_breaker(name).is_open()]
+        tripped = [name for name in order if name not in healthy]
+        # 任一健康 provider 樣本不足時維持設定順序，讓它先累積統計
+        if all(tracker.sample_count(name) >= self.latency_min_samples for name in healthy):
+            healthy.sort(key=lambda name: tracker.percentile(name, 0.5))
+        return healthy + tripped
+
+    def _cached(self, name: str, system_prompt: str, user_prompt: str, fallback_used: bool) -> LLMResult | None:
+        if not self.cache_enabled:
+            return None
+        started = perf_counter()
+        key = self._cache_key(name, self.providers[name], system_prompt, user_prompt)
+        cached = get_llm_cache().get(key)
+        if cached is None:
+            return None
+        return LLMResult(
+            text=cached["text"],
+            provider=name,
+            latency_ms=int((perf_counter() - started) * 1000),
+            token_usage=0,
+            fallback_used=fallback_used,
+            cache_hit=True,
+        )
+
+    def _remember(self, name: str, system_prompt: str, user_prompt: str, result: LLMResult) -> None:
+        get_latency_tracker().record(name, result.latency_ms)
+        if self.cache_enabled:
+            key = self._cache_key(name, self.providers[name], system_prompt, user_prompt)
+            get_llm_cache().set(key, {"text": result.text}, ttl_seconds=self.cache_ttl_s)
 
     def generate(
         self,
@@ -98,16 +393,126 @@ class LLMRouter:
         user_prompt: str,
         preferred_order: list[str] | None = None,
     ) -> LLMResult:
-        order = [item.upper() for item in (preferred_order or self.default_order)]
+        order = self.routing_order(preferred_order)
         errors: list[str] = []
+        if self.hedge_enabled:
+            healthy = [name for name in order if not get_circuit_breaker(name).is_open()]
+            if len(healthy) >= 2:
+                primary, secondary = healthy[0], healthy[1]
+                for name in (primary, secondary):
+                    cached = self._cached(name, system_prompt, user_prompt, fallback_used=name != primary)
+                    if cached is not None:
+                        return cached
+                try:
+                    result = run_async(self._generate_hedged(primary, secondary, system_prompt, user_prompt))
+                except Exception as exc:  # noqa: BLE001
+                    errors.append(f"{primary}/{secondary} (hedged): {exc}")
+                    order = [name for name in order if name not in (primary, secondary)]
+                else:
+                    # 寫快取是 SQLite I/O，回到呼叫端執行緒再做，不佔用背景 event loop
+                    self._remember(result.provider, system_prompt, user_prompt, result)
+                    return result
+
         for name in order:
-            provider = self.providers.get(name)
-            if not provider:
+            provider = self.providers[name]
+            cached = self._cached(name, system_prompt, user_prompt, fallback_used=len(errors) > 0)
+            if cached is not None:
+                return cached
+            if get_circuit_breaker(name).is_open():
+                # 持續失敗中的 provider 直接略過，改走下一個，不再等滿逾時
+                errors.append(f"{name}: circuit open")
                 continue
             try:
-                result = provider.generate(system_prompt=system_prompt, user_prompt=user_prompt)
+                with provider_slot(name):
+                    result = provider.generate(system_prompt=system_prompt, user_prompt=user_prompt)
                 result.fallback_used = len(errors) > 0
+                self._remember(name, system_prompt, user_prompt, result)
                 return result
             except Exception as exc:  # noqa: BLE001
                 errors.append(f"{name}: {exc}")
         raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        preferred_order: list[str] | None = None,
+    ) -> Iterator[LLMStreamEvent]:
+        """串流版 generate：逐段產出文字，最後一個事件帶完整 LLMResult（同樣寫入快取與延遲統計）。
+
+        provider 在送出第一段文字前失敗時改走下一個；已送出部分內容後失敗則直接往外拋。
+        """
+        errors: list[str] = []
+        for name in self.routing_order(preferred_order):
+            cached = self._cached(name, system_prompt, user_prompt, fallback_used=len(errors) > 0)
+            if cached is not None:
+                yield LLMStreamEvent(delta=cached.text)
+                yield LLMStreamEvent(result=cached)
+                return
+            if get_circuit_breaker(name).is_open():
+                errors.append(f"{name}: circuit open")
+                continue
+            emitted = False
+            try:
+                with provider_slot(name):
+                    for event in self.providers[name].stream(system_prompt=system_prompt, user_prompt=user_prompt):
+                        if event.result is not None:
+                            event.result.fallback_used = len(errors) > 0
+                            self._remember(name, system_prompt, user_prompt, event.result)
+                        else:
+                            emitted = True
+                        yield event
+                return
+            except Exception as exc:  # noqa: BLE001
+                if emitted:
+                    raise
+                errors.append(f"{name}: {exc}")
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def hedge_delay_ms(self, provider: str) -> int:
+        """首選 provider 的 p95；樣本不足時用 LLM_HEDGE_DELAY_MS。"""
+        tracker = get_latency_tracker()
+        if tracker.sample_count(provider) >= self.latency_min_samples:
+            return tracker.percentile(provider, 0.95) or self.hedge_default_delay_ms
+        return self.hedge_default_delay_ms
+
+    async def _agenerate(self, name: str, system_prompt: str, user_prompt: str) -> LLMResult:
+        # hedged 請求同樣受 LLM_MAX_CONCURRENCY 限制，與同步路徑、批次路徑一致
+        async with async_provider_slot(name):
+            return await self.providers[name].agenerate(system_prompt, user_prompt)
+
+    async def _generate_hedged(self, primary: str, secondary: str, system_prompt: str, user_prompt: str) -> LLMResult:
+        started = perf_counter()
+        tasks = {asyncio.ensure_future(self._agenerate(primary, system_prompt, user_prompt)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay_ms(primary) / 1000)
+        hedged = not done
+        if hedged:
+            tasks[asyncio.ensure_future(self._agenerate(secondary, system_prompt, user_prompt))] = secondary
+
+        errors: list[str] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    if task.exception() is not None:
+                        errors.append(f"{name}: {task.exception()}")
+                        continue
+                    result = task.result()
+                    result.hedged = hedged
+                    result.fallback_used = name != primary
+                    return result
+                if not hedged and errors:
+                    # 首選在 hedge 延遲內就失敗，立即改送次選
+                    hedged = True
+                    task = asyncio.ensure_future(self._agenerate(secondary, system_prompt, user_prompt))
+                    tasks[task] = secondary
+                    pending.add(task)
+        finally:
+            for task in pending:
+                task.cancel()
+                if tasks[task] == primary:
+                    # 被取消的首選至少花了這麼久，計入樣本避免 p50 / p95 偏樂觀
+                    get_latency_tracker().record(primary, int((perf_counter() - started) * 1000))
+        raise RuntimeError("; ".join(errors))
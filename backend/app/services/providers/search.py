@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import re
 from dataclasses import dataclass
 from time import perf_counter
@@ -6,8 +8,13 @@ from urllib.parse import urlparse
 import httpx
 
 from app.core.config import get_settings
+from app.services.providers.cache import cache_key, get_search_cache, search_cache_ttl_seconds
+from app.services.providers.http_pool import get_async_http_client, run_async
+from app.services.providers.limits import acall_with_resilience, async_provider_slot
 from app.services.utils import parse_datetime
 
+_logger = logging.getLogger(__name__)
+
 # 對應各 region 的搜尋語言設定
 _REGION_LANG: dict[str, str] = {
     "Taiwan": "zh-TW",
@@ -130,6 +137,22 @@ def _build_company_aliases(company_name: str) -> list[str]:
     return deduped
 
 
+def _normalized_search_payload(payload: dict) -> dict:
+    """快取 key 只看影響結果的欄位；大小寫、空白與 domain 順序不同視為同一查詢。"""
+    return {
+        "query": re.sub(r"\s+", " ", str(payload.get("query", ""))).strip().lower(),
+        "topic": str(payload.get("topic", "")).lower(),
+        "include_domains": sorted({d.strip().lower() for d in payload.get("include_domains") or [] if d.strip()}),
+        "time_range": payload.get("time_range"),
+        "max_results": payload.get("max_results"),
+        "search_depth": payload.get("search_depth"),
+    }
+
+
+class SearchUnavailableError(RuntimeError):
+    """整份查詢計畫都失敗（重試後仍 429 / 5xx、斷路器 open 等），代表 provider 暫時不可用。"""
+
+
 @dataclass
 class SearchResultItem:
     title: str
@@ -146,18 +169,22 @@ class TavilySearchProvider:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.base_url = "https://api.tavily.com/search"
+        # 預設是否使用搜尋快取；單次掃描改以 search_company_signals(use_cache=False) 覆寫，不修改這個共用狀態
+        self.use_cache = self.settings.search_cache_enabled
 
     def _source_name(self, url: str) -> str:
         netloc = urlparse(url).netloc
         return netloc.replace("www.", "")
 
-    def _do_search(
+    async def _do_search(
         self,
+        client: httpx.AsyncClient,
         query: str,
         lookback_days: int,
         max_results: int,
         topic: str = "news",
         include_domains: list[str] | None = None,
+        use_cache: bool = True,
     ) -> tuple[list[dict], int]:
         """執行一次 Tavily 搜尋，回傳 (results_list, latency_ms)。"""
         payload: dict = {
@@ -172,13 +199,54 @@ class TavilySearchProvider:
         }
         if include_domains:
             payload["include_domains"] = include_domains
-        started = perf_counter()
-        with httpx.Client(timeout=30.0) as client:
-            resp = client.post(self.base_url, json=payload)
+
+        key = None
+        if use_cache:
+            key = cache_key(_normalized_search_payload(payload))
+            # 快取是 SQLite 檔，讀寫丟到執行緒，不讓磁碟 I/O 與鎖等待卡住背景 event loop 上的其他請求
+            cached = await asyncio.to_thread(lambda: get_search_cache().get(key))
+            if cached is not None:
+                return cached, 0
+
+        latency_ms = 0
+
+        async def post():  # noqa: ANN202
+            # 只量 HTTP 請求本身；等並行名額、token bucket 與重試退避是本地排隊，不算 provider 延遲
+            nonlocal latency_ms
+            started = perf_counter()
+            resp = await client.post(self.base_url, json=payload, timeout=30.0)
+            latency_ms = int((perf_counter() - started) * 1000)
             resp.raise_for_status()
-            data = resp.json()
-        latency_ms = int((perf_counter() - started) * 1000)
-        return data.get("results", []), latency_ms
+            return resp
+
+        # 並行上限以單一請求計算，TAVILY_MAX_CONCURRENCY 即同時在途的 Tavily 請求數
+        async with async_provider_slot("TAVILY"):
+            resp = await acall_with_resilience("TAVILY", post)
+        data = resp.json()
+        results = data.get("results", [])
+        if key is not None:
+            ttl_seconds = search_cache_ttl_seconds(lookback_days)
+            await asyncio.to_thread(lambda: get_search_cache().set(key, results, ttl_seconds=ttl_seconds))
+        return results, latency_ms
+
+    async def _run_query_plan(
+        self,
+        queries: list[tuple[str, str, list[str] | None, int]],
+        lookback_days: int,
+        use_cache: bool = True,
+    ) -> list[tuple[list[dict], int] | BaseException]:
+        """同時送出整份查詢計畫；回傳順序與 queries 一致，失敗的查詢以例外物件佔位。"""
+        client = get_async_http_client(self.base_url)
+        return await asyncio.gather(
+            *(
+                self._do_search(
+                    client, query, lookback_days, query_max,
+                    topic=topic, include_domains=domains, use_cache=use_cache,
+                )
+                for query, topic, domains, query_max in queries
+            ),
+            return_exceptions=True,
+        )
 
     def search_company_signals(
         self,
@@ -187,7 +255,9 @@ class TavilySearchProvider:
         lookback_days: int,
         max_results: int,
         region: str = "",
+        use_cache: bool | None = None,
     ) -> list[SearchResultItem]:
+        """use_cache=None 時依 self.use_cache；傳 False 可在單次掃描略過搜尋快取。"""
         if not self.settings.tavily_api_key:
             raise RuntimeError("TAVILY_API_KEY is required for market radar search.")
 
@@ -288,42 +358,47 @@ class TavilySearchProvider:
             )
         )
 
-        # 合併兩次搜尋，依 URL 去重
+        # 查詢彼此獨立，並行送出；合併時仍依查詢計畫順序，依 URL 去重
+        if use_cache is None:
+            use_cache = self.use_cache
+        outcomes = run_async(self._run_query_plan(queries, lookback_days, use_cache=use_cache))
+
         seen_urls: set[str] = set()
         results: list[SearchResultItem] = []
         total_latency = 0
 
-        for query, topic, domains, query_max in queries:
-            try:
-                raw_items, latency_ms = self._do_search(
-                    query, lookback_days, query_max,
-                    topic=topic, include_domains=domains,
-                )
-                total_latency += latency_ms
-                for item in raw_items:
-                    url = item.get("url") or ""
-                    if not url or url in seen_urls:
-                        continue
-                    seen_urls.add(url)
-                    title = item.get("title") or ""
-                    snippet = item.get("content") or ""
-                    published_raw = item.get("published_date")
-                    published_at = parse_datetime(published_raw)
-                    results.append(
-                        SearchResultItem(
-                            title=title,
-                            url=url,
-                            snippet=snippet,
-                            source_name=self._source_name(url) if url else None,
-                            published_at=published_at.isoformat() if published_at else None,
-                            provider="TAVILY",
-                            latency_ms=total_latency,
-                            fallback_used=False,
-                        )
-                    )
-            except httpx.HTTPStatusError:
-                # 其中一個查詢失敗，繼續另一個
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if failures and len(failures) == len(outcomes):
+            # 整份查詢計畫都失敗時往外拋，不回傳空結果假裝沒有訊號；由掃描端記成該帳戶的錯誤
+            raise SearchUnavailableError(f"All Tavily queries failed for {company_name}: {failures[0]}") from failures[0]
+        for outcome, (query, _, _, _) in zip(outcomes, queries):
+            if isinstance(outcome, BaseException):
+                # 部分查詢失敗時保留其餘結果，但留下紀錄
+                _logger.warning("Tavily query failed for %s: %s (%s)", company_name, outcome, query[:80])
                 continue
+            raw_items, latency_ms = outcome
+            total_latency = max(total_latency, latency_ms)
+            for item in raw_items:
+                url = item.get("url") or ""
+                if not url or url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                title = item.get("title") or ""
+                snippet = item.get("content") or ""
+                published_raw = item.get("published_date")
+                published_at = parse_datetime(published_raw)
+                results.append(
+                    SearchResultItem(
+                        title=title,
+                        url=url,
+                        snippet=snippet,
+                        source_name=self._source_name(url) if url else None,
+                        published_at=published_at.isoformat() if published_at else None,
+                        provider="TAVILY",
+                        latency_ms=total_latency,
+                        fallback_used=False,
+                    )
+                )
 
         # Return a wider candidate pool; downstream market_radar will rank/filter and cap.
         candidate_cap = max(max_results * 4, 12)
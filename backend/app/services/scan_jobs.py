@@ -0,0 +1,229 @@
+import json
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import ScanJob
+from app.services.market_radar import MarketRadarService, SignalWriteCounts
+from app.services.utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class ScanJobService:
+    def create_job(
+        self,
+        db: Session,
+        account_ids: list[int],
+        lookback_days: int,
+        max_results_per_account: int,
+        concurrency: int | None,
+        bypass_search_cache: bool,
+        use_tavily: bool = True,
+        incremental: bool = True,
+    ) -> ScanJob:
+        if not use_tavily:
+            raise ValueError("Market radar requires Tavily. Set use_tavily=true.")
+        unique_ids = list(dict.fromkeys(account_ids))
+        job = ScanJob(
+            id=f"scan_{uuid4().hex}",
+            status=JOB_QUEUED,
+            account_ids=json.dumps(unique_ids),
+            lookback_days=lookback_days,
+            max_results_per_account=max_results_per_account,
+            concurrency=concurrency,
+            bypass_search_cache=int(bypass_search_cache),
+            incremental=int(incremental),
+            accounts_total=len(unique_ids),
+            accounts_processed=0,
+            events_created=0,
+            events_updated=0,
+            progress=json.dumps({str(account_id): {"status": JOB_QUEUED} for account_id in unique_ids}),
+            created_at=now_utc(),
+        )
+        db.add(job)
+        db.commit()
+        return job
+
+    def run_job(self, db: Session, job_id: str, continue_on_error: bool = True) -> ScanJob:
+        """執行 job 並逐帳戶回寫進度；continue_on_error=False 時第一個錯誤即標記失敗並往外拋。"""
+        job = db.get(ScanJob, job_id)
+        if job is None:
+            raise ValueError(f"Scan job {job_id} not found.")
+
+        progress = json.loads(job.progress or "{}")
+        job.status = JOB_RUNNING
+        job.started_at = now_utc()
+        db.commit()
+
+        def on_account_done(account_id: int, counts: SignalWriteCounts, error: str | None) -> None:
+            entry = {
+                "status": JOB_FAILED if error else JOB_COMPLETED,
+                "events_written": counts.created + counts.updated,
+                "events_created": counts.created,
+                "events_updated": counts.updated,
+            }
+            if error:
+                entry["error"] = error
+            progress[str(account_id)] = entry
+            job.accounts_processed += 1
+            job.events_created += counts.created
+            job.events_updated += counts.updated
+            job.progress = json.dumps(progress)
+            db.commit()
+
+        try:
+            MarketRadarService().scan(
+                db=db,
+                account_ids=json.loads(job.account_ids),
+                lookback_days=job.lookback_days,
+                max_results_per_account=job.max_results_per_account,
+                use_tavily=True,
+                concurrency=job.concurrency,
+                bypass_search_cache=bool(job.bypass_search_cache),
+                on_account_done=on_account_done,
+                continue_on_error=continue_on_error,
+                incremental=bool(job.incremental),
+            )
+        except Exception as exc:  # noqa: BLE001
+            db.rollback()
+            job.status = JOB_FAILED
+            job.error = str(exc) or exc.__class__.__name__
+            job.finished_at = now_utc()
+            db.commit()
+            if not continue_on_error:
+                raise
+            logger.exception("scan job %s failed", job_id)
+            return job
+
+        # 資料庫中找不到的帳戶不會觸發 callback，收尾時標記為 skipped
+        for entry in progress.values():
+            if entry.get("status") == JOB_QUEUED:
+                entry["status"] = "skipped"
+        job.progress = json.dumps(progress)
+        job.status = JOB_COMPLETED
+        job.finished_at = now_utc()
+        db.commit()
+        return job
+
+    def get_job(self, db: Session, job_id: str) -> ScanJob | None:
+        return db.get(ScanJob, job_id)
+
+    def fail_orphaned_jobs(self, db: Session) -> int:
+        """把上次行程遺留的 queued / running job 標記為 failed 並回傳筆數。
+
+        只在啟動、worker 尚未開始前呼叫。
+        """
+        jobs = (
+            db.execute(
+                select(ScanJob)
+                .where(ScanJob.status.in_([JOB_QUEUED, JOB_RUNNING]))
+                .order_by(ScanJob.created_at)
+            )
+            .scalars()
+            .all()
+        )
+        if not jobs:
+            return 0
+        message = "Server restarted before the scan job finished."
+        finished_at = now_utc()
+        for job in jobs:
+            progress = json.loads(job.progress or "{}")
+            for entry in progress.values():
+                if entry.get("status") in (JOB_QUEUED, JOB_RUNNING):
+                    entry["status"] = JOB_FAILED
+                    entry["error"] = message
+            job.progress = json.dumps(progress)
+            job.status = JOB_FAILED
+            job.error = message
+            job.finished_at = finished_at
+        db.commit()
+        logger.warning("marked %d orphaned scan jobs as failed", len(jobs))
+        return len(jobs)
+
+
+class ScanJobQueue:
+    """行程內的 job 佇列；worker 執行緒各自開 session 執行 ScanJobService.run_job。"""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, workers)
+        self._queue: queue.Queue[tuple[Callable[[], Session], str] | None] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, session_factory: Callable[[], Session], job_id: str) -> None:
+        self._ensure_workers()
+        self._queue.put((session_factory, job_id))
+
+    def join(self) -> None:
+        """等待目前佇列中的 job 全部執行完畢。"""
+        self._queue.join()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=timeout)
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"scan-job-{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        service = ScanJobService()
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                session_factory, job_id = item
+                db = session_factory()
+                try:
+                    service.run_job(db, job_id)
+                except Exception:  # noqa: BLE001
+                    logger.exception("scan job %s crashed", job_id)
+                finally:
+                    db.close()
+            finally:
+                self._queue.task_done()
+
+
+_job_queue: ScanJobQueue | None = None
+_job_queue_lock = threading.Lock()
+
+
+def get_scan_job_queue() -> ScanJobQueue:
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = ScanJobQueue(workers=get_settings().scan_job_workers)
+        return _job_queue
+
+
+def shutdown_scan_job_queue() -> None:
+    global _job_queue
+    with _job_queue_lock:
+        job_queue, _job_queue = _job_queue, None
+    if job_queue is not None:
+        job_queue.shutdown()
@@ -1,11 +1,39 @@
 import json
+from collections.abc import AsyncIterator, Iterator
 from datetime import UTC, datetime
 
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
 
 def now_utc() -> datetime:
     return datetime.now(UTC)
 
 
+def sse_event(event: str, data: dict) -> bytes:
+    """編成一個 Server-Sent Events 事件；data 以單行 JSON 輸出。"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+async def sse_stream(request: Request, events: Iterator[tuple[str, dict]]) -> AsyncIterator[bytes]:
+    """把同步的 (event, data) generator 轉成 SSE；例外改送 event: error。
+
+    每段之間檢查連線，斷線或結束時一律 close() generator，讓其中佔用的 provider 名額與上游串流立即釋放，
+    不必等 GC 或上游自行結束。
+    """
+    try:
+        while not await request.is_disconnected():
+            item = await run_in_threadpool(next, events, None)
+            if item is None:
+                return
+            yield sse_event(*item)
+    except Exception as exc:  # noqa: BLE001
+        yield sse_event("error", {"detail": str(exc)})
+    finally:
+        events.close()
+
+
 def parse_datetime(value: str | None) -> datetime | None:
     if not value:
         return None
@@ -0,0 +1,169 @@
+"""比較市場雷達過濾器：逐條 re.search 的舊寫法 vs 預編譯 / 合併 alternation 的新寫法。
+
+用法（於 backend/ 目錄）：
+    PYTHONPATH=. python scripts/bench_radar_matchers.py --rounds 2000
+"""
+
+import argparse
+import re
+import timeit
+
+from app.services.market_radar import (
+    _EXPANSION_SIGNAL_MAP,
+    _HIGH_VALUE_RES,
+    _HIGH_VALUE_TERMS,
+    _HIRING_NO_OPENINGS_RE,
+    _HIRING_NO_OPENINGS_PATTERNS,
+    _HIRING_OPENINGS_PATTERNS,
+    _LATIN_STOPWORDS,
+    _LOW_VALUE_TEXT_PATTERNS,
+    _LOW_VALUE_URL_PATTERNS,
+    _PAIN_POINT_MAP,
+    CompanyNameMatcher,
+    _extract_name_variants,
+    extract_hiring_openings_count,
+    extract_jd_tech_signals,
+    is_low_value_signal,
+)
+
+SAMPLE_ITEMS = [
+    (
+        "玉晶光 (GSEO) 擴產 AI眼鏡 鏡頭 出貨",
+        "Genius Electronic Optical 宣布擴產並增加資本支出，AR 光學模組訂單成長，營收創新高。",
+        "https://news.example.com/gseo-capex",
+    ),
+    (
+        "TSMC advanced packaging CoWoS capacity expansion",
+        "Taiwan Semiconductor Manufacturing plans new fab expansion; capex guidance raised on AI demand.",
+        "https://www.digitimes.com/news/a20260101",
+    ),
+    (
+        "104 人力銀行｜大立光 工作機會(35)",
+        "大立光 徵才中，製程工程師、設備工程師 多名，工作地點台中。",
+        "https://www.104.com.tw/company/abc123",
+    ),
+    (
+        "公司簡介 - MoneyDJ 理財網",
+        "公開發行公司資金貸與及背書保證處理準則 公司基本資料",
+        "https://www.moneydj.com/kmdj/wiki/wikiviewer.aspx?keyid=123",
+    ),
+]
+SAMPLE_JD = (
+    "職務內容：負責 CoWoS / HBM packaging 製程良率提升，導入 AOI 缺陷檢測與 SPC 製程監控；"
+    "協助新廠 fab expansion 設備採購，推動 smart factory 與 machine learning 應用。"
+    "Director of process engineering, actively hiring 多名 yield engineer, international BD support."
+)
+COMPANY_NAMES = ["玉晶光 (GSEO)", "Taiwan Semiconductor Manufacturing", "大立光 (Largan)", "ASE Technology"]
+
+
+# ---- 舊寫法（基準） ----
+
+def legacy_extract_jd_tech_signals(jd_text: str) -> dict:
+    pain_points = [label for pattern, label in _PAIN_POINT_MAP if re.search(pattern, jd_text)]
+    expansion = [label for pattern, label in _EXPANSION_SIGNAL_MAP if re.search(pattern, jd_text)]
+    return {"pain_points": pain_points, "expansion_signals": expansion, "has_jd": True}
+
+
+def legacy_is_low_value_signal(title: str, snippet: str, url: str) -> bool:
+    text = f"{title} {snippet}"
+    if any(re.search(pattern, text, flags=re.IGNORECASE) for pattern in _LOW_VALUE_TEXT_PATTERNS):
+        return True
+    return any(re.search(pattern, url, flags=re.IGNORECASE) for pattern in _LOW_VALUE_URL_PATTERNS)
+
+
+def legacy_high_value_hits(text: str) -> int:
+    return sum(1 for pattern in _HIGH_VALUE_TERMS if re.search(pattern, text, flags=re.IGNORECASE))
+
+
+def legacy_extract_hiring_openings_count(text: str) -> int | None:
+    for pattern in _HIRING_OPENINGS_PATTERNS:
+        match = re.search(pattern, text, flags=re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def legacy_has_no_openings(text: str) -> bool:
+    return any(re.search(pattern, text.lower(), flags=re.IGNORECASE) for pattern in _HIRING_NO_OPENINGS_PATTERNS)
+
+
+def _legacy_normalize_latin(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9]+", " ", text.lower())).strip()
+
+
+def legacy_is_relevant_to_company(text: str, name_variants: list[str], url: str | None = None) -> bool:
+    raw = f"{text or ''} {url or ''}".lower()
+    normalized = _legacy_normalize_latin(raw)
+    for variant in name_variants:
+        candidate = (variant or "").strip().lower()
+        if not candidate:
+            continue
+        if re.search(r"[一-鿿]", candidate):
+            if candidate in raw:
+                return True
+            continue
+        tokens = [tok for tok in _legacy_normalize_latin(candidate).split(" ") if tok]
+        if not tokens:
+            continue
+        if len(tokens) == 1 and len(tokens[0]) <= 6:
+            if re.search(rf"(?<![a-z0-9]){re.escape(tokens[0])}(?![a-z0-9])", raw):
+                return True
+            continue
+        phrase = " ".join(tokens)
+        if phrase in normalized:
+            return True
+        compact_phrase = phrase.replace(" ", "")
+        if len(compact_phrase) >= 8 and compact_phrase in normalized.replace(" ", ""):
+            return True
+        meaningful = [tok for tok in tokens if tok not in _LATIN_STOPWORDS and len(tok) >= 3]
+        if len(meaningful) >= 2 and all(
+            re.search(rf"(?<![a-z0-9]){re.escape(tok)}(?![a-z0-9])", normalized) for tok in meaningful[:3]
+        ):
+            return True
+    return False
+
+
+def legacy_pass(variants_by_company: list[list[str]]) -> list:
+    out = [legacy_extract_jd_tech_signals(SAMPLE_JD)]
+    for title, snippet, url in SAMPLE_ITEMS:
+        combined = f"{title} {snippet}"
+        out.append(legacy_is_low_value_signal(title, snippet, url))
+        out.append((legacy_high_value_hits(title), legacy_high_value_hits(snippet)))
+        out.append((legacy_extract_hiring_openings_count(combined), legacy_has_no_openings(combined)))
+        out.extend(legacy_is_relevant_to_company(combined, variants, url) for variants in variants_by_company)
+    return out
+
+
+def compiled_pass(matchers: list[CompanyNameMatcher]) -> list:
+    out = [extract_jd_tech_signals(SAMPLE_JD)]
+    for title, snippet, url in SAMPLE_ITEMS:
+        combined = f"{title} {snippet}"
+        out.append(is_low_value_signal(title, snippet, url))
+        out.append(tuple(sum(1 for pattern in _HIGH_VALUE_RES if pattern.search(text)) for text in (title, snippet)))
+        out.append((extract_hiring_openings_count(combined), bool(_HIRING_NO_OPENINGS_RE.search(combined.lower()))))
+        out.extend(matcher.matches(combined, url) for matcher in matchers)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    variants_by_company = [_extract_name_variants(name) for name in COMPANY_NAMES]
+    matchers = [CompanyNameMatcher(variants) for variants in variants_by_company]
+
+    # 結果必須與舊寫法一致，速度比較才有意義
+    assert legacy_pass(variants_by_company) == compiled_pass(matchers), "compiled matchers diverge from legacy"
+
+    legacy_s = timeit.timeit(lambda: legacy_pass(variants_by_company), number=args.rounds)
+    compiled_s = timeit.timeit(lambda: compiled_pass(matchers), number=args.rounds)
+    per_round = lambda seconds: seconds / args.rounds * 1e6  # noqa: E731
+    print(f"rounds={args.rounds} items/round={len(SAMPLE_ITEMS)} companies={len(COMPANY_NAMES)}")
+    print(f"legacy   : {legacy_s:.3f}s ({per_round(legacy_s):.1f} us/round)")
+    print(f"compiled : {compiled_s:.3f}s ({per_round(compiled_s):.1f} us/round)")
+    print(f"speedup  : {legacy_s / compiled_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
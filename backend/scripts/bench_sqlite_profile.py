@@ -0,0 +1,134 @@
+"""比較 SQLite 預設設定 vs 調校設定（WAL / synchronous=NORMAL / busy_timeout / 唯讀連線池）在並行讀寫下的吞吐量。
+
+模擬掃描 worker 寫入 signal_events、UI 同時讀取帳戶訊號列表；每種設定使用獨立的暫存資料庫。
+
+用法（於 backend/ 目錄）：
+    PYTHONPATH=. python scripts/bench_sqlite_profile.py --writers 4 --readers 8 --seconds 5
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.db.session import build_engine
+from app.models import Account, Base, SignalEvent
+
+ACCOUNTS = 50
+
+
+def _seed(engine) -> None:  # noqa: ANN001
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(UTC)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Account),
+            [
+                {"company_name": f"Bench Co {i}", "segment": "WAFER_FAB", "created_at": now, "updated_at": now}
+                for i in range(ACCOUNTS)
+            ],
+        )
+
+
+def run_profile(name: str, settings: Settings, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        write_engine = build_engine(url, settings)
+        read_engine = build_engine(url, settings, read_only=True) if settings.sqlite_tuning_enabled else write_engine
+        _seed(write_engine)
+
+        counters = {"writes": 0, "reads": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.seconds
+
+        def bump(key: str) -> None:
+            with lock:
+                counters[key] += 1
+
+        def writer(worker: int) -> None:
+            seq = 0
+            while time.perf_counter() < deadline:
+                seq += 1
+                rows = [
+                    {
+                        "account_id": (worker * 7 + seq + i) % ACCOUNTS + 1,
+                        "signal_type": "CAPEX",
+                        "signal_strength": (seq + i) % 100,
+                        "summary": "bench",
+                        "evidence_url": f"https://bench.example/{worker}/{seq}/{i}",
+                        "search_fallback_used": 0,
+                        "fetched_at": datetime.now(UTC),
+                    }
+                    for i in range(args.batch)
+                ]
+                try:
+                    with write_engine.begin() as conn:
+                        conn.execute(insert(SignalEvent), rows)
+                    bump("writes")
+                except OperationalError:
+                    bump("locked")
+
+        def reader(worker: int) -> None:
+            seq = 0
+            while time.perf_counter() < deadline:
+                seq += 1
+                stmt = (
+                    select(SignalEvent.id, SignalEvent.signal_strength)
+                    .where(SignalEvent.account_id == (worker + seq) % ACCOUNTS + 1)
+                    .order_by(SignalEvent.fetched_at.desc())
+                    .limit(20)
+                )
+                try:
+                    with read_engine.connect() as conn:
+                        conn.execute(stmt).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("locked")
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        threads += [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        write_engine.dispose()
+        read_engine.dispose()
+
+    return {
+        "profile": name,
+        "writes_per_s": counters["writes"] / elapsed,
+        "reads_per_s": counters["reads"] / elapsed,
+        "locked_errors": counters["locked"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=20, help="rows per write transaction")
+    args = parser.parse_args()
+
+    # baseline：沿用 SQLite 預設（rollback journal、synchronous=FULL、pysqlite 5 秒鎖等待），讀寫共用同一連線池
+    baseline = Settings(_env_file=None, sqlite_tuning_enabled=False)
+    tuned = Settings(_env_file=None)
+    print(f"writers={args.writers} readers={args.readers} seconds={args.seconds} batch={args.batch}")
+    for name, settings in (("default", baseline), ("tuned", tuned)):
+        result = run_profile(name, settings, args)
+        print(
+            f"{result['profile']:<8}: writes {result['writes_per_s']:8.1f} tx/s | "
+            f"reads {result['reads_per_s']:8.1f} q/s | locked errors {result['locked_errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
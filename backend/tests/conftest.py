@@ -6,9 +6,31 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.session import get_db
+from app.core.config import get_settings
+from app.db.session import get_db, get_read_db
 from app.main import app
 from app.models import Account, Base, Contact
+from app.services.providers.cache import close_response_caches
+from app.services.providers.limits import reset_provider_limits
+from app.services.providers.llm import reset_latency_tracker
+
+
+@pytest.fixture(autouse=True)
+def isolated_provider_cache(tmp_path, monkeypatch):
+    # 快取檔寫到暫存目錄，避免測試污染 backend/.cache 或讀到上次的結果
+    monkeypatch.setattr(get_settings(), "provider_cache_path", str(tmp_path / "provider_cache.sqlite3"))
+    # 測試不啟動 clients.csv watcher，避免背景執行緒寫入實際資料庫
+    monkeypatch.setattr(get_settings(), "clients_csv_sync_interval_s", 0)
+    # 啟動時的 scan job 復原同樣會連到實際資料庫，由測試個別觸發
+    monkeypatch.setattr(get_settings(), "scan_job_recover_on_startup", False)
+    close_response_caches()
+    # 斷路器與限流狀態是模組層級的，每個測試重新開始
+    reset_provider_limits()
+    reset_latency_tracker()
+    yield
+    close_response_caches()
+    reset_provider_limits()
+    reset_latency_tracker()
 
 
 @pytest.fixture(scope="session")
@@ -48,6 +70,7 @@ def client(engine):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -1,3 +1,9 @@
+import os
+
+from app.services import csv_utils
+from app.services.csv_utils import sync_csv_to_db
+
+
 def test_accounts_crud(client):
     create_resp = client.post(
         "/api/v1/accounts",
@@ -120,3 +126,65 @@ def test_accounts_import_api(client):
     assert response_update.status_code == 200
     payload_update = response_update.json()
     assert payload_update["updated"] == 1
+
+
+def test_clients_csv_sync_detects_changes_and_applies_diff(client, db_session, tmp_path, monkeypatch):
+    csv_path = tmp_path / "clients.csv"
+    header = "id,company_name,segment,region,website,source,priority_tier\n"
+    csv_path.write_text(
+        header + "501,Sync Optics,ar_vr,Taiwan,https://sync.example,manual,T1\n"
+        "502,Sync Lidar,LIDAR_3D,China,,import,T2\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(csv_utils, "CLIENTS_CSV", csv_path)
+
+    first = client.post("/api/v1/accounts/sync").json()
+    assert (first["status"], first["inserted"], first["updated"]) == ("synced", 2, 0)
+    assert client.post("/api/v1/accounts/sync").json()["status"] == "skipped"
+
+    # 只 touch 不改內容：mtime 變了但 hash 相同，仍略過
+    os.utime(csv_path, ns=(csv_path.stat().st_atime_ns, csv_path.stat().st_mtime_ns + 5_000_000_000))
+    assert sync_csv_to_db(db_session)["status"] == "skipped"
+
+    csv_path.write_text(
+        header + "501,Sync Optics,AR_VR,Taiwan,https://sync.example,manual,T1\n"
+        "502,Sync Lidar,LIDAR_3D,China,,import,T1\n"
+        "503,Sync Fab,WAFER_FAB,Japan,,import,T3\n",
+        encoding="utf-8",
+    )
+    os.utime(csv_path, ns=(csv_path.stat().st_atime_ns, csv_path.stat().st_mtime_ns + 10_000_000_000))
+    changed = client.post("/api/v1/accounts/sync").json()
+    assert (changed["inserted"], changed["updated"], changed["unchanged"]) == (1, 1, 1)
+    assert client.get("/api/v1/accounts/502").json()["priority_tier"] == "T1"
+    assert client.post("/api/v1/accounts/sync", params={"force": True}).json()["unchanged"] == 3
+
+
+def test_accounts_import_csv_stream_batches_and_dedupes(client, db_session):
+    from sqlalchemy import func, select
+
+    from app.models import Account
+    from app.services.account_importer import AccountImportService, iter_account_csv_rows
+
+    client.post("/api/v1/accounts/import", json={"items": [{"company_name": "Bulk Co 0", "segment": "CAMERA"}]})
+    body = "company_name,segment,region,priority_tier\n" + "".join(
+        f"Bulk Co {i},wafer_fab,TW,T2\n" for i in range(5)
+    ) + "Bulk Co 3,lidar_3d,US,T1\n,missing,,\n"
+    response = client.post(
+        "/api/v1/accounts/import/csv", content=body.encode("utf-8"), headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["inserted"], payload["updated"], payload["total_rows"]) == (4, 2, 6)
+    assert db_session.scalar(select(func.count()).where(Account.company_name.like("Bulk Co %"))) == 5
+    bulk_co_3 = db_session.execute(select(Account).where(Account.company_name == "Bulk Co 3")).scalar_one()
+    assert (bulk_co_3.segment, bulk_co_3.priority_tier, bulk_co_3.source) == ("LIDAR_3D", "T1", "api_import")
+
+    # 跨批次的重複名稱也要命中剛新增的那筆
+    rerun = AccountImportService(batch_size=2).import_rows(
+        db_session,
+        iter_account_csv_rows(["company_name,segment\n", "Bulk Co 9,CAMERA\n", "Bulk Co 1,CAMERA\n", "Bulk Co 9,LIDAR_3D\n"]),
+    )
+    assert (rerun["inserted"], rerun["updated"]) == (1, 2)
+
+    bad = client.post("/api/v1/accounts/import/csv", content=b"name,segment\nX,Y\n")
+    assert bad.status_code == 400
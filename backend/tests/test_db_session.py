@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.db.session import build_engine, sqlite_pragmas
+
+
+def test_sqlite_file_engines_apply_tuning_profile_and_read_only_pool(tmp_path):
+    settings = Settings(_env_file=None, sqlite_busy_timeout_ms=1234, db_read_pool_size=3)
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    write_engine = build_engine(url, settings)
+    read_engine = build_engine(url, settings, read_only=True)
+    try:
+        with write_engine.begin() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+
+        assert read_engine.pool.size() == 3
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO t (id) VALUES (2)"))
+    finally:
+        write_engine.dispose()
+        read_engine.dispose()
+
+    assert sqlite_pragmas(Settings(_env_file=None, sqlite_tuning_enabled=False)) == []
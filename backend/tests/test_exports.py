@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta
+
+from app.models import SignalEvent
+
+
+def test_exports_stream_ndjson_and_csv_with_filters(client, db_session, seeded_contact):
+    account_id = seeded_contact["account_id"]
+    now = datetime.now(UTC)
+    for index in range(5):
+        db_session.add(
+            SignalEvent(
+                account_id=account_id,
+                signal_type="CAPEX" if index % 2 else "HIRING",
+                signal_strength=40 + index * 10,
+                summary=f"export {index}",
+                evidence_url=f"https://export.example/{index}",
+                search_fallback_used=0,
+                fetched_at=now - timedelta(days=index),
+            )
+        )
+    db_session.commit()
+
+    response = client.get("/api/v1/exports/signals", params={"format": "ndjson", "signal_type": "capex"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["summary"] for row in rows] == ["export 3", "export 1"]
+
+    since = (now - timedelta(days=2, hours=1)).isoformat()
+    csv_response = client.get("/api/v1/exports/signals", params={"format": "csv", "since": since, "min_strength": 50})
+    csv_rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+    assert [row["summary"] for row in csv_rows] == ["export 2", "export 1"]
+    assert "attachment" in csv_response.headers["content-disposition"]
+
+    logged = client.post(
+        "/api/v1/interactions/log",
+        json={
+            "contact_id": seeded_contact["contact_id"],
+            "channel": "EMAIL",
+            "direction": "INBOUND",
+            "content_summary": "hello there",
+        },
+    )
+    assert logged.status_code == 200, logged.text
+    interactions = client.get("/api/v1/exports/interactions", params={"account_id": account_id}).text.splitlines()
+    assert len(interactions) == 1 and json.loads(interactions[0])["direction"] == "INBOUND"
+
+    assert client.get("/api/v1/exports/interactions", params={"persona": "RD"}).status_code == 400
+    assert client.get("/api/v1/exports/bogus").status_code == 422
@@ -14,3 +14,16 @@ def test_error_payload_contains_code_and_request_id(client):
     assert payload["error"]["code"] == "HTTP_404"
     assert payload["request_id"]
     assert response.headers.get("X-Request-ID")
+
+
+def test_http_pool_reuses_client_per_host_and_recreates_after_close():
+    from app.services.providers.http_pool import close_http_clients, get_http_client
+
+    first = get_http_client("https://api.openai.com/v1/chat/completions")
+    assert get_http_client("https://api.openai.com/v1/models") is first
+    assert get_http_client("https://api.tavily.com/search") is not first
+
+    close_http_clients()
+    assert first.is_closed
+    assert get_http_client("https://api.openai.com/v1/chat/completions") is not first
+    close_http_clients()
@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+
+from app.core.config import get_settings
+from app.services import jd_enricher as jd_module
+from app.services.jd_enricher import JDEnricher, jd_request_for
+from app.services.providers.limits import reset_provider_limits
+
+_104_PAYLOAD = {
+    "data": {
+        "header": {"jobName": "製程工程師"},
+        "jobDetail": {"jobDescription": "負責 CoWoS 先進封裝良率提升與 AOI 缺陷檢測"},
+        "condition": {"skill": [{"description": "SPC"}]},
+    }
+}
+
+
+class FakeJDClient:
+    """依 URL 回傳預先設定的回應，並記錄請求與同時進行中的請求數。"""
+
+    def __init__(self, responses: dict[str, list[httpx.Response]]) -> None:
+        self.responses = responses
+        self.calls: list[tuple[str, dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, headers=None, timeout=None):  # noqa: ANN001
+        self.calls.append((url, dict(headers or {})))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            response = self.responses[url].pop(0)
+            if isinstance(response, Exception):
+                raise response
+            response.request = httpx.Request("GET", url)
+            return response
+        finally:
+            self.in_flight -= 1
+
+
+def _install(monkeypatch, client: FakeJDClient) -> None:  # noqa: ANN001
+    monkeypatch.setattr(jd_module, "get_async_http_client", lambda url: client)
+    monkeypatch.setattr(get_settings(), "jd_fetch_rate_per_s", 1000.0)
+    monkeypatch.setattr(get_settings(), "provider_max_retries", 0)
+    reset_provider_limits()
+
+
+def test_jd_request_keys_104_jobs_by_id():
+    first = jd_request_for("https://www.104.com.tw/job/7abcd?jobsource=search")
+    second = jd_request_for("https://www.104.com.tw/job/7abcd")
+    assert first.cache_key == second.cache_key == "104:7abcd"
+    assert first.fetch_url == "https://www.104.com.tw/job/ajax/content/7abcd"
+    assert jd_request_for("https://news.example.com/a") is None
+
+
+def test_enrich_fetches_concurrently_and_serves_repeat_scans_from_cache(monkeypatch):
+    urls = [f"https://www.104.com.tw/job/a{i}" for i in range(4)]
+    client = FakeJDClient(
+        {
+            jd_request_for(url).fetch_url: [httpx.Response(200, json=_104_PAYLOAD, headers={"ETag": f'"v{i}"'})]
+            for i, url in enumerate(urls)
+        }
+    )
+    _install(monkeypatch, client)
+    monkeypatch.setattr(get_settings(), "jd_fetch_max_concurrency", 2)
+    # 重新建立並行名額，才會套用當下的並行設定
+    reset_provider_limits()
+
+    texts = JDEnricher().enrich(urls + [urls[0] + "?jobsource=hot"])
+    assert len(client.calls) == 4
+    assert client.max_in_flight == 2
+    assert all("CoWoS" in texts[url] for url in urls)
+    assert texts[urls[0] + "?jobsource=hot"] == texts[urls[0]]
+
+    again = JDEnricher().enrich(urls)
+    assert len(client.calls) == 4
+    assert again == {url: texts[url] for url in urls}
+
+
+def test_enrich_revalidates_stale_entries_with_etag(monkeypatch):
+    url = "https://www.104.com.tw/job/etag1"
+    fetch_url = jd_request_for(url).fetch_url
+    client = FakeJDClient(
+        {fetch_url: [httpx.Response(200, json=_104_PAYLOAD, headers={"ETag": '"v1"'}), httpx.Response(304)]}
+    )
+    _install(monkeypatch, client)
+    monkeypatch.setattr(get_settings(), "jd_cache_ttl_s", 0)
+
+    first = JDEnricher().enrich([url])[url]
+    second = JDEnricher().enrich([url])[url]
+    assert second == first
+    assert client.calls[1][1]["If-None-Match"] == '"v1"'
+
+
+def test_enrich_negative_caches_failures(monkeypatch):
+    url = "https://www.linkedin.com/jobs/view/123"
+    fetch_url = jd_request_for(url).fetch_url
+    client = FakeJDClient({fetch_url: [httpx.Response(503), httpx.Response(200, text="JD body")]})
+    _install(monkeypatch, client)
+
+    assert JDEnricher().enrich([url]) == {url: None}
+    assert JDEnricher().enrich([url]) == {url: None}
+    assert len(client.calls) == 1
+
+    jd_module.get_response_cache("jd_content", 10).clear()
+    assert JDEnricher().enrich([url]) == {url: "JD body"}
@@ -0,0 +1,33 @@
+from app.services.bant_scorer import BANTScorerService
+from app.services.keyword_matcher import KeywordMatcher
+
+
+def test_keyword_matcher_returns_hits_per_category_with_shared_keywords():
+    matcher = KeywordMatcher({"need": ["Yield", "NPI", "defect"], "technical_track": ["npi", "yield", "optical"]})
+    hits = matcher.scan("NPI schedule slipped; YIELD loss on the optical line")
+    assert hits == {"need": {"yield", "npi"}, "technical_track": {"npi", "yield", "optical"}}
+    assert matcher.scan("") == {"need": set(), "technical_track": set()}
+
+
+def test_bant_keyword_hits_match_per_keyword_substring_counts():
+    service = BANTScorerService()
+    text = "Director approved the CAPEX budget; pilot in Q3 to fix false reject and overkill on AA inspection."
+    hits = service.keyword_matcher.scan(text)
+    lowered = text.lower()
+    for name, keywords in (
+        ("budget", service.budget_keywords),
+        ("authority", service.authority_keywords),
+        ("need", service.need_keywords),
+        ("timeline", service.timeline_keywords),
+        ("technical_track", service.technical_track_keywords),
+    ):
+        assert hits[name] == {keyword for keyword in keywords if keyword in lowered}
+
+
+def test_keyword_matcher_handles_nested_and_overlapping_keywords():
+    matcher = KeywordMatcher({"budget": ["capex", "cap", "budget"], "misc": ["ex", "pex", "x.y", "get"]})
+    text = "New CAPEX budget for x.y line"
+    assert matcher.scan(text) == {"budget": {"capex", "cap", "budget"}, "misc": {"ex", "pex", "x.y", "get"}}
+    # 特殊字元照字面比對
+    assert matcher.scan("xzy") == {"budget": set(), "misc": set()}
+    assert KeywordMatcher({"empty": []}).scan("anything") == {"empty": set()}
@@ -0,0 +1,301 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import get_settings
+from app.services.providers import llm as llm_module
+from app.services.providers.limits import (
+    CircuitBreaker,
+    acall_with_resilience,
+    get_circuit_breaker,
+    provider_slot,
+    reset_provider_limits,
+)
+from app.services.providers.llm import (
+    GeminiProvider,
+    LLMResult,
+    LLMRouter,
+    LLMStreamEvent,
+    OpenAIProvider,
+    get_latency_tracker,
+)
+from app.services.utils import sse_stream
+
+
+def _seed_latency(provider: str, latency_ms: int, count: int = 5) -> None:
+    for _ in range(count):
+        get_latency_tracker().record(provider, latency_ms)
+
+
+def test_latency_routing_prefers_fastest_provider_within_allowed_order(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_routing_mode", "latency")
+    router = LLMRouter()
+    # 樣本不足時維持設定順序
+    assert router.routing_order() == ["GEMINI", "OPENAI"]
+
+    _seed_latency("GEMINI", 2400)
+    _seed_latency("OPENAI", 700)
+    assert router.routing_order() == ["OPENAI", "GEMINI"]
+    # 呼叫端指定的順序只限定可用範圍，範圍內仍依延遲排序
+    assert router.routing_order(["GEMINI", "OPENAI"]) == ["OPENAI", "GEMINI"]
+    assert router.routing_order(["GEMINI"]) == ["GEMINI"]
+    monkeypatch.setattr(get_settings(), "llm_routing_mode", "static")
+    assert LLMRouter().routing_order(["GEMINI", "OPENAI"]) == ["GEMINI", "OPENAI"]
+
+    calls: list[str] = []
+
+    def fake_openai(self, system_prompt, user_prompt):  # noqa: ANN001
+        calls.append("OPENAI")
+        return LLMResult(text="ok", provider="OPENAI", latency_ms=650, token_usage=10)
+
+    monkeypatch.setattr(OpenAIProvider, "generate", fake_openai)
+    result = router.generate(system_prompt="sys", user_prompt="route me")
+    assert calls == ["OPENAI"]
+    assert result.provider == "OPENAI" and not result.fallback_used
+    assert get_latency_tracker().sample_count("OPENAI") == 6
+
+
+def test_latency_routing_ranks_by_median_not_outliers(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_routing_mode", "latency")
+    # GEMINI 中位數較快，只有一次離群的慢回應；p95 只影響 hedge 延遲，不影響排序
+    _seed_latency("GEMINI", 500, count=9)
+    _seed_latency("GEMINI", 9000, count=1)
+    _seed_latency("OPENAI", 700)
+    assert LLMRouter().routing_order(["OPENAI", "GEMINI"]) == ["GEMINI", "OPENAI"]
+
+
+def test_outreach_route_applies_latency_routing_to_provider_preference(client, seeded_contact, monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_routing_mode", "latency")
+    _seed_latency("GEMINI", 2400)
+    _seed_latency("OPENAI", 700)
+    calls: list[str] = []
+    draft = '{"subject":"Yield benchmark","body":"We can help stabilize AA yield.","cta":"20-min call?"}'
+
+    def fake_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        calls.append("GEMINI")
+        return LLMResult(text=draft, provider="GEMINI", latency_ms=2400, token_usage=10)
+
+    def fake_openai(self, system_prompt, user_prompt):  # noqa: ANN001
+        calls.append("OPENAI")
+        return LLMResult(text=draft, provider="OPENAI", latency_ms=700, token_usage=10)
+
+    monkeypatch.setattr(GeminiProvider, "generate", fake_gemini)
+    monkeypatch.setattr(OpenAIProvider, "generate", fake_openai)
+
+    response = client.post(
+        "/api/v1/outreach/generate",
+        json={
+            "contact_id": seeded_contact["contact_id"],
+            "channel": "EMAIL",
+            "intent": "FIRST_TOUCH",
+            "tone": "TECHNICAL",
+            "llm_provider_preference": ["GEMINI", "OPENAI"],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["model_provider"] == "OPENAI"
+    assert calls == ["OPENAI"]
+
+
+def test_hedged_request_fires_after_primary_p95_and_cancels_loser(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_hedge_enabled", True)
+    _seed_latency("GEMINI", 50)
+    cancelled: list[str] = []
+
+    async def slow_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append("GEMINI")
+            raise
+        return LLMResult(text="late", provider="GEMINI", latency_ms=5000, token_usage=10)
+
+    async def fast_openai(self, system_prompt, user_prompt):  # noqa: ANN001
+        await asyncio.sleep(0.01)
+        return LLMResult(text="hedged", provider="OPENAI", latency_ms=10, token_usage=10)
+
+    monkeypatch.setattr(GeminiProvider, "agenerate", slow_gemini)
+    monkeypatch.setattr(OpenAIProvider, "agenerate", fast_openai)
+
+    result = LLMRouter(interactive=True).generate(system_prompt="sys", user_prompt="hedge me")
+    assert (result.text, result.provider, result.hedged, result.fallback_used) == ("hedged", "OPENAI", True, True)
+    assert cancelled == ["GEMINI"]
+    # 被取消的首選以實際等待時間計入樣本
+    assert get_latency_tracker().sample_count("GEMINI") == 6
+
+
+def test_hedge_is_not_sent_when_primary_answers_within_p95(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_hedge_enabled", True)
+    _seed_latency("GEMINI", 500)
+    secondary_calls: list[str] = []
+
+    async def quick_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        return LLMResult(text="fast", provider="GEMINI", latency_ms=20, token_usage=10)
+
+    async def openai(self, system_prompt, user_prompt):  # noqa: ANN001
+        secondary_calls.append(user_prompt)
+        return LLMResult(text="unused", provider="OPENAI", latency_ms=20, token_usage=10)
+
+    monkeypatch.setattr(GeminiProvider, "agenerate", quick_gemini)
+    monkeypatch.setattr(OpenAIProvider, "agenerate", openai)
+
+    result = LLMRouter(interactive=True).generate(system_prompt="sys", user_prompt="no hedge")
+    assert (result.provider, result.hedged) == ("GEMINI", False)
+    assert secondary_calls == []
+    # 非互動 router 不送 hedged 請求
+    assert not LLMRouter().hedge_enabled
+
+
+def test_hedged_requests_respect_llm_max_concurrency(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_hedge_enabled", True)
+    monkeypatch.setattr(get_settings(), "llm_max_concurrency", 1)
+    reset_provider_limits()
+    _seed_latency("GEMINI", 50)
+    active = {"GEMINI": 0, "OPENAI": 0}
+    peak = {"GEMINI": 0, "OPENAI": 0}
+
+    def fake_provider(name: str):
+        async def agenerate(self, system_prompt, user_prompt):  # noqa: ANN001
+            active[name] += 1
+            peak[name] = max(peak[name], active[name])
+            try:
+                await asyncio.sleep(0.2)
+            finally:
+                active[name] -= 1
+            return LLMResult(text=name, provider=name, latency_ms=200, token_usage=10)
+
+        return agenerate
+
+    monkeypatch.setattr(GeminiProvider, "agenerate", fake_provider("GEMINI"))
+    monkeypatch.setattr(OpenAIProvider, "agenerate", fake_provider("OPENAI"))
+
+    router = LLMRouter(interactive=True)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(
+            executor.map(lambda prompt: router.generate(system_prompt="sys", user_prompt=prompt), ["a", "b", "c"])
+        )
+    assert len(results) == 3
+    # 首選與 hedged 請求都佔用 provider 名額，同時在途的請求不超過 LLM_MAX_CONCURRENCY
+    assert peak == {"GEMINI": 1, "OPENAI": 1}
+
+
+def test_cancelled_hedge_probe_releases_half_open_breaker(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_hedge_enabled", True)
+    _seed_latency("GEMINI", 50)
+    breaker = get_circuit_breaker("GEMINI")
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout_s - 1
+
+    async def slow_probe():
+        await asyncio.sleep(5)
+
+    async def probing_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        await acall_with_resilience("GEMINI", slow_probe)
+
+    async def fast_openai(self, system_prompt, user_prompt):  # noqa: ANN001
+        await asyncio.sleep(0.01)
+        return LLMResult(text="hedged", provider="OPENAI", latency_ms=10, token_usage=10)
+
+    monkeypatch.setattr(GeminiProvider, "agenerate", probing_gemini)
+    monkeypatch.setattr(OpenAIProvider, "agenerate", fast_openai)
+
+    result = LLMRouter(interactive=True).generate(system_prompt="sys", user_prompt="probe me")
+    assert result.provider == "OPENAI" and result.hedged
+    # 探測請求被 hedge 取消後仍停在 half-open，但名額已放回：下一個請求可以探測並讓斷路器恢復
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+class FakeStreamResponse:
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.closed = False
+
+    def iter_lines(self):  # noqa: ANN201
+        yield from self.lines
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_stream_falls_back_before_first_token_and_parses_openai_sse(monkeypatch):
+    monkeypatch.setattr(get_settings(), "gemini_api_key", None)
+    monkeypatch.setattr(get_settings(), "openai_api_key", "test-key")
+    response = FakeStreamResponse(
+        [
+            'data: {"choices":[{"delta":{"role":"assistant"}}]}',
+            "",
+            'data: {"choices":[{"delta":{"content":"Hel"}}]}',
+            "",
+            'data: {"choices":[{"delta":{"content":"lo"}}]}',
+            "",
+            'data: {"choices":[],"usage":{"total_tokens":42}}',
+            "",
+            "data: [DONE]",
+            "",
+        ]
+    )
+    requests: list[dict] = []
+
+    def fake_open_stream(url, **kwargs):  # noqa: ANN001, ANN003
+        requests.append(kwargs["json"])
+        return response
+
+    monkeypatch.setattr(llm_module, "_open_stream", fake_open_stream)
+
+    events = list(LLMRouter().stream(system_prompt="sys", user_prompt="stream me"))
+    assert [event.delta for event in events[:-1]] == ["Hel", "lo"]
+    result = events[-1].result
+    assert (result.text, result.provider, result.token_usage) == ("Hello", "OPENAI", 42)
+    assert result.fallback_used and result.first_token_ms is not None
+    assert requests[0]["stream"] is True
+    assert response.closed
+
+    # 同一 prompt 再次串流直接由快取一次回傳
+    cached = list(LLMRouter().stream(system_prompt="sys", user_prompt="stream me"))
+    assert cached[0].delta == "Hello" and cached[-1].result.cache_hit
+    assert len(requests) == 1
+
+
+def test_sse_stream_closes_llm_stream_and_frees_slot_on_client_disconnect(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_max_concurrency", 1)
+    reset_provider_limits()
+    closed: list[str] = []
+
+    def endless_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        try:
+            while True:
+                yield LLMStreamEvent(delta="tok")
+        finally:
+            closed.append("GEMINI")
+
+    monkeypatch.setattr(GeminiProvider, "stream", endless_gemini)
+
+    class DisconnectingRequest:
+        checks = 0
+
+        async def is_disconnected(self) -> bool:
+            self.checks += 1
+            return self.checks > 2
+
+    def events():
+        for event in LLMRouter().stream(system_prompt="sys", user_prompt="abandon me"):
+            yield "token", {"text": event.delta}
+
+    # 保留 generator 的參照（如同 StreamingResponse），確認是 sse_stream 主動 close 而不是靠 GC
+    pending = events()
+
+    async def consume() -> list[bytes]:
+        return [chunk async for chunk in sse_stream(DisconnectingRequest(), pending)]
+
+    assert len(asyncio.run(consume())) == 2
+    assert closed == ["GEMINI"]
+    # 斷線後名額已釋放，下一個請求不會卡在 LLM_MAX_CONCURRENCY
+    def take_slot() -> bool:
+        with provider_slot("GEMINI"):
+            return True
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(take_slot).result(timeout=1)
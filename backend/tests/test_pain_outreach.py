@@ -1,8 +1,10 @@
 import json
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
-from app.models import PainProfile, SignalEvent
-from app.services.providers.llm import LLMResult, LLMRouter
+from sqlalchemy import event, select
+
+from app.models import Contact, OutreachDraft, PainProfile, SignalEvent
+from app.services.providers.llm import LLMResult, LLMRouter, LLMStreamEvent
 
 
 def test_generate_pain_profiles(client, db_session, seeded_contact, monkeypatch):
@@ -178,3 +180,214 @@ def test_generate_outreach(client, db_session, seeded_contact, monkeypatch):
     patch_response = client.patch(f"/api/v1/outreach/{draft_id}/status", json={"status": "APPROVED"})
     assert patch_response.status_code == 200
     assert patch_response.json()["status"] == "APPROVED"
+
+
+def test_llm_router_caches_identical_prompts_per_provider(monkeypatch):
+    from app.services.providers.llm import GeminiProvider
+
+    calls: list[str] = []
+
+    def fake_gemini(self, system_prompt, user_prompt):  # noqa: ANN001
+        calls.append(user_prompt)
+        return LLMResult(text=f"echo:{user_prompt}", provider="GEMINI", latency_ms=900, token_usage=120)
+
+    monkeypatch.setattr(GeminiProvider, "generate", fake_gemini)
+    router = LLMRouter()
+
+    first = router.generate(system_prompt="sys", user_prompt="hello", preferred_order=["GEMINI"])
+    second = router.generate(system_prompt="sys", user_prompt="hello", preferred_order=["GEMINI"])
+    other = router.generate(system_prompt="sys", user_prompt="world", preferred_order=["GEMINI"])
+
+    assert calls == ["hello", "world"]
+    assert not first.cache_hit and first.token_usage == 120
+    assert second.cache_hit and second.text == first.text
+    assert second.token_usage == 0
+    assert second.latency_ms < first.latency_ms
+    assert not other.cache_hit
+
+    router.cache_enabled = False
+    router.generate(system_prompt="sys", user_prompt="hello", preferred_order=["GEMINI"])
+    assert calls == ["hello", "world", "hello"]
+
+
+def test_global_pain_profiles_keyset_pages_with_company_names(client, db_session, seeded_contact):
+    now = datetime.now(UTC)
+    for index in range(5):
+        db_session.add(
+            PainProfile(
+                account_id=seeded_contact["account_id"],
+                persona="RD" if index % 2 else "NPI",
+                pain_statement=f"pain {index}",
+                business_impact="impact",
+                technical_anchor="anchor",
+                confidence=0.5 + index * 0.1,
+                created_at=now - timedelta(minutes=index),
+            )
+        )
+    db_session.commit()
+
+    first = client.get("/api/v1/pain-profiles/global", params={"limit": 3}).json()
+    assert [item["pain_statement"] for item in first["items"]] == ["pain 0", "pain 1", "pain 2"]
+    assert first["items"][0]["company_name"] == "Test Semicon Co"
+    second = client.get("/api/v1/pain-profiles/global", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+    assert [item["pain_statement"] for item in second["items"]] == ["pain 3", "pain 4"]
+    assert second["next_cursor"] is None
+
+    rd_only = client.get("/api/v1/pain-profiles/global", params={"persona": "rd", "min_confidence": 0.65}).json()
+    assert [item["pain_statement"] for item in rd_only["items"]] == ["pain 3"]
+
+
+def _fake_stream(chunks: list[str], provider: str = "GEMINI"):  # noqa: ANN202
+    def fake_stream(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+        for chunk in chunks:
+            yield LLMStreamEvent(delta=chunk)
+        yield LLMStreamEvent(
+            result=LLMResult(
+                text="".join(chunks), provider=provider, latency_ms=120, token_usage=50, first_token_ms=15
+            )
+        )
+
+    return fake_stream
+
+
+def _sse_events(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_generate_outreach_stream_sends_tokens_then_persisted_draft(client, db_session, seeded_contact, monkeypatch):
+    chunks = ['{"subject":"Optical yield",', '"body":"We can help.",', '"cta":"20-min call?"}']
+    monkeypatch.setattr(LLMRouter, "stream", _fake_stream(chunks))
+
+    response = client.post(
+        "/api/v1/outreach/generate/stream",
+        json={"contact_id": seeded_contact["contact_id"], "channel": "EMAIL", "intent": "FIRST_TOUCH"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    assert [data["text"] for name, data in events if name == "token"] == chunks
+    name, draft = events[-1]
+    assert name == "draft"
+    assert (draft["subject"], draft["cta"], draft["first_token_ms"]) == ("Optical yield", "20-min call?", 15)
+
+    drafts = client.get(f"/api/v1/outreach/contacts/{seeded_contact['contact_id']}").json()["items"]
+    assert drafts[0]["id"] == draft["draft_id"]
+    assert drafts[0]["body"] == "We can help."
+
+    missing = client.post(
+        "/api/v1/outreach/generate/stream", json={"contact_id": 999999, "channel": "EMAIL", "intent": "FIRST_TOUCH"}
+    )
+    assert missing.status_code == 404
+
+
+def test_generate_pain_profiles_stream_persists_profiles_after_tokens(client, db_session, seeded_contact, monkeypatch):
+    now = datetime.now(UTC)
+    signal = SignalEvent(
+        account_id=seeded_contact["account_id"],
+        signal_type="HIRING",
+        signal_strength=70,
+        event_date=now.date(),
+        summary="AOI engineer hiring.",
+        evidence_url="https://example.com/stream-signal",
+        source_name="Example News",
+        search_provider="TAVILY",
+        fetched_at=now,
+    )
+    db_session.add(signal)
+    db_session.commit()
+    payload = json.dumps(
+        {"items": [{"persona": "RD", "pain_statement": "AOI escapes", "evidence_signal_ids": [signal.id]}]}
+    )
+    monkeypatch.setattr(LLMRouter, "stream", _fake_stream([payload[:20], payload[20:]]))
+
+    response = client.post(
+        "/api/v1/pain-profiles/generate/stream",
+        json={"account_id": seeded_contact["account_id"], "persona_targets": ["RD"], "max_items": 2},
+    )
+    events = _sse_events(response.text)
+    assert [name for name, _ in events] == ["token", "token", "done"]
+    assert events[-1][1]["created_count"] == 1
+
+    items = client.get(f"/api/v1/pain-profiles/accounts/{seeded_contact['account_id']}").json()["items"]
+    assert items[0]["pain_statement"] == "AOI escapes"
+    assert json.loads(items[0]["evidence_ref"])["evidence"][0]["signal_id"] == signal.id
+
+
+def test_generate_outreach_batch_loads_pains_once_and_reports_per_contact_status(
+    client, db_session, seeded_contact, monkeypatch
+):
+    now = datetime.now(UTC)
+    db_session.add(
+        PainProfile(
+            account_id=seeded_contact["account_id"],
+            persona="RD",
+            pain_statement="Overlay drift.",
+            business_impact="Rework.",
+            technical_anchor="Inline metrology.",
+            confidence=0.7,
+            created_at=now,
+        )
+    )
+    extra = Contact(account_id=seeded_contact["account_id"], full_name="NPI Lead", role_title="NPI PM", created_at=now)
+    orphan = Contact(account_id=seeded_contact["account_id"] + 1000, full_name="Orphan", created_at=now)
+    db_session.add_all([extra, orphan])
+    db_session.commit()
+
+    def fake_generate(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+        if "NPI PM" in user_prompt:
+            raise RuntimeError("All LLM providers failed: GEMINI: timeout")
+        assert "Overlay drift." in user_prompt
+        return LLMResult(
+            provider="OPENAI", latency_ms=50, token_usage=10, text='{"subject":"S","body":"B","cta":"C"}'
+        )
+
+    monkeypatch.setattr(LLMRouter, "generate", fake_generate)
+    pain_queries: list[str] = []
+
+    def count_pain_queries(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        if statement.lstrip().upper().startswith("SELECT") and "FROM pain_profiles" in statement:
+            pain_queries.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_pain_queries)
+    try:
+        response = client.post(
+            "/api/v1/outreach/generate/batch",
+            json={
+                "contact_ids": [
+                    seeded_contact["contact_id"],
+                    extra.id,
+                    999999,
+                    orphan.id,
+                    seeded_contact["contact_id"],
+                ],
+                "channel": "EMAIL",
+                "intent": "FIRST_TOUCH",
+            },
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_pain_queries)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["requested"], payload["created"], payload["failed"]) == (4, 1, 3)
+    assert [(item["contact_id"], item["status"]) for item in payload["items"]] == [
+        (seeded_contact["contact_id"], "CREATED"),
+        (extra.id, "FAILED"),
+        (999999, "NOT_FOUND"),
+        (orphan.id, "NOT_FOUND"),
+    ]
+    assert "timeout" in payload["items"][1]["error"]
+    # 聯絡人不存在與帳戶已不存在要能分辨，訊息與單筆生成一致
+    assert payload["items"][2]["error"] == "找不到聯絡人 Contact 999999。"
+    assert payload["items"][3]["error"] == f"找不到 Contact {orphan.id} 對應的 account。"
+    assert len(pain_queries) == 1
+
+    drafts = db_session.execute(select(OutreachDraft)).scalars().all()
+    assert [(d.id, d.contact_id, d.subject) for d in drafts] == [
+        (payload["items"][0]["draft_id"], seeded_contact["contact_id"], "S")
+    ]
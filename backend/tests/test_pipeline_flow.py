@@ -1,3 +1,12 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, select
+
+from app.models import Account, BANTScorecard, DailyKpiRollup, PipelineItem
+from app.services.kpi_rollups import KPI_COLUMNS, rebuild_kpi_rollups
+from app.services.pipeline_console import PipelineConsoleService
+
+
 def test_interaction_to_bant_to_pipeline_and_weekly(client, seeded_contact):
     account_id = seeded_contact["account_id"]
     contact_id = seeded_contact["contact_id"]
@@ -36,3 +45,232 @@ def test_interaction_to_bant_to_pipeline_and_weekly(client, seeded_contact):
     weekly_payload = weekly_response.json()
     assert weekly_payload["inbound_count"] >= 1
 
+
+
+def test_pipeline_board_uses_constant_queries_with_latest_scorecard(client, db_session, engine):
+    now = datetime.now(UTC)
+    for index in range(6):
+        account = Account(company_name=f"Board Co {index}", segment="WAFER_FAB", created_at=now, updated_at=now)
+        db_session.add(account)
+        db_session.flush()
+        db_session.add(
+            PipelineItem(
+                account_id=account.id,
+                stage="ENGAGED" if index % 2 else "NURTURE",
+                probability=0.1 * (index + 1),
+                next_action="follow up",
+                due_date=(now + timedelta(days=index)).date(),
+                owner="amy" if index < 3 else "ben",
+                updated_at=now,
+            )
+        )
+        for offset_days, grade, total in ((3, "C", 20 + index), (0, "A", 80 + index)):
+            db_session.add(
+                BANTScorecard(
+                    account_id=account.id,
+                    budget_score=10,
+                    authority_score=10,
+                    need_score=10,
+                    timeline_score=10,
+                    total_score=total,
+                    grade=grade,
+                    rationale="test",
+                    recommended_next_action="next",
+                    created_at=now - timedelta(days=offset_days),
+                )
+            )
+    db_session.commit()
+
+    statements: list[str] = []
+
+    def count_statements(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statements)
+    try:
+        items = PipelineConsoleService().board(db=db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statements)
+    assert len(statements) == 1
+    assert len(items) == 6
+    assert all(item["latest_bant_grade"] == "A" for item in items)
+
+    response = client.get(
+        "/api/v1/pipeline/board",
+        params={"owner": "ben", "sort": "bant_score", "limit": 2, "offset": 0},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["total"] == 3
+    assert [item["latest_bant_score"] for item in payload["items"]] == [85, 84]
+
+    stage_resp = client.get("/api/v1/pipeline/board", params={"stage": "engaged"})
+    assert stage_resp.json()["total"] == 3
+    assert {item["stage"] for item in stage_resp.json()["items"]} == {"ENGAGED"}
+    assert client.get("/api/v1/pipeline/board", params={"sort": "bogus"}).status_code == 422
+
+
+def test_weekly_report_reads_incremental_rollups_with_ranges_and_breakdowns(client, db_session, seeded_contact):
+    contact_id = seeded_contact["contact_id"]
+    account_id = seeded_contact["account_id"]
+    today = datetime.now(UTC)
+    old_day = today - timedelta(days=30)
+    for direction, occurred_at in (("INBOUND", today), ("OUTBOUND", today), ("OUTBOUND", old_day)):
+        response = client.post(
+            "/api/v1/interactions/log",
+            json={
+                "contact_id": contact_id,
+                "channel": "EMAIL",
+                "direction": direction,
+                "content_summary": "Director approves budget for NPI pilot in Q3 to improve yield.",
+                "sentiment": "POSITIVE",
+                "occurred_at": occurred_at.isoformat(),
+            },
+        )
+        assert response.status_code == 200
+    assert client.post("/api/v1/bant/score", json={"account_id": account_id, "lookback_days": 60}).status_code == 200
+
+    incremental = {
+        (row.day, row.account_id): tuple(getattr(row, column) for column in KPI_COLUMNS)
+        for row in db_session.execute(select(DailyKpiRollup)).scalars()
+    }
+    assert rebuild_kpi_rollups(db_session) == len(incremental)
+    db_session.expire_all()
+    rebuilt = {
+        (row.day, row.account_id): tuple(getattr(row, column) for column in KPI_COLUMNS)
+        for row in db_session.execute(select(DailyKpiRollup)).scalars()
+    }
+    assert rebuilt == incremental
+
+    weekly = client.get("/api/v1/reports/weekly").json()
+    assert (weekly["inbound_count"], weekly["outbound_count"], weekly["accounts_touched"]) == (1, 1, 1)
+    assert weekly["bant_a_count"] + weekly["bant_b_count"] + weekly["bant_c_count"] == 1
+
+    ranged = client.get(
+        "/api/v1/reports/weekly",
+        params={"start_date": (old_day - timedelta(days=1)).date().isoformat(), "group_by": "segment"},
+    ).json()
+    assert ranged["outbound_count"] == 2
+    assert ranged["breakdown"] == [
+        {
+            "key": "WAFER_FAB",
+            "outbound_count": 2,
+            "inbound_count": 1,
+            "accounts_touched": 1,
+            "drafts_created": 0,
+            "bant_a_count": weekly["bant_a_count"],
+            "bant_b_count": weekly["bant_b_count"],
+            "bant_c_count": weekly["bant_c_count"],
+        }
+    ]
+    by_owner = client.get("/api/v1/reports/weekly", params={"group_by": "owner"}).json()
+    assert [item["key"] for item in by_owner["breakdown"]] == ["BD"]
+    bad_range = client.get("/api/v1/reports/weekly", params={"start_date": "2026-02-01", "end_date": "2026-01-01"})
+    assert bad_range.status_code == 400
+
+
+def test_weekly_report_counts_each_account_once_and_defaults_to_seven_days(client, db_session, seeded_contact):
+    contact_id = seeded_contact["contact_id"]
+    account_id = seeded_contact["account_id"]
+    now = datetime.now(UTC)
+    # 今天往前 6 天仍在預設區間，往前 7 天已不在
+    for occurred_at in (now, now - timedelta(days=6), now - timedelta(days=7)):
+        client.post(
+            "/api/v1/interactions/log",
+            json={
+                "contact_id": contact_id,
+                "channel": "EMAIL",
+                "direction": "OUTBOUND",
+                "content_summary": "Follow-up on the inspection pilot.",
+                "occurred_at": occurred_at.isoformat(),
+            },
+        )
+    # 記錄互動時已自動建立一筆 owner 為 BD 的 pipeline item；再加兩筆，最新的是 ben
+    for owner, updated_at in (("amy", now - timedelta(days=2)), ("ben", now + timedelta(minutes=1))):
+        db_session.add(
+            PipelineItem(
+                account_id=account_id,
+                stage="ENGAGED",
+                probability=0.4,
+                next_action="demo",
+                due_date=now.date(),
+                owner=owner,
+                updated_at=updated_at,
+            )
+        )
+    db_session.commit()
+
+    weekly = client.get("/api/v1/reports/weekly").json()
+    assert weekly["outbound_count"] == 2
+    assert (weekly["end_date"], weekly["start_date"]) == (
+        now.date().isoformat(),
+        (now - timedelta(days=6)).date().isoformat(),
+    )
+    by_owner = client.get("/api/v1/reports/weekly", params={"group_by": "owner"}).json()
+    assert [(item["key"], item["outbound_count"]) for item in by_owner["breakdown"]] == [("ben", 2)]
+
+
+def test_deleting_contact_retracts_its_kpis_to_match_rebuild(client, db_session, seeded_contact):
+    contact_id = seeded_contact["contact_id"]
+    now = datetime.now(UTC)
+    for direction in ("INBOUND", "OUTBOUND"):
+        client.post(
+            "/api/v1/interactions/log",
+            json={
+                "contact_id": contact_id,
+                "channel": "EMAIL",
+                "direction": direction,
+                "content_summary": "Pilot scope review.",
+                "occurred_at": now.isoformat(),
+            },
+        )
+    assert client.get("/api/v1/reports/weekly").json()["inbound_count"] == 1
+
+    assert client.delete(f"/api/v1/contacts/{contact_id}").status_code == 200
+    weekly = client.get("/api/v1/reports/weekly").json()
+    assert (weekly["inbound_count"], weekly["outbound_count"], weekly["accounts_touched"]) == (0, 0, 0)
+
+    db_session.expire_all()
+    retracted = {
+        (row.day, row.account_id): tuple(getattr(row, column) for column in KPI_COLUMNS)
+        for row in db_session.execute(select(DailyKpiRollup)).scalars()
+    }
+    rebuild_kpi_rollups(db_session)
+    rebuilt = {
+        (row.day, row.account_id): tuple(getattr(row, column) for column in KPI_COLUMNS)
+        for row in db_session.execute(select(DailyKpiRollup)).scalars()
+    }
+    assert {key: value for key, value in retracted.items() if any(value)} == rebuilt
+
+
+def test_interactions_with_utc_offsets_roll_up_on_the_same_utc_day_as_rebuild(client, db_session, seeded_contact):
+    contact_id = seeded_contact["contact_id"]
+    account_id = seeded_contact["account_id"]
+    # 台北時間 10/18 03:00 是 UTC 10/17 19:00
+    response = client.post(
+        "/api/v1/interactions/log",
+        json={
+            "contact_id": contact_id,
+            "channel": "EMAIL",
+            "direction": "INBOUND",
+            "content_summary": "Early-morning reply on the pilot quote.",
+            "occurred_at": "2026-10-18T03:00:00+08:00",
+        },
+    )
+    assert response.status_code == 200
+
+    def rollup_days():
+        db_session.expire_all()
+        return {
+            row.day.isoformat(): row.interactions_count
+            for row in db_session.execute(select(DailyKpiRollup)).scalars()
+            if row.interactions_count
+        }
+
+    assert rollup_days() == {"2026-10-17": 1}
+    rebuild_kpi_rollups(db_session)
+    assert rollup_days() == {"2026-10-17": 1}
+
+    assert client.delete(f"/api/v1/contacts/{contact_id}").status_code == 200
+    assert rollup_days() == {}
+    assert db_session.get(Account, account_id) is not None
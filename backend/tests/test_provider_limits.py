@@ -0,0 +1,228 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.services.providers import limits
+from app.services.providers import search as search_module
+from app.services.providers.limits import (
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    call_with_resilience,
+    get_circuit_breaker,
+)
+from app.services.providers.search import SearchResultItem, SearchUnavailableError, TavilySearchProvider
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example.com/")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+@pytest.fixture()
+def no_sleep(monkeypatch):
+    slept: list[float] = []
+    monkeypatch.setattr(limits.time, "sleep", slept.append)
+    return slept
+
+
+def test_token_bucket_spends_burst_then_spaces_requests_and_backs_off():
+    bucket = TokenBucket(rate_per_s=2.0)
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+    bucket.penalize()
+    assert bucket.rate == 1.0
+    bucket.reward()
+    assert bucket.rate == pytest.approx(1.1)
+
+
+def test_circuit_breaker_opens_rejects_and_recovers_through_half_open(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(limits.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("TAVILY", failure_threshold=2, reset_timeout_s=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 31
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["rejected"] == 2
+
+
+def test_call_with_resilience_retries_429_and_5xx_with_jitter(no_sleep):
+    outcomes = [_status_error(429, {"Retry-After": "1"}), _status_error(503), "ok"]
+
+    def call():  # noqa: ANN202
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert call_with_resilience("GEMINI", call) == "ok"
+    # 第一次退避至少遵守 Retry-After
+    retry_waits = [delay for delay in no_sleep if delay > 0]
+    assert retry_waits[0] >= 1.0
+    snapshot = get_circuit_breaker("GEMINI").snapshot()
+    assert snapshot["retries"] == 2
+    assert snapshot["rate_limited"] == 1
+    assert snapshot["state"] == CircuitBreaker.CLOSED
+
+
+def test_call_with_resilience_does_not_retry_client_errors(no_sleep):
+    calls = []
+
+    def call():  # noqa: ANN202
+        calls.append(1)
+        raise _status_error(400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        call_with_resilience("OPENAI", call)
+    assert len(calls) == 1
+    assert get_circuit_breaker("OPENAI").state == CircuitBreaker.CLOSED
+
+
+def test_tavily_raises_when_every_query_fails_and_health_reports_open_breaker(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "tavily_api_key", "test-key")
+    monkeypatch.setattr(get_settings(), "provider_max_retries", 0)
+    monkeypatch.setattr(get_settings(), "breaker_failure_threshold", 2)
+
+    class FailingClient:
+        async def post(self, url, json, timeout):  # noqa: A002, ANN001
+            raise _status_error(503)
+
+    monkeypatch.setattr(search_module, "get_async_http_client", lambda url: FailingClient())
+    provider = TavilySearchProvider()
+    provider.use_cache = False
+    with pytest.raises(SearchUnavailableError) as excinfo:
+        provider.search_company_signals(
+            company_name="Young Optics", keywords=["AR"], lookback_days=30, max_results=4, region="USA"
+        )
+
+    assert isinstance(excinfo.value.__cause__, (httpx.HTTPStatusError, CircuitOpenError))
+
+    payload = client.get("/api/v1/health/providers").json()
+    assert payload["status"] == "degraded"
+    assert payload["open_breakers"] == ["TAVILY"]
+    assert payload["providers"]["TAVILY"]["state"] == "open"
+
+
+def test_tavily_concurrency_limit_counts_individual_requests(monkeypatch):
+    monkeypatch.setattr(get_settings(), "tavily_api_key", "test-key")
+    monkeypatch.setattr(get_settings(), "tavily_max_concurrency", 2)
+    monkeypatch.setattr(get_settings(), "tavily_rate_per_s", 1000.0)
+    limits.reset_provider_limits()
+
+    class CountingClient:
+        def __init__(self) -> None:
+            self.calls = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        async def post(self, url, json, timeout):  # noqa: A002, ANN001
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.02)
+            finally:
+                self.in_flight -= 1
+            return httpx.Response(200, json={"results": []}, request=httpx.Request("POST", url))
+
+    client = CountingClient()
+    monkeypatch.setattr(search_module, "get_async_http_client", lambda url: client)
+    provider = TavilySearchProvider()
+    provider.use_cache = False
+    provider.search_company_signals(
+        company_name="玉晶光 (GSEO)", keywords=["AR"], lookback_days=30, max_results=4, region="Taiwan"
+    )
+    # 台灣帳戶的查詢計畫超過 2 筆，同時在途的請求仍不超過上限
+    assert client.calls > 2
+    assert client.max_in_flight == 2
+
+
+def test_tavily_latency_excludes_local_slot_queueing(monkeypatch):
+    monkeypatch.setattr(get_settings(), "tavily_api_key", "test-key")
+    monkeypatch.setattr(get_settings(), "tavily_max_concurrency", 1)
+    monkeypatch.setattr(get_settings(), "tavily_rate_per_s", 1000.0)
+    limits.reset_provider_limits()
+
+    class SlowClient:
+        async def post(self, url, json, timeout):  # noqa: A002, ANN001
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"results": []}, request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(search_module, "get_async_http_client", lambda url: SlowClient())
+    provider = TavilySearchProvider()
+    queries = [(f"query {index}", "news", None, 4) for index in range(3)]
+    outcomes = asyncio.run(provider._run_query_plan(queries, lookback_days=30, use_cache=False))
+    # 三筆查詢依序排隊等名額，但每筆的 latency 只反映自己的 HTTP 請求（約 100ms），不含排隊的 100-200ms
+    latencies = [latency_ms for _, latency_ms in outcomes]
+    assert all(90 <= latency_ms < 180 for latency_ms in latencies)
+
+
+def test_search_cache_io_runs_off_the_event_loop(monkeypatch):
+    import time
+
+    from app.services.providers.cache import ResponseCache
+
+    def slow_get(self, key):  # noqa: ANN001
+        time.sleep(0.1)
+        return [{"url": f"https://news.example.com/{key[:8]}"}]
+
+    monkeypatch.setattr(ResponseCache, "get", slow_get)
+    provider = TavilySearchProvider()
+
+    async def run_all():  # noqa: ANN202
+        return await asyncio.gather(*(provider._do_search(None, f"q{i}", 30, 4) for i in range(4)))
+
+    started = time.perf_counter()
+    outcomes = search_module.run_async(run_all())
+    # 四次快取讀取各睡 0.1 秒；若在 event loop 上同步執行會串成 0.4 秒
+    assert time.perf_counter() - started < 0.3
+    assert all(latency == 0 for _, latency in outcomes)
+
+
+def test_sync_scan_records_unavailable_search_per_account_instead_of_failing(client, db_session, monkeypatch):
+    from datetime import UTC, datetime
+
+    from app.models import Account
+
+    now = datetime.now(UTC)
+    accounts = [
+        Account(company_name=name, segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+        for name in ("Up Optics", "Down Optics")
+    ]
+    db_session.add_all(accounts)
+    db_session.commit()
+
+    def fake_search(  # noqa: ANN202
+        self, company_name, keywords, lookback_days, max_results, region="", use_cache=None  # noqa: ANN001
+    ) -> list[SearchResultItem]:
+        if company_name == "Down Optics":
+            raise SearchUnavailableError("All Tavily queries failed for Down Optics: TAVILY circuit is open.")
+        return []
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    # 重複與不存在的 id 不計入已處理帳戶數
+    account_ids = [accounts[0].id, accounts[1].id, accounts[0].id, 999999]
+    response = client.post("/api/v1/signals/scan", json={"account_ids": account_ids, "concurrency": 1})
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["status"], payload["accounts_processed"], payload["accounts_failed"]) == ("completed", 2, 1)
+
+    job = client.get(f"/api/v1/signals/scan/{payload['job_id']}").json()
+    assert job["accounts_processed"] == payload["accounts_processed"]
+    by_account = {item["account_id"]: item for item in job["accounts"]}
+    assert by_account[accounts[0].id]["status"] == "completed"
+    assert "circuit is open" in by_account[accounts[1].id]["error"]
@@ -0,0 +1,110 @@
+import json
+import re
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+
+from app.models import SignalEvent
+from app.services.providers.llm import LLMResult, LLMRouter
+
+# 這些表會隨帳戶數線性成長，讀取必須走索引
+HOT_TABLES = (
+    "signal_events",
+    "pain_profiles",
+    "bant_scorecards",
+    "pipeline_items",
+    "interaction_logs",
+    "outreach_drafts",
+    "contacts",
+)
+_FULL_SCAN_RE = re.compile(rf"^SCAN ({'|'.join(HOT_TABLES)})\b(?!.*USING (COVERING )?INDEX)")
+
+
+def _fake_llm(text: str):
+    def fake_generate(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+        return LLMResult(provider="GEMINI", latency_ms=10, token_usage=10, text=text)
+
+    return fake_generate
+
+
+def test_hot_per_account_reads_use_indexes(client, db_session, engine, seeded_contact, monkeypatch):
+    account_id = seeded_contact["account_id"]
+    contact_id = seeded_contact["contact_id"]
+    now = datetime.now(UTC)
+    signal = SignalEvent(
+        account_id=account_id,
+        signal_type="HIRING",
+        signal_strength=82,
+        summary="NPI optical validation hiring expansion.",
+        evidence_url="https://example.com/plan-signal",
+        search_fallback_used=0,
+        fetched_at=now,
+    )
+    db_session.add(signal)
+    db_session.commit()
+
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert client.post(
+            "/api/v1/interactions/log",
+            json={"contact_id": contact_id, "channel": "EMAIL", "direction": "INBOUND", "content_summary": "budget ok"},
+        ).status_code == 200
+        assert client.post("/api/v1/bant/score", json={"account_id": account_id, "lookback_days": 30}).status_code == 200
+
+        pain_payload = {
+            "items": [
+                {
+                    "persona": "RD",
+                    "pain_statement": "AA yield unstable",
+                    "business_impact": "Higher scrap",
+                    "technical_anchor": "alignment precision",
+                    "confidence": 0.8,
+                    "evidence_signal_ids": [signal.id],
+                    "reasoning": "hiring",
+                }
+            ]
+        }
+        monkeypatch.setattr(LLMRouter, "generate", _fake_llm(json.dumps(pain_payload)))
+        assert client.post(
+            "/api/v1/pain-profiles/generate", json={"account_id": account_id, "persona_targets": ["RD"]}
+        ).status_code == 200
+        monkeypatch.setattr(LLMRouter, "generate", _fake_llm('{"subject":"s","body":"b","cta":"c"}'))
+        assert client.post(
+            "/api/v1/outreach/generate",
+            json={"contact_id": contact_id, "channel": "EMAIL", "intent": "FIRST_TOUCH", "tone": "TECHNICAL"},
+        ).status_code == 200
+
+        for path in (
+            f"/api/v1/signals/accounts/{account_id}",
+            f"/api/v1/pain-profiles/accounts/{account_id}",
+            f"/api/v1/bant/accounts/{account_id}",
+            f"/api/v1/interactions/accounts/{account_id}",
+            f"/api/v1/outreach/contacts/{contact_id}",
+            f"/api/v1/contacts?account_id={account_id}",
+            "/api/v1/signals/global",
+            "/api/v1/pain-profiles/global",
+            "/api/v1/outreach/global",
+        ):
+            assert client.get(path).status_code == 200, path
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    touched: set[str] = set()
+    full_scans: list[str] = []
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                detail = row[-1]
+                touched.update(table for table in HOT_TABLES if re.search(rf"\b{table}\b", detail))
+                if _FULL_SCAN_RE.search(detail):
+                    full_scans.append(f"{detail} <- {statement.split()[:12]}")
+
+    assert touched == set(HOT_TABLES)
+    assert full_scans == []
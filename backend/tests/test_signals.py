@@ -1,25 +1,38 @@
-from datetime import UTC, datetime
+import asyncio
+import json
+import threading
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
-from app.models import SignalEvent
+from app.db.session import get_db, get_read_db
+from app.main import app
+from app.models import Account, Base, SignalEvent
 from app.services.market_radar import (
+    CompanyNameMatcher,
+    MarketRadarService,
+    _extract_name_variants,
     build_hiring_summary,
+    extract_jd_tech_signals,
     classify_signal_type,
     has_hiring_detail_signal,
     is_hiring_job_url,
     is_relevant_to_company,
+    rank_signal_for_top20,
     signal_strength,
 )
+from app.services.providers.llm import LLMResult, LLMRouter
 from app.services.providers.search import SearchResultItem, TavilySearchProvider
+from app.services.scan_jobs import get_scan_job_queue
 
 
 def test_signals_scan_writes_events(client, db_session, seeded_contact, monkeypatch):
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="CapEx expansion for AR line",
@@ -80,7 +93,7 @@ def test_signals_scan_applies_summary_cleaning(client, seeded_contact, monkeypat
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Optics line update",
@@ -117,7 +130,7 @@ def test_signals_scan_filters_irrelevant_industry_news(client, seeded_contact, m
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Japan's TDK acquires SoftEye",
@@ -166,7 +179,9 @@ def test_tavily_search_prefers_local_domains_for_tw(monkeypatch):
 
     calls: list[dict] = []
 
-    def fake_do_search(self, query, lookback_days, max_results, topic="news", include_domains=None):  # noqa: ANN001
+    async def fake_do_search(  # noqa: ANN202
+        self, client, query, lookback_days, max_results, topic="news", include_domains=None, use_cache=True  # noqa: ANN001
+    ):
         calls.append(
             {
                 "query": query,
@@ -202,7 +217,9 @@ def test_tavily_search_includes_hiring_domains_for_tw(monkeypatch):
 
     calls: list[dict] = []
 
-    def fake_do_search(self, query, lookback_days, max_results, topic="news", include_domains=None):  # noqa: ANN001
+    async def fake_do_search(  # noqa: ANN202
+        self, client, query, lookback_days, max_results, topic="news", include_domains=None, use_cache=True  # noqa: ANN001
+    ):
         calls.append(
             {
                 "query": query,
@@ -257,11 +274,33 @@ def test_company_relevance_accepts_compact_english_brand_token():
     )
 
 
+def test_company_name_matcher_covers_ticker_cjk_and_token_rules():
+    matcher = CompanyNameMatcher(_extract_name_variants("玉晶光 (GSEO)") + ["genius electronic optical"])
+    assert matcher.matches("GSEO 擴產 AR 光學模組")
+    assert not matcher.matches("GSEOX supplier update")
+    assert matcher.matches("玉晶光法說會")
+    assert matcher.matches("GeniusElectronicOptical ships lenses")
+    assert not matcher.matches("Genius Brands expands")
+
+    tsmc = CompanyNameMatcher(["taiwan semiconductor manufacturing co"])
+    assert tsmc.matches("Manufacturing at Taiwan's semiconductor giant")
+
+
+def test_jd_tech_signals_report_every_matching_label_in_table_order():
+    signals = extract_jd_tech_signals("負責 CoWoS 良率提升與 AOI 缺陷檢測，Director level，actively hiring")
+    assert signals["pain_points"] == [
+        "生產良率優化壓力，需要更精準的製程控制設備",
+        "人工目檢效率低，需要智慧化缺陷檢測解決方案",
+        "先進封裝製程導入需要新世代量測與檢測設備",
+        "工程師人才短缺，需要減少人工依賴的自動化與智慧化設備",
+    ]
+    assert signals["expansion_signals"] == ["大量擴編", "高管層擴充"]
+
 def test_scan_accepts_104_hiring_even_if_allowlist_excludes_104(client, seeded_contact, monkeypatch):
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "digitimes.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Test Optical Co｜徵才中 - 104人力銀行",
@@ -299,7 +338,7 @@ def test_scan_accepts_104_hiring_with_company_intro_snippet(client, seeded_conta
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "digitimes.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Test Optical Co｜徵才中 - 104人力銀行",
@@ -337,7 +376,7 @@ def test_scan_rejects_wrong_104_company_page_even_if_snippet_mentions_target(cli
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "digitimes.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="德揚科技股份有限公司｜徵才中 - 104人力銀行",
@@ -404,7 +443,7 @@ def test_signals_scan_accepts_short_chinese_summary(client, seeded_contact, monk
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Test Optical Co 擴產",
@@ -466,7 +505,7 @@ def test_signals_scan_filters_low_value_profile_and_regulatory_posts(client, see
     settings = get_settings()
     monkeypatch.setattr(settings, "radar_source_allowlist", "moneydj.com,news.example.com")
 
-    def fake_search(self, company_name, keywords, lookback_days, max_results, region=""):  # noqa: ANN001
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
         return [
             SearchResultItem(
                 title="Test Optical Co - MoneyDJ理財網",
@@ -517,3 +556,535 @@ def test_signals_scan_filters_low_value_profile_and_regulatory_posts(client, see
     items = list_resp.json()["items"]
     assert len(items) == 1
     assert "newsviewer.aspx" in items[0]["evidence_url"]
+
+
+def test_signals_scan_concurrent_accounts_single_writer(client, db_session, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
+
+    now = datetime.now(UTC)
+    account_ids = []
+    for name in ("Alpha Optics", "Beta Optics", "Gamma Optics"):
+        account = Account(company_name=name, segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+        db_session.add(account)
+        db_session.flush()
+        account_ids.append(account.id)
+    db_session.commit()
+
+    worker_threads: set[str] = set()
+
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
+        worker_threads.add(threading.current_thread().name)
+        slug = company_name.split()[0].lower()
+        return [
+            SearchResultItem(
+                title=f"{company_name} capex expansion",
+                url=f"https://news.example.com/{slug}-capex",
+                snippet=f"{company_name} 宣布擴產與增資，啟動新產線並擴大資本支出。",
+                source_name="news.example.com",
+                published_at=now.isoformat(),
+                provider="TAVILY",
+                latency_ms=40,
+                fallback_used=False,
+            )
+        ]
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    response = client.post(
+        "/api/v1/signals/scan",
+        json={"account_ids": account_ids, "lookback_days": 90, "max_results_per_account": 4, "concurrency": 3},
+    )
+    assert response.status_code == 200
+    assert response.json()["events_created"] == 3
+    assert all(name.startswith("radar-scan") for name in worker_threads)
+
+    rows = db_session.execute(select(SignalEvent.account_id)).scalars().all()
+    assert sorted(rows) == sorted(account_ids)
+
+
+def test_signals_scan_background_job_reports_per_account_progress(client, tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
+
+    # 背景 worker 與請求各用獨立連線；共用 StaticPool 連線時，請求結束的 rollback 會吃掉 worker 的交易
+    file_engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=file_engine)
+    file_session = sessionmaker(bind=file_engine, autoflush=False, future=True)
+
+    def override_get_db():
+        db = file_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_read_db, override_get_db)
+
+    now = datetime.now(UTC)
+    account_ids = []
+    with file_session() as db:
+        for name in ("Alpha Optics", "Broken Optics"):
+            account = Account(company_name=name, segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+            db.add(account)
+            db.flush()
+            account_ids.append(account.id)
+        db.commit()
+
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
+        if company_name.startswith("Broken"):
+            raise RuntimeError("tavily unavailable")
+        return [
+            SearchResultItem(
+                title=f"{company_name} capex expansion",
+                url="https://news.example.com/alpha-capex",
+                snippet=f"{company_name} 宣布擴產與增資，啟動新產線並擴大資本支出。",
+                source_name="news.example.com",
+                published_at=now.isoformat(),
+                provider="TAVILY",
+                latency_ms=40,
+                fallback_used=False,
+            )
+        ]
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    response = client.post(
+        "/api/v1/signals/scan",
+        json={"account_ids": account_ids, "concurrency": 1, "run_in_background": True},
+    )
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["job_id"].startswith("scan_")
+
+    get_scan_job_queue().join()
+
+    status_resp = client.get(f"/api/v1/signals/scan/{job['job_id']}")
+    assert status_resp.status_code == 200
+    payload = status_resp.json()
+    assert payload["status"] == "completed"
+    assert payload["accounts_total"] == 2
+    assert payload["accounts_processed"] == 2
+    assert payload["events_created"] == 1
+    assert payload["accounts_failed"] == 1
+    by_account = {item["account_id"]: item for item in payload["accounts"]}
+    assert by_account[account_ids[0]]["status"] == "completed"
+    assert by_account[account_ids[0]]["events_written"] == 1
+    assert by_account[account_ids[0]]["events_created"] == 1
+    assert by_account[account_ids[1]]["status"] == "failed"
+    assert "tavily unavailable" in by_account[account_ids[1]]["error"]
+
+    assert client.get("/api/v1/signals/scan/scan_missing").status_code == 404
+    file_engine.dispose()
+
+
+def test_tavily_query_plan_runs_concurrently_and_keeps_plan_order(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "tavily_api_key", "test-key")
+
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def fake_do_search(  # noqa: ANN202
+        self, client, query, lookback_days, max_results, topic="news", include_domains=None, use_cache=True  # noqa: ANN001
+    ):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        # 越前面的查詢回得越慢，確保合併順序依計畫而非完成時間
+        await asyncio.sleep(0.05 if include_domains and "ctee.com.tw" in include_domains else 0.0)
+        in_flight -= 1
+        domain = (include_domains or ["global"])[0]
+        return (
+            [
+                {"url": "https://shared.example.com/dup", "title": f"dup from {domain}", "content": "x"},
+                {"url": f"https://{domain}/{len(query)}", "title": query, "content": "y"},
+            ],
+            50,
+        )
+
+    monkeypatch.setattr(TavilySearchProvider, "_do_search", fake_do_search)
+
+    items = TavilySearchProvider().search_company_signals(
+        company_name="玉晶光 (GSEO)",
+        keywords=["AR"],
+        lookback_days=90,
+        max_results=8,
+        region="TW",
+    )
+
+    assert peak_in_flight > 1
+    urls = [item.url for item in items]
+    assert urls.count("https://shared.example.com/dup") == 1
+    assert items[0].title == "dup from cnyes.com"
+    assert len(urls) == len(set(urls))
+
+
+def test_tavily_search_cache_serves_repeat_queries_and_honors_bypass(monkeypatch, tmp_path):
+    from app.services.providers import search as search_module
+    from app.services.providers.cache import close_response_caches, get_search_cache
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "tavily_api_key", "test-key")
+    monkeypatch.setattr(settings, "provider_cache_path", str(tmp_path / "cache.sqlite3"))
+    close_response_caches()
+
+    posted: list[dict] = []
+
+    class FakeResponse:
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"results": [{"url": "https://news.example.com/a", "title": "A", "content": "a"}]}
+
+    class FakeClient:
+        async def post(self, url, json, timeout):  # noqa: A002, ANN001
+            posted.append(json)
+            return FakeResponse()
+
+    monkeypatch.setattr(search_module, "get_async_http_client", lambda url: FakeClient())
+
+    def run(provider: TavilySearchProvider) -> list[SearchResultItem]:
+        return provider.search_company_signals(
+            company_name="Young Optics", keywords=["AR"], lookback_days=30, max_results=4, region="USA"
+        )
+
+    first = run(TavilySearchProvider())
+    first_calls = len(posted)
+    assert first_calls > 0
+
+    second = run(TavilySearchProvider())
+    assert len(posted) == first_calls
+    assert [item.url for item in second] == [item.url for item in first]
+
+    stats = get_search_cache().stats()
+    assert stats["hits"] == first_calls
+    assert stats["misses"] == first_calls
+
+    TavilySearchProvider().search_company_signals(
+        company_name="Young Optics", keywords=["AR"], lookback_days=30, max_results=4, region="USA", use_cache=False
+    )
+    assert len(posted) == first_calls * 2
+    close_response_caches()
+
+
+def test_signals_scan_translates_english_summaries_in_one_batch(client, db_session, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
+
+    now = datetime.now(UTC)
+    account = Account(company_name="Delta Optics", segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+    db_session.add(account)
+    db_session.commit()
+
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
+        return [
+            SearchResultItem(
+                title=f"Delta Optics {topic} update",
+                url=f"https://news.example.com/{topic}",
+                snippet=f"Delta Optics confirms capex investment for its {topic} production line expansion this year.",
+                source_name="news.example.com",
+                published_at=now.isoformat(),
+                provider="TAVILY",
+                latency_ms=40,
+                fallback_used=False,
+            )
+            for topic in ("lidar", "cpo", "glasses")
+        ]
+
+    prompts: list[str] = []
+
+    def fake_generate(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+        prompts.append(user_prompt)
+        items = json.loads(user_prompt)["items"]
+        payload = {"items": [{"id": item["id"], "text": f"譯文{item['id']}：德爾塔光學擴產"} for item in items]}
+        return LLMResult(text=json.dumps(payload, ensure_ascii=False), provider="GEMINI", latency_ms=5, token_usage=10)
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    monkeypatch.setattr(LLMRouter, "generate", fake_generate)
+
+    response = client.post("/api/v1/signals/scan", json={"account_ids": [account.id], "max_results_per_account": 8})
+    assert response.status_code == 200
+    assert len(prompts) == 1
+
+    summaries = db_session.execute(select(SignalEvent.summary)).scalars().all()
+    assert len(summaries) == 3
+    assert all(summary.startswith("譯文") for summary in summaries)
+
+
+def test_batch_translation_falls_back_per_item_for_unparsed_entries():
+    from app.services.market_radar import _translate_batch_to_zh_tw
+
+    class FakeRouter:
+        def __init__(self):
+            self.calls = 0
+
+        def generate(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+            self.calls += 1
+            if user_prompt.startswith("{"):
+                return LLMResult(text='{"items": [{"id": 2, "text": "第二則"}]}', provider="GEMINI", latency_ms=1, token_usage=1)
+            return LLMResult(text=f"逐筆:{user_prompt}", provider="GEMINI", latency_ms=1, token_usage=1)
+
+    router = FakeRouter()
+    translated = _translate_batch_to_zh_tw(["first headline", "second headline", "third headline"], router)
+    assert translated == ["逐筆:first headline", "第二則", "逐筆:third headline"]
+    assert router.calls == 3
+
+
+def test_list_signals_by_account_ranks_in_sql_like_python_ranker(client, db_session, seeded_contact):
+    account_id = seeded_contact["account_id"]
+    now = datetime.now(UTC)
+    for index in range(40):
+        published = None if index % 7 == 0 else now - timedelta(days=(index * 13) % 240, hours=index)
+        db_session.add(
+            SignalEvent(
+                account_id=account_id,
+                signal_type="CAPEX",
+                signal_strength=60 + index % 4 * 10,
+                summary=f"signal {index}",
+                evidence_url=f"https://rank.example/{index}",
+                source_published_at=published,
+                search_fallback_used=0,
+                fetched_at=now - timedelta(minutes=index),
+            )
+        )
+    db_session.commit()
+
+    rows = db_session.execute(select(SignalEvent).where(SignalEvent.account_id == account_id)).scalars().all()
+    expected = [row.id for row in sorted(rows, key=lambda row: (rank_signal_for_top20(row), row.id), reverse=True)]
+
+    response = client.get(f"/api/v1/signals/accounts/{account_id}", params={"limit": 15})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == expected[:15]
+
+
+def test_global_signals_keyset_pages_with_company_names_and_filters(client, db_session, seeded_contact):
+    account_id = seeded_contact["account_id"]
+    now = datetime.now(UTC)
+    for index in range(7):
+        db_session.add(
+            SignalEvent(
+                account_id=account_id,
+                signal_type="HIRING" if index % 2 else "CAPEX",
+                signal_strength=50 + index * 5,
+                summary=f"global {index}",
+                evidence_url=f"https://global.example/{index}",
+                search_fallback_used=0,
+                # 兩兩同一時間，驗證 id 作為次要排序鍵不會漏列或重複
+                fetched_at=now - timedelta(hours=index // 2),
+            )
+        )
+    db_session.commit()
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        payload = client.get("/api/v1/signals/global", params=params).json()
+        seen.extend(item["id"] for item in payload["items"])
+        assert all(item["company_name"] == "Test Semicon Co" for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+    expected = db_session.execute(
+        select(SignalEvent.id).order_by(SignalEvent.fetched_at.desc(), SignalEvent.id.desc())
+    ).scalars().all()
+    assert seen == expected
+
+    filtered = client.get(
+        "/api/v1/signals/global",
+        params={"signal_type": "hiring", "min_strength": 60, "fetched_from": (now - timedelta(minutes=90)).isoformat()},
+    ).json()
+    assert [item["signal_strength"] for item in filtered["items"]] == [65]
+    assert client.get("/api/v1/signals/global", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_incremental_rescan_skips_unchanged_results_and_refreshes_in_bulk(client, db_session, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "radar_source_allowlist", "news.example.com")
+
+    now = datetime.now(UTC)
+    account = Account(company_name="Delta Optics", segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+    db_session.add(account)
+    db_session.commit()
+    snippets = {
+        topic: f"Delta Optics confirms capex investment for its {topic} line expansion." for topic in ("lidar", "cpo")
+    }
+
+    def fake_search(self, company_name, keywords, lookback_days, max_results, region="", use_cache=None):  # noqa: ANN001
+        return [
+            SearchResultItem(
+                title=f"Delta Optics {topic} update",
+                url=f"https://news.example.com/{topic}",
+                snippet=snippet,
+                source_name="news.example.com",
+                published_at=now.isoformat(),
+                provider="TAVILY",
+                latency_ms=40,
+                fallback_used=False,
+            )
+            for topic, snippet in snippets.items()
+        ]
+
+    translated_batches: list[int] = []
+
+    def fake_generate(self, system_prompt, user_prompt, preferred_order=None):  # noqa: ANN001
+        if not user_prompt.startswith("{"):
+            # 單筆時走逐筆翻譯，prompt 為純文字
+            translated_batches.append(1)
+            return LLMResult(text="譯文：德爾塔光學擴產", provider="GEMINI", latency_ms=5, token_usage=10)
+        items = json.loads(user_prompt)["items"]
+        translated_batches.append(len(items))
+        payload = {"items": [{"id": item["id"], "text": f"譯文{item['id']}：德爾塔光學擴產"} for item in items]}
+        return LLMResult(text=json.dumps(payload, ensure_ascii=False), provider="GEMINI", latency_ms=5, token_usage=10)
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    monkeypatch.setattr(LLMRouter, "generate", fake_generate)
+
+    def scan(**extra):  # noqa: ANN003, ANN202
+        response = client.post("/api/v1/signals/scan", json={"account_ids": [account.id], **extra})
+        assert response.status_code == 200
+        return response.json()
+
+    first = scan()
+    assert (first["events_created"], first["events_updated"]) == (2, 0)
+    assert translated_batches == [2]
+    first_fetch = dict(db_session.execute(select(SignalEvent.evidence_url, SignalEvent.fetched_at)).all())
+
+    # 內容未變：不翻譯、不計入新增，只刷新 fetched_at
+    unchanged = scan()
+    assert (unchanged["events_created"], unchanged["events_updated"]) == (0, 2)
+    assert translated_batches == [2]
+    db_session.expire_all()
+    refreshed = dict(db_session.execute(select(SignalEvent.evidence_url, SignalEvent.fetched_at)).all())
+    assert all(refreshed[url] >= first_fetch[url] for url in first_fetch)
+
+    snippets["cpo"] = "Delta Optics doubles capex investment for its cpo line expansion."
+    changed = scan()
+    assert (changed["events_created"], changed["events_updated"]) == (0, 2)
+    assert translated_batches == [2, 1]
+
+    full = scan(incremental=False)
+    assert (full["events_created"], full["events_updated"]) == (0, 2)
+    assert translated_batches == [2, 1, 2]
+    assert db_session.execute(select(func.count(SignalEvent.id))).scalar_one() == 2
+
+
+def test_write_account_signals_upserts_in_one_statement_with_accurate_counts(db_session, engine):
+    now = datetime.now(UTC).replace(tzinfo=None)
+    account = Account(company_name="Echo Photonics", segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+    db_session.add(account)
+    db_session.commit()
+
+    def row(url: str, summary: str) -> dict:
+        return {
+            "account_id": account.id,
+            "signal_type": "CAPEX_EXPANSION",
+            "signal_strength": 80,
+            "event_date": now.date(),
+            "summary": summary,
+            "evidence_url": url,
+            "source_name": "news.example.com",
+            "source_published_at": now,
+            "search_provider": "TAVILY",
+            "search_latency_ms": 30,
+            "search_fallback_used": 0,
+        }
+
+    service = MarketRadarService()
+    first = service._write_account_signals(
+        db_session, account.id, [row(f"https://news.example.com/e{i}", f"擴產公告 {i}") for i in range(3)]
+    )
+    assert (first.created, first.updated) == (3, 0)
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        second = service._write_account_signals(
+            db_session,
+            account.id,
+            [row("https://news.example.com/e0", "擴產公告 0（更新）"), row("https://news.example.com/e9", "新公告")],
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert (second.created, second.updated) == (1, 1)
+    assert sum(1 for statement in statements if statement.lstrip().upper().startswith("INSERT")) == 1
+    summaries = dict(db_session.execute(select(SignalEvent.evidence_url, SignalEvent.summary)).all())
+    assert len(summaries) == 4
+    assert summaries["https://news.example.com/e0"] == "擴產公告 0（更新）"
+
+
+def test_scan_passes_search_cache_bypass_per_call_without_mutating_shared_provider(db_session, monkeypatch):
+    now = datetime.now(UTC)
+    account = Account(company_name="Cache Optics", segment="WAFER_FAB", region="US", created_at=now, updated_at=now)
+    db_session.add(account)
+    db_session.commit()
+    seen: list[bool | None] = []
+
+    def fake_search(  # noqa: ANN202
+        self, company_name, keywords, lookback_days, max_results, region="", use_cache=None  # noqa: ANN001
+    ):
+        seen.append(use_cache)
+        return []
+
+    monkeypatch.setattr(TavilySearchProvider, "search_company_signals", fake_search)
+    service = MarketRadarService()
+    service.search_provider.use_cache = True
+    scan_args = {"account_ids": [account.id], "lookback_days": 30, "max_results_per_account": 4, "use_tavily": True}
+
+    service.scan(db_session, bypass_search_cache=True, **scan_args)
+    service.scan(db_session, **scan_args)
+    assert seen == [False, True]
+    assert service.search_provider.use_cache is True
+
+
+def test_startup_marks_orphaned_scan_jobs_failed(engine, db_session, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main as main_module
+    from app.models import ScanJob
+
+    now = datetime.now(UTC)
+
+    def job(job_id: str, status: str, progress: dict) -> ScanJob:
+        return ScanJob(
+            id=job_id,
+            status=status,
+            account_ids="[1, 2]",
+            lookback_days=30,
+            max_results_per_account=4,
+            accounts_total=2,
+            progress=json.dumps(progress),
+            created_at=now,
+        )
+
+    db_session.add_all(
+        [
+            job("scan_queued", "queued", {"1": {"status": "queued"}, "2": {"status": "queued"}}),
+            job("scan_running", "running", {"1": {"status": "completed"}, "2": {"status": "queued"}}),
+            job("scan_done", "completed", {"1": {"status": "completed"}, "2": {"status": "completed"}}),
+        ]
+    )
+    db_session.commit()
+
+    monkeypatch.setattr(main_module, "SessionLocal", sessionmaker(bind=engine, autoflush=False, future=True))
+    monkeypatch.setattr(get_settings(), "scan_job_recover_on_startup", True)
+    with TestClient(app):
+        pass
+
+    db_session.expire_all()
+    statuses = {row.id: row for row in db_session.execute(select(ScanJob)).scalars()}
+    assert statuses["scan_queued"].status == "failed"
+    assert statuses["scan_queued"].finished_at is not None
+    assert "restarted" in statuses["scan_running"].error
+    progress = json.loads(statuses["scan_running"].progress)
+    assert progress["1"]["status"] == "completed"
+    assert progress["2"]["status"] == "failed"
+    assert statuses["scan_done"].status == "completed"
+    assert statuses["scan_done"].error is None